@@ -1,10 +1,28 @@
 import duckdb
-import pandas as pd
 import argparse
-import sys
+import logging
 import os
+import re
+import shutil
+from collections import Counter
 
-def execute_analysis(db_path, table_name, sql_file, output_csv, common_logic_file='analyze/common_logic.sql'):
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_SIZE = 1 << 20
+UTF8_BOM = b'\xef\xbb\xbf'
+# Fixed name the SQL files query through, so the query text does not depend on the table
+ANALYSIS_VIEW = '__analysis_src'
+# Temp table holding the query result when it is needed twice (CSV export and cluster counts)
+ANALYSIS_RESULT = '__analysis_result'
+# A statement-ending semicolon plus any whitespace and line comments after it
+TRAILING_TERMINATOR = re.compile(r';(?:\s|--[^\n]*)*\Z')
+# Header names DuckDB quotes in CSV output; a BOM cannot be folded into such a name
+CSV_QUOTED_NAME_CHARS = frozenset(',"\r\n')
+# A plain or schema-qualified identifier, e.g. financial_profile_2024_12_31 or main.fp
+TABLE_NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?')
+
+def execute_analysis(db_path, table_name, sql_file, output_csv, common_logic_file='analyze/common_logic.sql', bom=True,
+                     threads=None, memory_limit=None, preserve_insertion_order=True):
     """
     Executes a SQL query from a file against a DuckDB database and saves the results to a CSV.
 
@@ -14,60 +32,151 @@ def execute_analysis(db_path, table_name, sql_file, output_csv, common_logic_fil
         sql_file (str): The path to the SQL file containing the analysis query.
         output_csv (str): The path to save the resulting CSV file.
         common_logic_file (str): Path to the common SQL logic file to be included.
+        bom (bool): Prefix the CSV with a UTF-8 BOM so Excel on Windows detects the encoding (the default).
+        threads (int | None): DuckDB worker threads; defaults to the number of CPUs.
+        memory_limit (str | None): DuckDB memory limit such as '8GB'; None keeps DuckDB's default.
+        preserve_insertion_order (bool): Keep DuckDB's row order, including for queries without
+            ORDER BY and for ties inside one, so the CSV is byte-stable across runs (the default).
+            Disabling it lets DuckDB parallelize the export but the row order is no longer guaranteed.
     """
     try:
-        # Read the main SQL query from the file
-        main_sql_query = read_sql_file(sql_file)
-        
-        # If the main query contains the common logic placeholder, replace it
-        if '{{common_logic}}' in main_sql_query:
-            if os.path.exists(common_logic_file):
-                common_sql = read_sql_file(common_logic_file)
-                # Ensure the final query is valid by removing the initial 'WITH' from the main query part
-                # and replacing the placeholder.
-                main_sql_query = main_sql_query.replace('{{common_logic}}', common_sql)
-            else:
-                print(f"Warning: Common logic file '{common_logic_file}' not found. Proceeding without it.")
-                main_sql_query = main_sql_query.replace('{{common_logic}},', '')
-
-
-        # Replace the table_name placeholder
-        final_query = main_sql_query.replace('{{table_name}}', table_name)
-
-        # Connect to the DuckDB database
-        con = duckdb.connect(database=db_path, read_only=False) # Changed to read_only=False to allow CTEs/Views if needed
-
-        # Execute the query and fetch the results into a pandas DataFrame
-        print("Executing SQL query...")
-        results_df = con.execute(final_query).fetchdf()
-        print("Query finished. Saving results to CSV...")
-
-        # Save the DataFrame to a CSV file with UTF-8 encoding
-        results_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
-        
+        source = quote_table_name(table_name)
+
+        final_query = build_sql(sql_file, common_logic_file)
+
+        # Connect to the DuckDB database; the connection is closed even if the query fails
+        config = duckdb_config(threads, memory_limit, preserve_insertion_order)
+        with duckdb.connect(database=db_path, read_only=False, config=config) as con: # read_only=False to allow CTEs/Views if needed
+            # The query always reads from the same temp view, whichever table is analyzed
+            con.execute(f'CREATE OR REPLACE TEMPORARY VIEW {ANALYSIS_VIEW} AS SELECT * FROM {source}')
+
+            print("Executing SQL query...")
+            cluster_counts = write_results_csv(con, final_query, output_csv, bom)
+
         print(f"Analysis complete. Results saved to '{output_csv}'")
-        
-        if 'plate_cluster' in results_df.columns:
+
+        if cluster_counts is not None:
             print("\nCluster Distribution:")
-            print(results_df['plate_cluster'].value_counts())
+            for plate_cluster, count in cluster_counts.most_common():
+                print(f"{plate_cluster}\t{count}")
 
     except FileNotFoundError:
         print(f"Error: The file '{sql_file}' or '{db_path}' was not found.")
     except Exception as e:
         print(f"An error occurred: {e}")
-    finally:
-        if 'con' in locals() and con:
-            con.close()
+
+def duckdb_config(threads=None, memory_limit=None, preserve_insertion_order=True):
+    """Builds the DuckDB connection settings used for analytics runs."""
+    config = {
+        'threads': threads or os.cpu_count() or 1,
+        'enable_object_cache': True,
+        'preserve_insertion_order': preserve_insertion_order,
+    }
+    if memory_limit:
+        config['memory_limit'] = memory_limit
+    return config
+
+def quote_table_name(table_name):
+    """
+    Validates a table name and returns it as a quoted DuckDB identifier.
+
+    Raises:
+        ValueError: If table_name is not a plain or schema-qualified identifier.
+    """
+    if not TABLE_NAME_PATTERN.fullmatch(table_name):
+        raise ValueError(f"Invalid table name: {table_name!r}")
+    return '.'.join(f'"{part}"' for part in table_name.split('.'))
+
+def build_sql(sql_file, common_logic_file):
+    """
+    Reads a SQL file and substitutes its {{common_logic}} and {{table_name}} placeholders.
+
+    {{table_name}} always becomes ANALYSIS_VIEW, so the query text is the same for every table.
+
+    Args:
+        sql_file (str): The path to the SQL file containing the analysis query.
+        common_logic_file (str): Path to the common SQL logic file to be included.
+    """
+    # Read the main SQL query from the file
+    main_sql_query = read_sql_file(sql_file)
+
+    # If the main query contains the common logic placeholder, replace it
+    if '{{common_logic}}' in main_sql_query:
+        if os.path.exists(common_logic_file):
+            common_sql = read_sql_file(common_logic_file)
+            main_sql_query = main_sql_query.replace('{{common_logic}}', common_sql)
+        else:
+            print(f"Warning: Common logic file '{common_logic_file}' not found. Proceeding without it.")
+            main_sql_query = main_sql_query.replace('{{common_logic}},', '')
+
+    # Point the table_name placeholder at the analysis view; drop the final semicolon so the
+    # query can be embedded in CREATE TABLE AS and COPY statements
+    main_sql_query = main_sql_query.replace('{{table_name}}', ANALYSIS_VIEW)
+    return TRAILING_TERMINATOR.sub('', main_sql_query.rstrip())
+
+def write_results_csv(con, query, output_csv, bom=False):
+    """
+    Runs a query once and writes its result to CSV with DuckDB's native writer, counting its
+    plate_cluster values if it has that column.
+
+    Without a plate_cluster column the query is exported directly. Otherwise it is materialized
+    into a temp table, which is exported and then grouped; the GROUP BY skips NULL clusters, as
+    value_counts() did. The BOM is folded into the first header name so DuckDB still writes the
+    file in one pass; only a first column whose name DuckDB would quote falls back to copying
+    the export behind the BOM.
+
+    Returns:
+        Counter | None: Number of rows per plate_cluster value, or None if the result has no such column.
+    """
+    # Binding the relation resolves its columns without running the query
+    columns = con.sql(query).columns
+    has_clusters = 'plate_cluster' in columns
+    if has_clusters:
+        con.execute(f'CREATE OR REPLACE TEMPORARY TABLE {ANALYSIS_RESULT} AS\n{query}\n')
+        source = ANALYSIS_RESULT
+    else:
+        # Newlines keep a trailing line comment from swallowing the closing parenthesis
+        source = f'(\n{query}\n)'
+
+    if bom and not CSV_QUOTED_NAME_CHARS.intersection(columns[0]):
+        select_list = ', '.join(
+            [f'{quote_identifier(columns[0])} AS {quote_identifier(UTF8_BOM.decode() + columns[0])}']
+            + [quote_identifier(name) for name in columns[1:]]
+        )
+        con.sql(f'SELECT {select_list} FROM {source}').write_csv(output_csv, header=True)
+    elif bom:
+        tmp_csv = f'{output_csv}.tmp'
+        try:
+            con.sql(f'SELECT * FROM {source}').write_csv(tmp_csv, header=True)
+            with open(tmp_csv, 'rb') as src, open(output_csv, 'wb', buffering=WRITE_BUFFER_SIZE) as dst:
+                dst.write(UTF8_BOM)
+                shutil.copyfileobj(src, dst, WRITE_BUFFER_SIZE)
+        finally:
+            if os.path.exists(tmp_csv):
+                os.remove(tmp_csv)
+    else:
+        con.sql(f'SELECT * FROM {source}').write_csv(output_csv, header=True)
+
+    if not has_clusters:
+        return None
+    counts = con.execute(
+        f'SELECT plate_cluster, COUNT(*) FROM {ANALYSIS_RESULT} WHERE plate_cluster IS NOT NULL GROUP BY plate_cluster'
+    ).fetchall()
+    return Counter(dict(counts))
+
+def quote_identifier(name):
+    """Quotes a column name as a DuckDB identifier."""
+    return '"' + name.replace('"', '""') + '"'
 
 def read_sql_file(filepath):
-    """Reads a SQL file, trying UTF-8 and then GBK encoding."""
+    """Reads a SQL file once and decodes it as UTF-8, falling back to GBK."""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
+        return raw.decode('utf-8')
     except UnicodeDecodeError:
-        print(f"Warning: Could not read {filepath} as UTF-8. Trying GBK encoding...")
-        with open(filepath, 'r', encoding='gbk') as f:
-            return f.read()
+        logger.warning(f"Could not read {filepath} as UTF-8. Trying GBK encoding...")
+        return raw.decode('gbk')
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run SQL analysis on DuckDB and save results.")
@@ -75,7 +184,14 @@ if __name__ == "__main__":
     parser.add_argument("--table_name", required=True, help="Name of the table to query.")
     parser.add_argument("--sql_file", required=True, help="Path to the SQL file.")
     parser.add_argument("--output_csv", required=True, help="Path for the output CSV file.")
+    parser.add_argument("--no-bom", dest="bom", action="store_false", help="Omit the UTF-8 BOM that lets Excel on Windows open the CSV correctly.")
+    parser.add_argument("--threads", type=int, default=None, help="DuckDB worker threads (default: number of CPUs).")
+    parser.add_argument("--memory_limit", default=None, help="DuckDB memory limit, e.g. '8GB' (default: DuckDB's own limit).")
+    parser.add_argument("--no-preserve-insertion-order", dest="preserve_insertion_order", action="store_false",
+                        help="Let DuckDB reorder rows for a faster parallel export; the CSV row order is no longer stable.")
     
     args = parser.parse_args()
     
-    execute_analysis(args.db_path, args.table_name, args.sql_file, args.output_csv) 
\ No newline at end of file
+    execute_analysis(args.db_path, args.table_name, args.sql_file, args.output_csv, bom=args.bom,
+                     threads=args.threads, memory_limit=args.memory_limit,
+                     preserve_insertion_order=args.preserve_insertion_order) 
\ No newline at end of file
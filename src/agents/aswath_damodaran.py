@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 import json
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 from typing_extensions import Literal
 from pydantic import BaseModel
 
@@ -9,9 +13,9 @@ from src.prompts import get_aswath_damodaran_prompt_template
 from langchain_core.messages import HumanMessage
 
 from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
+    get_financial_metrics_batch,
+    get_market_cap_batch,
+    search_line_items_batch,
     merge_financial_data,
 )
 from src.utils.llm import call_llm
@@ -20,6 +24,43 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Numeric fields pulled into per-ticker arrays once, shared by the analyses below
+SOA_FIELDS = ("revenue", "free_cash_flow", "outstanding_shares", "return_on_invested_capital")
+
+# Line items requested for every ticker
+LINE_ITEMS = [
+    "free_cash_flow",
+    "ebit",
+    "interest_expense",
+    "capital_expenditure",
+    "depreciation_and_amortization",
+    "outstanding_shares",
+    "net_income",
+    "total_debt",
+]
+
+# Upper bound on tickers analyzed concurrently
+MAX_WORKERS = 8
+
+# The prompt template is static, build it once rather than per ticker
+_PROMPT_TEMPLATE = get_aswath_damodaran_prompt_template()
+# Part of the LLM cache key, so editing the prompt invalidates previously cached answers
+_PROMPT_DIGEST = hashlib.blake2b(_PROMPT_TEMPLATE.pretty_repr().encode(), digest_size=8).hexdigest()
+
+
+@dataclass(slots=True, frozen=True)
+class MetricsRow:
+    """Numeric fields of the latest period read by the risk analysis, as plain slots."""
+    beta: float | None = None
+    debt_to_equity: float | None = None
+    ebit: float | None = None
+    interest_expense: float | None = None
+
+    @classmethod
+    def from_dump(cls, dump: dict) -> MetricsRow:
+        return cls(**{f.name: dump.get(f.name) for f in fields(cls)})
+
+
 class AswathDamodaranSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float          # 0‒100
@@ -39,99 +80,39 @@ def aswath_damodaran_agent(state: AgentState):
     end_date  = data["end_date"]
     tickers   = data["tickers"]
 
-    analysis_data: dict[str, dict] = {}
     damodaran_signals: dict[str, dict] = {}
 
+    # ─── Fetch core data for all tickers in one provider round-trip each ────
+    progress.update_status("aswath_damodaran_agent", None, "Fetching financial metrics")
+    metrics_by_ticker = get_financial_metrics_batch(tickers, end_date, period="ttm", limit=5)
+
+    progress.update_status("aswath_damodaran_agent", None, "Fetching financial line items")
+    line_items_by_ticker = search_line_items_batch(tickers, LINE_ITEMS, end_date)
+
+    progress.update_status("aswath_damodaran_agent", None, "Getting market cap")
+    market_caps = get_market_cap_batch(tickers, end_date)
+
+    # Tickers are independent and dominated by network / LLM latency, so fan them out
+    results: dict[str, AswathDamodaranSignal] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(len(tickers), MAX_WORKERS))) as executor:
+        futures = [
+            executor.submit(
+                _analyze_one,
+                ticker,
+                metrics_by_ticker[ticker],
+                line_items_by_ticker[ticker],
+                market_caps[ticker],
+                state,
+            )
+            for ticker in tickers
+        ]
+        for future in as_completed(futures):
+            ticker, _, damodaran_output = future.result()
+            results[ticker] = damodaran_output
+
+    # Assemble in the original ticker order
     for ticker in tickers:
-        # ─── Fetch core data ────────────────────────────────────────────────────
-        progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
-
-        progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial line items")
-        line_items = search_line_items(
-            ticker,
-            [
-                "free_cash_flow",
-                "ebit",
-                "interest_expense",
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "outstanding_shares",
-                "net_income",
-                "total_debt",
-            ],
-            end_date,
-        )
-        progress.update_status("aswath_damodaran_agent", ticker, "Merging financial data")
-        financial_data = merge_financial_data(metrics, line_items)
-
-        progress.update_status("aswath_damodaran_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
-
-        # ─── Analyses ───────────────────────────────────────────────────────────
-        progress.update_status("aswath_damodaran_agent", ticker, "Analyzing growth and reinvestment")
-        growth_analysis = analyze_growth_and_reinvestment(financial_data)
-        logger.debug(f"growth_analysis: {growth_analysis}")
-
-        progress.update_status("aswath_damodaran_agent", ticker, "Analyzing risk profile")
-        risk_analysis = analyze_risk_profile(financial_data)
-        logger.debug(f"risk_analysis: {risk_analysis}")
-
-        progress.update_status("aswath_damodaran_agent", ticker, "Calculating intrinsic value (DCF)")
-        intrinsic_val_analysis = calculate_intrinsic_value_dcf(financial_data, risk_analysis)
-        logger.debug(f"intrinsic_val_analysis: {intrinsic_val_analysis}")
-
-        progress.update_status("aswath_damodaran_agent", ticker, "Assessing relative valuation")
-        relative_val_analysis = analyze_relative_valuation(metrics)
-        logger.debug(f"relative_val_analysis: {relative_val_analysis}")
-
-        # ─── Score & margin of safety ──────────────────────────────────────────
-        total_score = (
-            growth_analysis["score"]
-            + risk_analysis["score"]
-            + relative_val_analysis["score"]
-        )
-        max_score = growth_analysis["max_score"] + risk_analysis["max_score"] + relative_val_analysis["max_score"]
-        logger.debug(f"total_score: {total_score}, max_score: {max_score}")
-
-        intrinsic_value = intrinsic_val_analysis["intrinsic_value"]
-        margin_of_safety = (
-            (intrinsic_value - market_cap) / market_cap if intrinsic_value and market_cap else None
-        )
-
-        # Decision rules (Damodaran tends to act with ~20-25 % MOS)
-        if margin_of_safety is not None and margin_of_safety >= 0.25:
-            signal = "bullish"
-        elif margin_of_safety is not None and margin_of_safety <= -0.25:
-            signal = "bearish"
-        else:
-            signal = "neutral"
-
-        confidence = min(max(abs(margin_of_safety or 0) * 200, 10), 100)  # simple proxy 10-100
-
-        analysis_data[ticker] = {
-            "signal": signal,
-            "score": total_score,
-            "max_score": max_score,
-            "margin_of_safety": margin_of_safety,
-            "growth_analysis": growth_analysis,
-            "risk_analysis": risk_analysis,
-            "relative_val_analysis": relative_val_analysis,
-            "intrinsic_val_analysis": intrinsic_val_analysis,
-            "market_cap": market_cap,
-        }
-
-        # ─── LLM: craft Damodaran-style narrative ──────────────────────────────
-        progress.update_status("aswath_damodaran_agent", ticker, "Generating Damodaran analysis")
-        damodaran_output = generate_damodaran_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
-        damodaran_signals[ticker] = damodaran_output.model_dump()
-
-        progress.update_status("aswath_damodaran_agent", ticker, "Done", analysis=damodaran_output.reasoning)
+        damodaran_signals[ticker] = results[ticker].model_dump()
 
     # ─── Push message back to graph state ──────────────────────────────────────
     message = HumanMessage(content=json.dumps(damodaran_signals), name="aswath_damodaran_agent")
@@ -145,10 +126,130 @@ def aswath_damodaran_agent(state: AgentState):
     return {"messages": [message], "data": state["data"]}
 
 
+def _analyze_one(
+    ticker: str,
+    metrics: list,
+    line_items: list,
+    market_cap: float | None,
+    state: AgentState,
+) -> tuple[str, dict, AswathDamodaranSignal]:
+    """Run the analyses and generate the LLM signal for a single ticker from prefetched data."""
+    progress.update_status("aswath_damodaran_agent", ticker, "Merging financial data")
+    financial_data = merge_financial_data(metrics, line_items)
+
+    # Without history or a market cap every analysis degrades to "NA", so skip the LLM call
+    if len(financial_data) < 2 or market_cap is None:
+        damodaran_output = AswathDamodaranSignal(signal="neutral", confidence=0.0, reasoning="Insufficient data")
+        progress.update_status("aswath_damodaran_agent", ticker, "Done", analysis=damodaran_output.reasoning)
+        return ticker, {}, damodaran_output
+
+    arrays = _to_soa(financial_data, SOA_FIELDS)
+    # Dict view of the latest period, dumped once and shared by the analyses
+    latest_dump = financial_data[0].model_dump()
+    latest_row = MetricsRow.from_dump(latest_dump)
+
+    # ─── Analyses ───────────────────────────────────────────────────────────
+    progress.update_status("aswath_damodaran_agent", ticker, "Analyzing growth and reinvestment")
+    growth_analysis = analyze_growth_and_reinvestment(financial_data, arrays, latest_dump)
+    logger.debug(f"growth_analysis: {growth_analysis}")
+
+    progress.update_status("aswath_damodaran_agent", ticker, "Analyzing risk profile")
+    risk_analysis = analyze_risk_profile(latest_row)
+    logger.debug(f"risk_analysis: {risk_analysis}")
+
+    progress.update_status("aswath_damodaran_agent", ticker, "Calculating intrinsic value (DCF)")
+    intrinsic_val_analysis = calculate_intrinsic_value_dcf(arrays, risk_analysis)
+    logger.debug(f"intrinsic_val_analysis: {intrinsic_val_analysis}")
+
+    progress.update_status("aswath_damodaran_agent", ticker, "Assessing relative valuation")
+    relative_val_analysis = analyze_relative_valuation(metrics)
+    logger.debug(f"relative_val_analysis: {relative_val_analysis}")
+
+    # ─── Score & margin of safety ──────────────────────────────────────────
+    total_score = (
+        growth_analysis["score"]
+        + risk_analysis["score"]
+        + relative_val_analysis["score"]
+    )
+    max_score = growth_analysis["max_score"] + risk_analysis["max_score"] + relative_val_analysis["max_score"]
+    logger.debug(f"total_score: {total_score}, max_score: {max_score}")
+
+    intrinsic_value = intrinsic_val_analysis["intrinsic_value"]
+    margin_of_safety = (
+        (intrinsic_value - market_cap) / market_cap if intrinsic_value and market_cap else None
+    )
+
+    # Decision rules (Damodaran tends to act with ~20-25 % MOS)
+    if margin_of_safety is not None and margin_of_safety >= 0.25:
+        signal = "bullish"
+    elif margin_of_safety is not None and margin_of_safety <= -0.25:
+        signal = "bearish"
+    else:
+        signal = "neutral"
+
+    confidence = min(max(abs(margin_of_safety or 0) * 200, 10), 100)  # simple proxy 10-100
+
+    analysis = {
+        "signal": signal,
+        "score": total_score,
+        "max_score": max_score,
+        "margin_of_safety": margin_of_safety,
+        "growth_analysis": growth_analysis,
+        "risk_analysis": risk_analysis,
+        "relative_val_analysis": relative_val_analysis,
+        "intrinsic_val_analysis": intrinsic_val_analysis,
+        "market_cap": market_cap,
+    }
+
+    # ─── LLM: craft Damodaran-style narrative ──────────────────────────────
+    progress.update_status("aswath_damodaran_agent", ticker, "Generating Damodaran analysis")
+    damodaran_output = generate_damodaran_output(
+        ticker=ticker,
+        analysis_data=analysis,
+        state=state,
+    )
+
+    progress.update_status("aswath_damodaran_agent", ticker, "Done", analysis=damodaran_output.reasoning)
+    return ticker, analysis, damodaran_output
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Helper analyses
 # ────────────────────────────────────────────────────────────────────────────────
-def analyze_growth_and_reinvestment(financial_data: list) -> dict[str, any]:
+def _to_soa(financial_data: list, names: tuple[str, ...]) -> dict[str, np.ndarray]:
+    """Extract numeric fields into float64 arrays (latest period first), NaN where missing."""
+    n = len(financial_data)
+    return {
+        name: np.fromiter(
+            (np.nan if (v := getattr(m, name, None)) is None else v for m in financial_data),
+            dtype=np.float64,
+            count=n,
+        )
+        for name in names
+    }
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """Non-missing, non-zero values in chronological order (oldest → latest)."""
+    values = values[::-1]
+    return values[~np.isnan(values) & (values != 0)]
+
+
+def _revenue_cagr(revenue: np.ndarray) -> float | None:
+    """CAGR between the oldest and latest reported revenue, None if it can't be computed."""
+    revs = _present(revenue)
+    if revs.size < 2 or revs[0] <= 0:
+        return None
+    with np.errstate(invalid="ignore"):
+        cagr = np.power(revs[-1] / revs[0], 1.0 / (revs.size - 1)) - 1
+    return float(cagr) if np.isfinite(cagr) else None
+
+
+def analyze_growth_and_reinvestment(
+    financial_data: list,
+    arrays: dict[str, np.ndarray],
+    latest_dump: dict,
+) -> dict[str, any]:
     """
     Growth score (0-4):
       +2  5-yr CAGR of revenue > 8 %
@@ -161,11 +262,7 @@ def analyze_growth_and_reinvestment(financial_data: list) -> dict[str, any]:
         return {"score": 0, "max_score": max_score, "details": "Insufficient history"}
 
     # Revenue CAGR (oldest to latest)
-    revs = [m.revenue for m in reversed(financial_data) if m.revenue]
-    if len(revs) >= 2 and revs[0] > 0:
-        cagr = (revs[-1] / revs[0]) ** (1 / (len(revs) - 1)) - 1
-    else:
-        cagr = None
+    cagr = _revenue_cagr(arrays["revenue"])
 
     score, details = 0, []
 
@@ -182,23 +279,23 @@ def analyze_growth_and_reinvestment(financial_data: list) -> dict[str, any]:
         details.append("Revenue data incomplete")
 
     # FCFF growth (proxy: free_cash_flow trend)
-    fcfs = [li.free_cash_flow for li in reversed(financial_data) if li.free_cash_flow]
-    if len(fcfs) >= 2 and fcfs[-1] > fcfs[0]:
+    fcfs = _present(arrays["free_cash_flow"])
+    if fcfs.size >= 2 and fcfs[-1] > fcfs[0]:
         score += 1
         details.append("Positive FCFF growth")
     else:
         details.append("Flat or declining FCFF")
 
     # Reinvestment efficiency (ROIC vs. 10 % hurdle)
-    latest = financial_data[0]
-    if latest.return_on_invested_capital and latest.return_on_invested_capital > 0.10:
+    roic = arrays["return_on_invested_capital"][0]
+    if roic > 0.10:
         score += 1
-        details.append(f"ROIC {latest.return_on_invested_capital:.1%} (> 10 %)")
+        details.append(f"ROIC {roic:.1%} (> 10 %)")
 
-    return {"score": score, "max_score": max_score, "details": "; ".join(details), "metrics": latest.model_dump()}
+    return {"score": score, "max_score": max_score, "details": "; ".join(details), "metrics": latest_dump}
 
 
-def analyze_risk_profile(financial_data: list) -> dict[str, any]:
+def analyze_risk_profile(latest: MetricsRow | None) -> dict[str, any]:
     """
     Risk score (0-3):
       +1  Beta < 1.3
@@ -206,14 +303,13 @@ def analyze_risk_profile(financial_data: list) -> dict[str, any]:
       +1  Interest Coverage > 3×
     """
     max_score = 3
-    if not financial_data:
+    if latest is None:
         return {"score": 0, "max_score": max_score, "details": "No metrics"}
 
-    latest = financial_data[0]
     score, details = 0, []
 
     # Beta
-    beta = getattr(latest, "beta", None)
+    beta = latest.beta
     if beta is not None:
         if beta < 1.3:
             score += 1
@@ -236,7 +332,7 @@ def analyze_risk_profile(financial_data: list) -> dict[str, any]:
 
     # Interest coverage
     ebit = latest.ebit
-    interest = getattr(latest, "interest_expense", None)
+    interest = latest.interest_expense
     if ebit and interest and interest != 0:
         coverage = ebit / abs(interest)
         if coverage > 3:
@@ -270,12 +366,16 @@ def analyze_relative_valuation(financial_data: list) -> dict[str, any]:
     if not financial_data or len(financial_data) < 5:
         return {"score": 0, "max_score": max_score, "details": "Insufficient P/E history"}
 
-    pes = [m.price_to_earnings_ratio for m in financial_data if m.price_to_earnings_ratio]
-    if len(pes) < 5:
+    pes = np.fromiter(
+        (m.price_to_earnings_ratio for m in financial_data if m.price_to_earnings_ratio),
+        dtype=np.float64,
+    )
+    if pes.size < 5:
         return {"score": 0, "max_score": max_score, "details": "P/E data sparse"}
 
-    ttm_pe = pes[0]
-    median_pe = sorted(pes)[len(pes) // 2]
+    ttm_pe = float(pes[0])
+    k = pes.size // 2
+    median_pe = float(np.partition(pes, k)[k])  # O(n) selection, same element as sorted(pes)[k]
 
     if ttm_pe < 0.7 * median_pe:
         score, desc = 1, f"P/E {ttm_pe:.1f} vs. median {median_pe:.1f} (cheap)"
@@ -290,7 +390,7 @@ def analyze_relative_valuation(financial_data: list) -> dict[str, any]:
 # ────────────────────────────────────────────────────────────────────────────────
 # Intrinsic value via FCFF DCF (Damodaran style)
 # ────────────────────────────────────────────────────────────────────────────────
-def calculate_intrinsic_value_dcf(financial_data: list, risk_analysis: dict) -> dict[str, any]:
+def calculate_intrinsic_value_dcf(arrays: dict[str, np.ndarray], risk_analysis: dict) -> dict[str, any]:
     """
     FCFF DCF with:
       • Base FCFF = latest free cash flow
@@ -298,21 +398,17 @@ def calculate_intrinsic_value_dcf(financial_data: list, risk_analysis: dict) ->
       • Fade linearly to terminal growth 2.5 % by year 10
       • Discount @ cost of equity (no debt split given data limitations)
     """
-    if not financial_data or len(financial_data) < 2:
+    if arrays["revenue"].size < 2:
         return {"intrinsic_value": None, "details": ["Insufficient data"]}
 
-    latest_m = financial_data[0]
-    fcff0 = latest_m.free_cash_flow
-    shares = latest_m.outstanding_shares
-    if not fcff0 or not shares:
+    fcff0 = float(arrays["free_cash_flow"][0])
+    shares = float(arrays["outstanding_shares"][0])
+    if np.isnan(fcff0) or np.isnan(shares) or not fcff0 or not shares:
         return {"intrinsic_value": None, "details": ["Missing FCFF or share count"]}
 
     # Growth assumptions
-    revs = [m.revenue for m in reversed(financial_data) if m.revenue]
-    if len(revs) >= 2 and revs[0] > 0:
-        base_growth = min((revs[-1] / revs[0]) ** (1 / (len(revs) - 1)) - 1, 0.12)
-    else:
-        base_growth = 0.04  # fallback
+    cagr = _revenue_cagr(arrays["revenue"])
+    base_growth = min(cagr, 0.12) if cagr is not None else 0.04  # fallback
 
     terminal_growth = 0.025
     years = 10
@@ -320,15 +416,11 @@ def calculate_intrinsic_value_dcf(financial_data: list, risk_analysis: dict) ->
     # Discount rate
     discount = risk_analysis.get("cost_of_equity") or 0.09
 
-    # Project FCFF and discount
-    pv_sum = 0.0
-    g = base_growth
-    g_step = (terminal_growth - base_growth) / (years - 1)
-    for yr in range(1, years + 1):
-        fcff_t = fcff0 * (1 + g)
-        pv = fcff_t / (1 + discount) ** yr
-        pv_sum += pv
-        g += g_step
+    # Project FCFF and discount (growth fades linearly from base to terminal)
+    years_arr = np.arange(1, years + 1)
+    g_arr = base_growth + (terminal_growth - base_growth) * (years_arr - 1) / (years - 1)
+    fcff_arr = fcff0 * (1 + g_arr)
+    pv_sum = float((fcff_arr / (1 + discount) ** years_arr).sum())
 
     # Terminal value (perpetuity with terminal growth)
     tv = (
@@ -372,13 +464,20 @@ def generate_damodaran_output(
     state: AgentState,
 ) -> AswathDamodaranSignal:
     """
-    Ask the LLM to channel Prof. Damodaran's analytical style:
+    Ask the LLM to channel Prof. Damodaran's analytical style for one ticker,
+    given only that ticker's analysis (not the whole batch):
       • Story → Numbers → Value narrative
       • Emphasize risk, growth, and cash-flow assumptions
       • Cite cost of capital, implied MOS, and valuation cross-checks
     """
-    template = get_aswath_damodaran_prompt_template()
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    # Compact JSON: indentation only adds tokens for the LLM
+    prompt = _PROMPT_TEMPLATE.invoke({"analysis_data": json.dumps(analysis_data, separators=(",", ":"), default=str), "ticker": ticker})
+
+    # Identical analysis for the same ticker and date yields the same answer, so reuse it across runs
+    digest = hashlib.blake2b(
+        json.dumps(analysis_data, sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+    cache_key = f"{ticker}_{state['data']['end_date']}_{_PROMPT_DIGEST}_{digest}"
 
     def default_signal():
         return AswathDamodaranSignal(
@@ -393,4 +492,5 @@ def generate_damodaran_output(
         agent_name="aswath_damodaran_agent",
         state=state,
         default_factory=default_signal,
+        cache_key=cache_key,
     )
@@ -1,9 +1,195 @@
 """Cache configuration for TTL policies."""
 
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any
-from src.utils.config_utils import load_yaml_config, save_yaml_config
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+from src.utils.config_utils import ConfigLoader, json_dumps, json_loads, save_yaml_config
+
+logger = logging.getLogger(__name__)
+
+# 补丁日志超过该大小时合并回YAML配置文件
+PATCH_COMPACT_BYTES = 64 * 1024
+
+
+# 配置文件缺失时写入的默认配置（只读，不要修改）
+_DEFAULT_CONFIG = {
+    "agent_models": {
+        "bill_ackman": {
+            "default_model": "gpt-4o",
+            "default_provider": "OpenAI"
+        },
+        "michael_burry": {
+            "default_model": "gpt-4o",
+            "default_provider": "OpenAI"
+        },
+        "portfolio_manager": {
+            "default_model": "gpt-4o",
+            "default_provider": "OpenAI"
+        },
+        "rakesh_jhunjhunwala": {
+            "default_model": "gpt-4o",
+            "default_provider": "OpenAI"
+        }
+    },
+    "data_providers": {
+        "available": {
+            "financial_datasets": {
+                "api_key_env": "FINANCIAL_DATASETS_API_KEY",
+                "name": "FinancialDatasets.ai"
+            },
+            "tushare": {
+                "api_key_env": "TUSHARE_API_KEY",
+                "name": "Tushare Pro"
+            }
+        },
+        "default": "tushare"
+    },
+    "interfaces": {
+        "call_llm_aswath_damodaran_agent": {
+            "cache_layers": ["persistent"],
+            "cache_type": "llm_responses",
+            "ttl": {
+                "default": 86400
+            }
+        },
+        "call_llm_deepseek": {
+            "cache_key_components": ["prompt", "model_name", "pydantic_model", "agent_name"],
+            "cache_layers": ["persistent"],
+            "cache_type": "llm_responses",
+            "models": ["deepseek-reasoner", "deepseek-chat", "deepseek-*"],
+            "providers": ["DeepSeek"],
+            "timeout": {
+                "timeout_seconds": 30,
+                "max_retries": 3,
+                "retry_delay_factor": 0.1
+            },
+            "ttl": {
+                "default": 86400
+            }
+        },
+        "call_llm_other": {
+            "cache_layers": [],
+            "cache_type": "none",
+            "providers": ["OpenAI", "Anthropic", "Gemini", "Groq", "Ollama"],
+            "timeout": {
+                "timeout_seconds": 30,
+                "max_retries": 3,
+                "retry_delay_factor": 0.1
+            },
+            "ttl": {
+                "default": 0
+            }
+        },
+        "get_company_news": {
+            "cache_layers": ["memory", "persistent"],
+            "cache_type": "company_news",
+            "merge_key": "date",
+            "timeout": {
+                "timeout_seconds": 5,
+                "max_retries": 3,
+                "retry_delay_factor": 0.5
+            },
+            "ttl": {
+                "default": 86400
+            }
+        },
+        "get_financial_metrics": {
+            "cache_layers": ["memory", "persistent"],
+            "cache_type": "financial_metrics",
+            "merge_key": "report_period",
+            "timeout": {
+                "timeout_seconds": 5,
+                "max_retries": 3,
+                "retry_delay_factor": 0.5
+            },
+            "ttl": {
+                "default": 86400
+            }
+        },
+        "get_insider_trades": {
+            "cache_layers": ["memory", "persistent"],
+            "cache_type": "insider_trades",
+            "merge_key": "filing_date",
+            "timeout": {
+                "timeout_seconds": 5,
+                "max_retries": 3,
+                "retry_delay_factor": 0.5
+            },
+            "ttl": {
+                "default": 86400
+            }
+        },
+        "get_prices": {
+            "cache_layers": ["memory", "persistent"],
+            "cache_type": "prices",
+            "merge_key": "time",
+            "timeout": {
+                "timeout_seconds": 5,
+                "max_retries": 3,
+                "retry_delay_factor": 0.5
+            },
+            "ttl": {
+                "after_hours": 86400,
+                "market_hours": 3600
+            }
+        },
+        "search_line_items": {
+            "cache_layers": ["memory", "persistent"],
+            "cache_type": "line_items",
+            "merge_key": "report_period",
+            "timeout": {
+                "timeout_seconds": 5,
+                "max_retries": 3,
+                "retry_delay_factor": 0.5
+            },
+            "ttl": {
+                "default": 86400
+            }
+        }
+    }
+}
+
+
+@dataclass(slots=True, frozen=True)
+class TimeoutConfig:
+    """接口的超时与重试配置（解析一次，之后按属性读取）"""
+    timeout_seconds: int = 30          # 默认超时时间
+    max_retries: int = 3               # 默认重试次数
+    retry_delay_factor: float = 0.1    # 默认重试延迟系数
+    
+    @property
+    def retry_delay(self) -> float:
+        """实际的重试延迟时间（秒）"""
+        return self.timeout_seconds * self.retry_delay_factor
+
+
+def _file_state(path: Path) -> Optional[tuple]:
+    """文件的 (mtime_ns, 大小)，不存在时返回None"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _content_digest(raw: bytes) -> bytes:
+    """配置文件内容的摘要，用于判断重新加载时内容是否真的变化"""
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+@lru_cache(maxsize=None)
+def _default_config_digest(suffix: str) -> bytes:
+    """_DEFAULT_CONFIG 写入 suffix 格式文件时内容的摘要（首次使用时计算）"""
+    text = ConfigLoader(Path(f"default{suffix}")).serialize(_DEFAULT_CONFIG)
+    return hashlib.blake2b(text.encode('utf-8')).digest()
 
 
 class DataConfig:
@@ -20,160 +206,201 @@ class DataConfig:
             config_file = "conf/data_config.yaml"
         
         self.config_file = Path(config_file)
+        # 解析后的配置快照，YAML未变化时直接读取JSON，跳过YAML解析
+        self.sidecar_file = self.config_file.with_name(self.config_file.name + ".cache.json")
+        # 配置修改以增量记录追加到补丁日志，加载时重放并合并回YAML
+        self.patch_file = self.config_file.with_name(self.config_file.name + ".patch.jsonl")
+        # 缓存的本地小时及其失效时间（下一个整点），避免每次查询价格TTL都调用 localtime
+        self._hour_cache = (0, 0.0)
+        # 配置只在加载时解析一次，之后读取内存中的 self.config；修改和重新加载由该锁串行化
+        self._lock = threading.RLock()
+        # 最近一次加载/写入后 (YAML状态, 补丁日志状态) 和YAML内容摘要，reload_config 据此判断是否需要重新加载
+        self._source_state: tuple = (None, None)
+        self._config_digest: Optional[bytes] = None
         
-        # 检查配置文件是否存在，如果不存在则创建默认配置
-        if not self.config_file.exists():
-            self._create_default_config()
-        
-        # Load configuration from file
+        # Load configuration from file; 文件不存在时创建默认配置后再加载（不预先检查 exists()）
         try:
-            self.config = load_yaml_config(self.config_file)
+            try:
+                self.config = self._load()
+            except FileNotFoundError:
+                self._create_default_config()
+                self.config = self._load()
         except Exception as e:
             raise RuntimeError(f"加载配置文件失败: {self.config_file}, 错误: {e}")
+        self._build_cache_type_index()
+    
+    def _build_cache_type_index(self):
+        """建立 cache_type -> (接口名, 接口配置) 索引，多个接口同类型时保留第一个"""
+        # TTL结果缓存，键为 (cache_type, 是否交易时段)，非价格类型为 None；配置变化时随索引一起清空
+        self._ttl_cache: Dict[tuple, int] = {}
+        # 接口配置的只读视图和使用缓存的接口列表，首次访问时计算
+        self._interface_views: Dict[str, Mapping[str, Any]] = {}
+        self._cached_interfaces: Optional[tuple] = None
+        self._timeouts: Dict[str, TimeoutConfig] = {}
+        self._cache_type_index: Dict[str, tuple] = {}
+        for interface_name, config in self.config.get("interfaces", {}).items():
+            cache_type = config.get("cache_type")
+            if cache_type:
+                self._cache_type_index.setdefault(cache_type, (interface_name, config))
+    
+    def _load(self) -> Dict[str, Any]:
+        """加载配置：YAML的mtime和大小与JSON快照一致时读取快照，否则解析YAML并刷新快照"""
+        st = self.config_file.stat()
+        config, digest = self._read_sidecar(st)
+        if config is None:
+            # 刚写入的默认配置文件与 _DEFAULT_CONFIG 逐字节一致，直接复制默认配置，跳过YAML解析
+            raw = self.config_file.read_bytes()
+            if hashlib.blake2b(raw).digest() == _default_config_digest(self.config_file.suffix):
+                config = copy.deepcopy(_DEFAULT_CONFIG)
+            else:
+                config = ConfigLoader(self.config_file).parse(raw)
+            digest = _content_digest(raw)
+            self._write_sidecar(st, config, digest)
+        self._config_digest = digest
+        
+        # 重放上次运行留下的补丁，并把结果一次性合并回YAML
+        if self._replay_patches(config):
+            self._write_config(config)
+        
+        self._last_saved = self._snapshot(config)
+        self._remember_source_state()
+        return config
+    
+    def _remember_source_state(self):
+        """记录配置文件和补丁日志当前的 (mtime_ns, size)"""
+        self._source_state = (_file_state(self.config_file), _file_state(self.patch_file))
+    
+    def _source_unchanged(self) -> bool:
+        """
+        配置来源自上次加载后是否未变：先比较 mtime 和大小；YAML只是被 touch 或
+        原样重写时再比较内容摘要，内容相同则无需重新解析。
+        """
+        yaml_state, patch_state = _file_state(self.config_file), _file_state(self.patch_file)
+        if (yaml_state, patch_state) == self._source_state:
+            return True
+        if patch_state != self._source_state[1] or yaml_state is None or self._config_digest is None:
+            return False
+        try:
+            digest = _content_digest(self.config_file.read_bytes())
+        except OSError:
+            return False
+        if digest != self._config_digest:
+            return False
+        self._source_state = (yaml_state, patch_state)
+        return True
+    
+    def _replay_patches(self, config: Dict[str, Any]) -> bool:
+        """按顺序把补丁日志应用到config上，返回是否存在补丁"""
+        try:
+            with open(self.patch_file, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
+        
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self._apply_patch(config, json_loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("忽略无效的配置补丁 %r: %s", line[:200], e)
+        return True
+    
+    @staticmethod
+    def _apply_patch(config: Dict[str, Any], patch: Dict[str, Any]):
+        """应用单条补丁记录"""
+        op = patch["op"]
+        if op == "set_interface_ttl":
+            config.setdefault("interfaces", {}).setdefault(patch["interface"], {})["ttl"] = patch["ttl"]
+        elif op == "set_default_data_provider":
+            config.setdefault("data_providers", {})["default"] = patch["provider"]
+        else:
+            raise KeyError(f"unknown op {op}")
+    
+    @staticmethod
+    def _snapshot(config: Dict[str, Any]) -> bytes:
+        """配置内容的规范化JSON，用于判断配置是否有变化"""
+        return json_dumps(config, sort_keys=True, default=str)
+    
+    def _read_sidecar(self, st: os.stat_result) -> tuple:
+        """读取与当前YAML文件匹配的JSON快照，返回 (配置, 内容摘要)，不存在或已过期时配置为None"""
+        try:
+            with open(self.sidecar_file, 'rb') as f:
+                snapshot = json_loads(f.read())
+        except (OSError, ValueError):
+            return None, None
+        
+        if snapshot.get("mtime_ns") != st.st_mtime_ns or snapshot.get("size") != st.st_size:
+            return None, None
+        digest = snapshot.get("digest")
+        return snapshot.get("config"), bytes.fromhex(digest) if digest else None
+    
+    def _write_sidecar(self, st: os.stat_result, config: Dict[str, Any], digest: Optional[bytes] = None):
+        """原子写入JSON快照（先写临时文件再替换），失败时仅跳过缓存"""
+        tmp_file = self.sidecar_file.with_name(f"{self.sidecar_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(json_dumps({"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                                    "digest": digest.hex() if digest else None, "config": config}))
+            os.replace(tmp_file, self.sidecar_file)
+        except (OSError, TypeError, ValueError):
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
     
     def _create_default_config(self):
         """Create a default configuration file."""
-        default_config = {
-            "agent_models": {
-                "bill_ackman": {
-                    "default_model": "gpt-4o",
-                    "default_provider": "OpenAI"
-                },
-                "michael_burry": {
-                    "default_model": "gpt-4o",
-                    "default_provider": "OpenAI"
-                },
-                "portfolio_manager": {
-                    "default_model": "gpt-4o",
-                    "default_provider": "OpenAI"
-                },
-                "rakesh_jhunjhunwala": {
-                    "default_model": "gpt-4o",
-                    "default_provider": "OpenAI"
-                }
-            },
-            "data_providers": {
-                "available": {
-                    "financial_datasets": {
-                        "api_key_env": "FINANCIAL_DATASETS_API_KEY",
-                        "name": "FinancialDatasets.ai"
-                    },
-                    "tushare": {
-                        "api_key_env": "TUSHARE_API_KEY",
-                        "name": "Tushare Pro"
-                    }
-                },
-                "default": "tushare"
-            },
-            "interfaces": {
-                "call_llm_deepseek": {
-                    "cache_key_components": ["prompt", "model_name", "pydantic_model", "agent_name"],
-                    "cache_layers": ["persistent"],
-                    "cache_type": "llm_responses",
-                    "models": ["deepseek-reasoner", "deepseek-chat", "deepseek-*"],
-                    "providers": ["DeepSeek"],
-                    "timeout": {
-                        "timeout_seconds": 30,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.1
-                    },
-                    "ttl": {
-                        "default": 86400
-                    }
-                },
-                "call_llm_other": {
-                    "cache_layers": [],
-                    "cache_type": "none",
-                    "providers": ["OpenAI", "Anthropic", "Gemini", "Groq", "Ollama"],
-                    "timeout": {
-                        "timeout_seconds": 30,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.1
-                    },
-                    "ttl": {
-                        "default": 0
-                    }
-                },
-                "get_company_news": {
-                    "cache_layers": ["memory", "persistent"],
-                    "cache_type": "company_news",
-                    "merge_key": "date",
-                    "timeout": {
-                        "timeout_seconds": 5,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.5
-                    },
-                    "ttl": {
-                        "default": 86400
-                    }
-                },
-                "get_financial_metrics": {
-                    "cache_layers": ["memory", "persistent"],
-                    "cache_type": "financial_metrics",
-                    "merge_key": "report_period",
-                    "timeout": {
-                        "timeout_seconds": 5,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.5
-                    },
-                    "ttl": {
-                        "default": 86400
-                    }
-                },
-                "get_insider_trades": {
-                    "cache_layers": ["memory", "persistent"],
-                    "cache_type": "insider_trades",
-                    "merge_key": "filing_date",
-                    "timeout": {
-                        "timeout_seconds": 5,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.5
-                    },
-                    "ttl": {
-                        "default": 86400
-                    }
-                },
-                "get_prices": {
-                    "cache_layers": ["memory", "persistent"],
-                    "cache_type": "prices",
-                    "merge_key": "time",
-                    "timeout": {
-                        "timeout_seconds": 5,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.5
-                    },
-                    "ttl": {
-                        "after_hours": 86400,
-                        "market_hours": 3600
-                    }
-                },
-                "search_line_items": {
-                    "cache_layers": ["memory", "persistent"],
-                    "cache_type": "line_items",
-                    "merge_key": "report_period",
-                    "timeout": {
-                        "timeout_seconds": 5,
-                        "max_retries": 3,
-                        "retry_delay_factor": 0.5
-                    },
-                    "ttl": {
-                        "default": 86400
-                    }
-                }
-            }
-        }
-        
         # Create directory if it doesn't exist
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Save the default configuration
-        if not save_yaml_config(self.config_file, default_config):
+        if not save_yaml_config(self.config_file, _DEFAULT_CONFIG):
             raise RuntimeError(f"无法创建默认配置文件: {self.config_file}")
     
     def _save_config(self, config: Dict[str, Any]):
-        """Save configuration to file."""
+        """Save configuration to file, skipping the write when nothing changed."""
+        snapshot = self._snapshot(config)
+        if snapshot == self._last_saved:
+            return
+        
+        self._write_config(config)
+        self._last_saved = snapshot
+    
+    def _write_config(self, config: Dict[str, Any]):
+        """完整写入YAML配置，刷新JSON快照并清空已合并的补丁日志"""
         if not save_yaml_config(self.config_file, config):
             raise RuntimeError(f"保存配置文件失败: {self.config_file}")
+        # 同步刷新JSON快照，下次启动无需重新解析YAML；写入内容的摘要未计算，按未知处理
+        self._write_sidecar(self.config_file.stat(), config)
+        self._config_digest = None
+        try:
+            self.patch_file.unlink()
+        except FileNotFoundError:
+            pass
+        self._remember_source_state()
+    
+    def _record_patch(self, patch: Dict[str, Any]):
+        """
+        持久化一次配置修改：只追加这一条补丁记录，不序列化整个配置；
+        补丁日志过大时才生成快照并合并回YAML。未变化的修改由调用方跳过。
+        """
+        line = json_dumps(patch) + b"\n"
+        try:
+            with open(self.patch_file, 'ab') as f:
+                f.write(line)
+                size = f.tell()
+        except OSError as e:
+            logger.warning("无法写入配置补丁 %s: %s，改为完整保存", self.patch_file, e)
+            self._last_saved = None
+            self._save_config(self.config)
+            return
+        
+        # 内存配置已偏离上次完整保存的内容，快照留到合并时再生成
+        self._last_saved = None
+        self._remember_source_state()
+        if size > PATCH_COMPACT_BYTES:
+            self._save_config(self.config)
     
     def get_ttl(self, cache_type: str, **kwargs) -> int:
         """
@@ -186,29 +413,49 @@ class DataConfig:
         Returns:
             TTL in seconds
         """
-        # Find interface with this cache_type
-        interfaces = self.config.get("interfaces", {})
-        interface_config = None
+        if cache_type == "prices":
+            return self._get_prices_ttl()
         
-        for interface_name, config in interfaces.items():
-            if config.get("cache_type") == cache_type:
-                interface_config = config
-                break
+        if (ttl := self._ttl_cache.get((cache_type, None))) is not None:
+            return ttl
         
-        if not interface_config:
-            print(f"Warning: Unknown cache type '{cache_type}', using default TTL")
+        # Find interface with this cache_type
+        entry = self._cache_type_index.get(cache_type)
+        if not entry:
+            logger.warning("Unknown cache type '%s', using default TTL", cache_type)
             return 3600  # 1 hour default
         
-        ttl_config = interface_config.get("ttl", {})
+        _, interface_config = entry
+        ttl = interface_config.get("ttl", {}).get("default", 3600)
+        self._ttl_cache[(cache_type, None)] = ttl
+        return ttl
+    
+    def _get_prices_ttl(self) -> int:
+        """价格数据的TTL：交易时段和非交易时段分别配置，只有这里依赖当前时间"""
+        is_market_hours = 9 <= self._current_hour() <= 16  # Rough market hours
+        if (ttl := self._ttl_cache.get(("prices", is_market_hours))) is not None:
+            return ttl
         
-        # Special handling for prices based on market hours
-        if cache_type == "prices":
-            current_hour = datetime.now().hour
-            is_market_hours = 9 <= current_hour <= 16  # Rough market hours
-            return ttl_config.get("market_hours", 3600) if is_market_hours else ttl_config.get("after_hours", 86400)
+        entry = self._cache_type_index.get("prices")
+        if not entry:
+            logger.warning("Unknown cache type '%s', using default TTL", "prices")
+            return 3600  # 1 hour default
         
-        # Default handling
-        return ttl_config.get("default", 3600)
+        _, interface_config = entry
+        ttl_config = interface_config.get("ttl", {})
+        ttl = ttl_config.get("market_hours", 3600) if is_market_hours else ttl_config.get("after_hours", 86400)
+        self._ttl_cache[("prices", is_market_hours)] = ttl
+        return ttl
+    
+    def _current_hour(self) -> int:
+        """当前本地小时，缓存到下一个整点，期间只需一次 time.time() 调用"""
+        hour, expires_at = self._hour_cache
+        now = time.time()
+        if now >= expires_at:
+            local = time.localtime(now)
+            hour = local.tm_hour
+            self._hour_cache = (hour, int(now) - local.tm_min * 60 - local.tm_sec + 3600)
+        return hour
     
     def set_ttl(self, cache_type: str, ttl_config: Dict[str, int]):
         """
@@ -218,16 +465,19 @@ class DataConfig:
             cache_type: Type of cache
             ttl_config: TTL configuration dictionary
         """
-        interfaces = self.config.get("interfaces", {})
-        
         # Find interface with this cache_type
-        for interface_name, config in interfaces.items():
-            if config.get("cache_type") == cache_type:
+        entry = self._cache_type_index.get(cache_type)
+        if entry:
+            interface_name, config = entry
+            with self._lock:
+                if config.get("ttl") == ttl_config:
+                    return
                 config["ttl"] = ttl_config
-                self._save_config(self.config)
-                return
+                self._ttl_cache.clear()
+                self._record_patch({"op": "set_interface_ttl", "interface": interface_name, "ttl": ttl_config})
+            return
         
-        print(f"Warning: Cache type '{cache_type}' not found in any interface")
+        logger.warning("Cache type '%s' not found in any interface", cache_type)
     
     def set_interface_ttl(self, interface_name: str, ttl_config: Dict[str, int]):
         """
@@ -237,39 +487,53 @@ class DataConfig:
             interface_name: Name of the interface
             ttl_config: TTL configuration dictionary
         """
-        if "interfaces" not in self.config:
-            self.config["interfaces"] = {}
-        
-        if interface_name not in self.config["interfaces"]:
-            print(f"Warning: Interface '{interface_name}' not found")
-            return
-        
-        self.config["interfaces"][interface_name]["ttl"] = ttl_config
-        self._save_config(self.config)
+        with self._lock:
+            if "interfaces" not in self.config:
+                self.config["interfaces"] = {}
+            
+            if interface_name not in self.config["interfaces"]:
+                logger.warning("Interface '%s' not found", interface_name)
+                return
+            
+            if self.config["interfaces"][interface_name].get("ttl") == ttl_config:
+                return
+            self.config["interfaces"][interface_name]["ttl"] = ttl_config
+            self._ttl_cache.clear()
+            self._interface_views.clear()
+            self._cached_interfaces = None
+            self._record_patch({"op": "set_interface_ttl", "interface": interface_name, "ttl": ttl_config})
     
-    def get_all_config(self) -> Dict[str, Any]:
-        """Get all TTL configurations."""
-        return self.config.copy()
+    def get_all_config(self) -> Mapping[str, Any]:
+        """Get all TTL configurations as a read-only view."""
+        return MappingProxyType(self.config)
     
     def reset_to_defaults(self):
         """Reset configuration to defaults. 此方法已不再支持，因为不再有默认配置。"""
         raise NotImplementedError("不再支持重置到默认配置，请确保配置文件存在且正确")
     
     def reload_config(self):
-        """重新加载配置文件"""
-        try:
-            self.config = load_yaml_config(self.config_file)
-        except Exception as e:
-            raise RuntimeError(f"重新加载配置文件失败: {self.config_file}, 错误: {e}")
+        """重新加载配置文件（唯一会重新读取磁盘的入口），配置文件和补丁日志都未变化时跳过"""
+        with self._lock:
+            if self._source_unchanged():
+                logger.debug("配置文件未变化，跳过重新加载: %s", self.config_file)
+                return
+            try:
+                self.config = self._load()
+            except Exception as e:
+                raise RuntimeError(f"重新加载配置文件失败: {self.config_file}, 错误: {e}")
+            self._build_cache_type_index()
+            self._invalidate_provider_views()
     
-    def get_interfaces(self) -> Dict[str, Any]:
-        """Get all interface configurations."""
-        return self.config.get("interfaces", {})
+    def get_interfaces(self) -> Mapping[str, Any]:
+        """Get all interface configurations as a read-only view."""
+        return MappingProxyType(self.config.get("interfaces", {}))
     
-    def get_interface_config(self, interface_name: str) -> Dict[str, Any]:
-        """Get full configuration for a specific interface."""
-        interfaces = self.get_interfaces()
-        return interfaces.get(interface_name, {})
+    def get_interface_config(self, interface_name: str) -> Mapping[str, Any]:
+        """Get full configuration for a specific interface as a read-only view."""
+        if (view := self._interface_views.get(interface_name)) is None:
+            view = MappingProxyType(self.config.get("interfaces", {}).get(interface_name, {}))
+            self._interface_views[interface_name] = view
+        return view
     
     def get_interface_cache_type(self, interface_name: str) -> str:
         """Get cache type for a specific interface."""
@@ -299,46 +563,71 @@ class DataConfig:
         provider = agent_config.get("default_provider", "OpenAI")
         return model, provider
     
-    def list_cached_interfaces(self) -> list:
+    def list_cached_interfaces(self) -> tuple:
         """List all interfaces that use caching."""
-        interfaces = self.get_interfaces()
-        cached_interfaces = []
-        for interface, config in interfaces.items():
-            if config.get("cache_type", "none") != "none":
-                cached_interfaces.append(interface)
-        return cached_interfaces
-    
-    def get_data_provider_config(self) -> Dict[str, Any]:
-        """获取数据提供商配置"""
+        if self._cached_interfaces is None:
+            self._cached_interfaces = tuple(
+                interface
+                for interface, config in self.get_interfaces().items()
+                if config.get("cache_type", "none") != "none"
+            )
+        return self._cached_interfaces
+    
+    # 由配置派生、按需计算并缓存在实例上的属性，配置变化时需要清除
+    _PROVIDER_VIEWS = ("data_provider_config", "default_data_provider", "available_data_providers")
+    
+    def _invalidate_provider_views(self):
+        """清除缓存的数据提供商派生属性"""
+        for name in self._PROVIDER_VIEWS:
+            self.__dict__.pop(name, None)
+    
+    @cached_property
+    def data_provider_config(self) -> Mapping[str, Any]:
+        """数据提供商配置（只读视图）"""
         data_providers = self.config.get('data_providers')
         if not data_providers:
             raise ValueError("配置文件中缺少 data_providers 配置")
-        return data_providers
+        return MappingProxyType(data_providers)
     
-    def get_default_data_provider(self) -> str:
-        """获取默认数据提供商"""
-        config = self.get_data_provider_config()
-        default_provider = config.get('default')
+    @cached_property
+    def default_data_provider(self) -> str:
+        """默认数据提供商"""
+        default_provider = self.data_provider_config.get('default')
         if not default_provider:
             raise ValueError("配置文件中缺少默认数据提供商配置")
         return default_provider
     
+    @cached_property
+    def available_data_providers(self) -> Mapping[str, Any]:
+        """可用的数据提供商列表（只读视图）"""
+        available = self.data_provider_config.get('available')
+        if available is None:
+            raise ValueError("配置文件中缺少可用数据提供商配置")
+        return MappingProxyType(available) if isinstance(available, dict) else available
+    
+    def get_data_provider_config(self) -> Mapping[str, Any]:
+        """获取数据提供商配置"""
+        return self.data_provider_config
+    
+    def get_default_data_provider(self) -> str:
+        """获取默认数据提供商"""
+        return self.default_data_provider
+    
     def set_default_data_provider(self, provider_name: str):
         """设置默认数据提供商"""
         if 'data_providers' not in self.config:
             raise ValueError("配置文件中缺少 data_providers 配置")
         
-        self.config['data_providers']['default'] = provider_name
-        self._save_config(self.config)
-        print(f"默认数据提供商已设置为: {provider_name}")
+        with self._lock:
+            if self.config['data_providers'].get('default') != provider_name:
+                self.config['data_providers']['default'] = provider_name
+                self._invalidate_provider_views()
+                self._record_patch({"op": "set_default_data_provider", "provider": provider_name})
+        logger.info("默认数据提供商已设置为: %s", provider_name)
     
-    def get_available_data_providers(self) -> Dict[str, Any]:
+    def get_available_data_providers(self) -> Mapping[str, Any]:
         """获取可用的数据提供商列表"""
-        config = self.get_data_provider_config()
-        available = config.get('available')
-        if available is None:
-            raise ValueError("配置文件中缺少可用数据提供商配置")
-        return available
+        return self.available_data_providers
     
     def get_timeout_config(self, interface_name: str) -> Dict[str, Any]:
         """获取接口的超时配置"""
@@ -349,34 +638,47 @@ class DataConfig:
             "retry_delay_factor": 0.1  # 默认重试延迟系数
         })
     
+    def _get_timeout(self, interface_name: str) -> TimeoutConfig:
+        """接口超时配置的解析结果，首次访问时构建并缓存"""
+        if (timeout := self._timeouts.get(interface_name)) is None:
+            timeout_config = self.get_timeout_config(interface_name)
+            timeout = TimeoutConfig(
+                timeout_seconds=timeout_config.get("timeout_seconds", 30),
+                max_retries=timeout_config.get("max_retries", 3),
+                retry_delay_factor=timeout_config.get("retry_delay_factor", 0.1),
+            )
+            self._timeouts[interface_name] = timeout
+        return timeout
+    
     def get_timeout_seconds(self, interface_name: str) -> int:
         """获取接口的超时时间（秒）"""
-        timeout_config = self.get_timeout_config(interface_name)
-        return timeout_config.get("timeout_seconds", 30)
+        return self._get_timeout(interface_name).timeout_seconds
     
     def get_max_retries(self, interface_name: str) -> int:
         """获取接口的最大重试次数"""
-        timeout_config = self.get_timeout_config(interface_name)
-        return timeout_config.get("max_retries", 3)
+        return self._get_timeout(interface_name).max_retries
     
     def get_retry_delay_factor(self, interface_name: str) -> float:
         """获取接口的重试延迟系数"""
-        timeout_config = self.get_timeout_config(interface_name)
-        return timeout_config.get("retry_delay_factor", 0.1)
+        return self._get_timeout(interface_name).retry_delay_factor
     
     def get_retry_delay(self, interface_name: str) -> float:
         """计算实际的重试延迟时间（秒）"""
-        timeout_seconds = self.get_timeout_seconds(interface_name)
-        delay_factor = self.get_retry_delay_factor(interface_name)
-        return timeout_seconds * delay_factor
+        return self._get_timeout(interface_name).retry_delay
 
 
-# Global cache config instance
-_data_config = DataConfig()
+# Global data config instance, created on first use so importing this module does no file I/O
+_data_config: Optional[DataConfig] = None
+_data_config_lock = threading.Lock()
 
 
 def get_data_config() -> DataConfig:
     """Get the global data configuration instance."""
+    global _data_config
+    if _data_config is None:
+        with _data_config_lock:
+            if _data_config is None:
+                _data_config = DataConfig()
     return _data_config
 
 
@@ -388,29 +690,29 @@ def get_cache_config() -> DataConfig:
 
 def get_cache_ttl(cache_type: str, **kwargs) -> int:
     """Get TTL for a cache type."""
-    return _data_config.get_ttl(cache_type, **kwargs)
+    return get_data_config().get_ttl(cache_type, **kwargs)
 
 
 def set_cache_ttl(cache_type: str, ttl_config: Dict[str, int]):
     """Set TTL configuration for a cache type."""
-    _data_config.set_ttl(cache_type, ttl_config)
+    get_data_config().set_ttl(cache_type, ttl_config)
 
 
 def get_timeout_config(interface_name: str) -> Dict[str, Any]:
     """Get timeout configuration for an interface."""
-    return _data_config.get_timeout_config(interface_name)
+    return get_data_config().get_timeout_config(interface_name)
 
 
 def get_timeout_seconds(interface_name: str) -> int:
     """Get timeout seconds for an interface."""
-    return _data_config.get_timeout_seconds(interface_name)
+    return get_data_config().get_timeout_seconds(interface_name)
 
 
 def get_max_retries(interface_name: str) -> int:
     """Get max retries for an interface."""
-    return _data_config.get_max_retries(interface_name)
+    return get_data_config().get_max_retries(interface_name)
 
 
 def get_retry_delay(interface_name: str) -> float:
     """Get retry delay for an interface."""
-    return _data_config.get_retry_delay(interface_name) 
\ No newline at end of file
+    return get_data_config().get_retry_delay(interface_name) 
\ No newline at end of file
@@ -5,9 +5,17 @@
 """
 
 from .base import DatabaseAPI
-from .duckdb_impl import DuckDBAPI
 from typing import Dict, Any
 
+
+def __getattr__(name: str):
+    # DuckDBAPI 依赖 duckdb 和 pandas，首次使用时才导入
+    if name == "DuckDBAPI":
+        from .duckdb_impl import DuckDBAPI
+        return DuckDBAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_database_api(db_type: str = "duckdb", **kwargs: Any) -> DatabaseAPI:
     """
     数据库API工厂函数。
@@ -26,6 +34,7 @@ def get_database_api(db_type: str = "duckdb", **kwargs: Any) -> DatabaseAPI:
         # 确保 'db_path' 参数被提供
         if "db_path" not in kwargs:
             raise ValueError("DuckDBAPI requires a 'db_path' argument.")
+        from .duckdb_impl import DuckDBAPI
         return DuckDBAPI(db_path=kwargs["db_path"])
     
     # 在此添加对其他数据库类型的支持
@@ -3,9 +3,12 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Type, List, Dict, Any, Optional
+from typing import Type, List, Dict, Any, Iterable, Optional, Tuple, TYPE_CHECKING
 from pydantic import BaseModel
-import pandas as pd
+
+if TYPE_CHECKING:
+    # 仅用于类型注解；运行时不导入 pandas，导入数据库接口不必付出 pandas 的加载开销
+    import pandas as pd
 
 
 class DatabaseAPI(ABC):
@@ -58,6 +61,27 @@ class DatabaseAPI(ABC):
         """
         pass
 
+    def upsert_data_streaming(
+        self,
+        table_name: str,
+        model: Type[BaseModel],
+        batches: Iterable[List[BaseModel]],
+        primary_keys: List[str]
+    ) -> None:
+        """
+        将多批 Pydantic 模型插入或更新到表中，后出现的记录覆盖先出现的同主键记录。
+        默认实现逐批调用 upsert_data_from_models，具体实现可以合并为一次写入。
+
+        Args:
+            table_name: 表名。
+            model: 各批数据的 Pydantic 模型类。
+            batches: 模型实例列表的可迭代对象（可以是生成器）。
+            primary_keys: 主键字段列表。
+        """
+        for batch in batches:
+            if batch:
+                self.upsert_data_from_models(table_name, batch, primary_keys)
+
     @abstractmethod
     def upsert_data_from_dicts(
         self,
@@ -79,7 +103,7 @@ class DatabaseAPI(ABC):
     def insert_dataframe(
         self,
         table_name: str,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         if_exists: str = "append"
     ) -> None:
         """
@@ -117,7 +141,7 @@ class DatabaseAPI(ABC):
         self,
         query: str,
         params: Optional[List[Any]] = None
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """
         执行查询并将结果返回为 DataFrame。
 
@@ -130,6 +154,24 @@ class DatabaseAPI(ABC):
         """
         pass
 
+    def query_many(
+        self,
+        items: List[Tuple[str, Optional[List[Any]]]],
+        max_workers: Optional[int] = None
+    ) -> List["pd.DataFrame"]:
+        """
+        执行多条相互独立的查询，按输入顺序返回结果。
+        默认实现逐条调用 query_to_dataframe，具体实现可以并行执行。
+
+        Args:
+            items: (SQL 查询字符串, 查询参数) 的列表，参数可以为 None。
+            max_workers: 最大并行数，None 表示由实现决定。
+
+        Returns:
+            与 items 一一对应的 DataFrame 列表。
+        """
+        return [self.query_to_dataframe(query, params) for query, params in items]
+
     @abstractmethod
     def table_exists(self, table_name: str) -> bool:
         """
@@ -2,29 +2,56 @@
 DuckDB 数据库接口的具体实现。
 """
 
-import duckdb
-import pandas as pd
-import time
+import importlib.util
 import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pydantic import BaseModel
-from typing import Type, List, Dict, Any, Optional, get_type_hints, get_origin, get_args
+from typing import Type, List, Dict, Any, Iterable, Optional, Tuple, TYPE_CHECKING, get_type_hints, get_origin, get_args
 from datetime import datetime
 
 from .base import DatabaseAPI
 
+if TYPE_CHECKING:
+    # 仅用于类型注解；duckdb、pandas、pyarrow 在实际用到的方法中才导入，导入本模块不必付出它们的加载开销
+    import duckdb
+    import pandas as pd
+
+# 只探测 pyarrow 是否安装，不在导入时加载
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
 logger = logging.getLogger(__name__)
 
+# 价格以定点整数存储：值 = 价格 * 100 向零截断，列类型为 INTEGER（32位），
+# 写入前在 Arrow/pandas 中就转换为 int32，读取时在构建模型时才除以 100 还原为浮点
+PRICE_INT_COLUMNS = ('open', 'close', 'high', 'low')
+NOT_CONNECTED_MESSAGE = "Database connection is not established. Call connect() first."
+# 流式 upsert 时附加的行序号列，同一主键出现多次时只保留序号最大的一行
+UPSERT_SEQ_COLUMN = '__upsert_seq'
+# 可能改变表集合的语句；通过查询接口执行这类原始 SQL 后，table_exists 的缓存失效
+_DDL_PATTERN = re.compile(r'\s*(CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+
+def _execute_not_connected(*args, **kwargs):
+    """未连接时代替 conn.execute 的占位函数。"""
+    raise ConnectionError(NOT_CONNECTED_MESSAGE)
+
+
+_SQL_TYPES = {str: "VARCHAR", float: "DOUBLE", int: "BIGINT", bool: "BOOLEAN", datetime: "TIMESTAMP"}
+
+
+def _quote_table_name(table_name: str) -> str:
+    """把（可能带 schema 前缀的）表名按点分段，各段用双引号转义后引用。"""
+    return '.'.join('"' + part.replace('"', '""') + '"' for part in table_name.split('.'))
+
 
 def _get_pydantic_sql_type(field_type) -> str:
     """将 Pydantic/Python 类型映射到 DuckDB SQL 类型。"""
     origin = get_origin(field_type)
     if origin is None:  # Simple type
-        if field_type is str: return "VARCHAR"
-        if field_type is float: return "DOUBLE"
-        if field_type is int: return "BIGINT"
-        if field_type is bool: return "BOOLEAN"
-        if field_type is datetime: return "TIMESTAMP"
+        return _SQL_TYPES.get(field_type, "VARCHAR")
     
     args = get_args(field_type)
     if len(args) == 2 and args[1] is type(None): # Optional[T]
@@ -33,20 +60,103 @@ def _get_pydantic_sql_type(field_type) -> str:
     return "VARCHAR"  # Default
 
 
+@lru_cache(maxsize=None)
+def _compile_create_ddl(model: Type[BaseModel], table_name: str, primary_keys: tuple) -> str:
+    """生成模型对应的 CREATE TABLE 语句，每个 (模型, 表名, 主键) 组合在进程内只解析一次类型注解。"""
+    fields = get_type_hints(model)
+    
+    columns_sql = []
+    for name, field_type in fields.items():
+        if name == 'model_config': continue
+        
+        # Special handling for price table to use INTEGER for storage optimization
+        if name in PRICE_INT_COLUMNS:
+            sql_type = 'INTEGER'  # 32-bit fixed-point, see PRICE_INT_COLUMNS
+        else:
+            sql_type = _get_pydantic_sql_type(field_type)
+        
+        columns_sql.append(f'"{name}" {sql_type}')
+    
+    if primary_keys:
+        pk_sql = "PRIMARY KEY (" + ", ".join(f'"{pk}"' for pk in primary_keys) + ")"
+        columns_sql.append(pk_sql)
+    
+    return f'CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(columns_sql)})'
+
+
+def _get_pydantic_arrow_type(field_type):
+    """将 Pydantic/Python 类型映射到 Arrow 类型，无法精确映射时返回 None。"""
+    import pyarrow as pa
+
+    origin = get_origin(field_type)
+    if origin is None:  # Simple type
+        if field_type is str: return pa.string()
+        if field_type is float: return pa.float64()
+        if field_type is int: return pa.int64()
+        if field_type is bool: return pa.bool_()
+        if field_type is datetime: return pa.timestamp("us")
+        return None
+    
+    args = get_args(field_type)
+    if len(args) == 2 and args[1] is type(None): # Optional[T]
+        return _get_pydantic_arrow_type(args[0])
+
+    return None
+
+
+def _scale_price_columns_arrow(table):
+    """把价格列整体乘100并截断为 int32 定点整数，缺失值保留为 NULL，超出 int32 范围时报错。"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for key in PRICE_INT_COLUMNS:
+        index = table.schema.get_field_index(key)
+        if index == -1:
+            continue
+        # 先不安全转换完成截断，再安全收窄到 int32，溢出时抛错而不是静默回绕
+        scaled = pc.cast(pc.cast(pc.multiply(table.column(index), 100), pa.int64(), safe=False), pa.int32())
+        table = table.set_column(index, key, scaled)
+    return table
+
+
+def _storage_arrow_schema(schema, is_price: bool):
+    """价格列在写入前会转换为整数，返回转换后的 schema。"""
+    if not is_price:
+        return schema
+    import pyarrow as pa
+
+    for key in PRICE_INT_COLUMNS:
+        index = schema.get_field_index(key)
+        if index != -1:
+            schema = schema.set(index, pa.field(key, pa.int32()))
+    return schema
+
+
 class DuckDBAPI(DatabaseAPI):
     """使用 DuckDB 实现数据库操作的接口。"""
     
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.conn: Optional[duckdb.DuckDBPyConnection] = None
+        self.conn: Optional["duckdb.DuckDBPyConnection"] = None
+        # 查询热路径直接调用绑定好的 conn.execute；未连接时为抛出 ConnectionError 的占位函数
+        self._execute = _execute_not_connected
+        # 生成的 upsert/insert SQL 按 (表名, 列, 主键) 缓存，批量写入时不必重复拼接
+        self._upsert_sql_cache: Dict[tuple, str] = {}
+        self._insert_sql_cache: Dict[str, tuple] = {}
+        # 每个模型对应的 Arrow schema，None 表示模型含有无法映射的字段类型
+        self._arrow_schema_cache: Dict[type, Any] = {}
+        # 已确认存在的表，命中后 table_exists 不再查询 information_schema
+        self._known_tables: set = set()
         
         db_dir = os.path.dirname(db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
-    def connect(self, read_only: bool = True, **kwargs: Any) -> duckdb.DuckDBPyConnection:
+    def connect(self, read_only: bool = True, **kwargs: Any) -> "duckdb.DuckDBPyConnection":
         """建立并返回一个 DuckDB 连接。"""
         if self.conn is None:
+            import duckdb
+
             logger.info(f"Attempting to connect to database at: {self.db_path}")
             logger.info(f"Database file exists: {os.path.exists(self.db_path)}")
             logger.info(f"Database WAL file exists: {os.path.exists(self.db_path + '.wal')}")
@@ -54,6 +164,7 @@ class DuckDBAPI(DatabaseAPI):
             try:
                 logger.info(f"Connecting with read_only: {read_only}, kwargs: {kwargs}")
                 self.conn = duckdb.connect(database=self.db_path, read_only=False, **kwargs)
+                self._execute = self.conn.execute
                 logger.info("Database connection successful.")
             except Exception as e:
                 logger.error(f"Failed to connect to database at {self.db_path}: {e}", exc_info=True)
@@ -65,11 +176,13 @@ class DuckDBAPI(DatabaseAPI):
         if self.conn:
             self.conn.close()
             self.conn = None
+            self._execute = _execute_not_connected
+        self._known_tables.clear()
 
     def _ensure_connection(self):
         """确保连接是活动的。"""
         if self.conn is None:
-            raise ConnectionError("Database connection is not established. Call connect() first.")
+            raise ConnectionError(NOT_CONNECTED_MESSAGE)
 
     def create_table_from_model(
         self,
@@ -78,27 +191,8 @@ class DuckDBAPI(DatabaseAPI):
         primary_keys: Optional[List[str]] = None
     ) -> None:
         self._ensure_connection()
-        fields = get_type_hints(model)
-        
-        columns_sql = []
-        for name, field_type in fields.items():
-            if name == 'model_config': continue
-            
-            # Special handling for price table to use INTEGER for storage optimization
-            if name in ['open', 'close', 'high', 'low']:
-                sql_type = 'INTEGER'
-            else:
-                sql_type = _get_pydantic_sql_type(field_type)
-            
-            columns_sql.append(f'"{name}" {sql_type}')
-        
-        if primary_keys:
-            pk_sql = "PRIMARY KEY (" + ", ".join(f'"{pk}"' for pk in primary_keys) + ")"
-            columns_sql.append(pk_sql)
-        
-        create_table_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(columns_sql)})'
-        
-        self.conn.execute(create_table_sql)
+        self.conn.execute(_compile_create_ddl(model, table_name, tuple(primary_keys or ())))
+        self._known_tables.add(table_name)
         logger.info(f"Table '{table_name}' is ready in DuckDB.")
 
     def upsert_data_from_models(
@@ -113,29 +207,120 @@ class DuckDBAPI(DatabaseAPI):
             return
 
         model = data[0].__class__
+        is_price = model.__name__ == 'Price'
+        
+        # 有 pyarrow 且字段类型都能映射时直接构建 Arrow 表交给 DuckDB，不经过 pandas 的类型推断和复制
+        schema = self._get_arrow_schema(model)
+        if schema is not None:
+            table = self._models_to_arrow(model, data, schema, is_price)
+            self._upsert_frame(table_name, table, tuple(schema.names), primary_keys, table.num_rows)
+            return
+
+        import numpy as np
+        import pandas as pd
+
+        df = pd.DataFrame(self._model_columns(model, data))
         
         # Special handling for price data to convert floats to integers
-        if model.__name__ == 'Price':
-            data_dicts = []
-            for m in data:
-                d = m.model_dump(exclude_none=True)
-                for key in ['open', 'close', 'high', 'low']:
-                    if key in d and isinstance(d[key], float):
-                        d[key] = int(d[key] * 100)
-                data_dicts.append(d)
-        else:
-            data_dicts = [m.model_dump(exclude_none=True) for m in data]
+        if is_price:
+            for key in PRICE_INT_COLUMNS:
+                # 按列整体乘100并向零截断，与逐行 int(x * 100) 结果一致，缺失值保留为 NULL
+                df[key] = np.trunc(pd.to_numeric(df[key]) * 100).astype("Int32")
+        
+        self._upsert_dataframe(table_name, df, primary_keys)
 
-        model_fields = list(model.model_fields.keys())
-        df = pd.DataFrame(data_dicts)
+    def upsert_data_streaming(
+        self,
+        table_name: str,
+        model: Type[BaseModel],
+        batches: Iterable[List[BaseModel]],
+        primary_keys: List[str]
+    ) -> None:
+        """
+        把多批模型作为一个 Arrow 流注册给 DuckDB，在一个事务中用一条 upsert 语句写入，
+        只解析和规划一次；pyarrow 不可用时在同一事务中逐批写入。
+        """
+        self._ensure_connection()
+        schema = self._get_arrow_schema(model)
+        is_price = model.__name__ == 'Price'
         
-        for col in model_fields:
-            if col not in df.columns:
-                df[col] = None
+        self.conn.begin()
+        try:
+            if schema is None:
+                for batch in batches:
+                    if batch:
+                        self.upsert_data_from_models(table_name, batch, primary_keys)
+            else:
+                self._upsert_arrow_stream(table_name, model, schema, batches, primary_keys, is_price)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def _upsert_arrow_stream(self, table_name: str, model: Type[BaseModel], schema, batches: Iterable[List[BaseModel]], primary_keys: List[str], is_price: bool):
+        """以 RecordBatchReader 流式写入，各批附加递增序号以保持后写覆盖先写的语义。"""
+        import pyarrow as pa
+
+        stream_schema = _storage_arrow_schema(schema, is_price).append(pa.field(UPSERT_SEQ_COLUMN, pa.int64()))
+        num_rows = 0
+
+        def record_batches():
+            nonlocal num_rows
+            for batch in batches:
+                if not batch:
+                    continue
+                table = self._models_to_arrow(model, batch, schema, is_price)
+                seq = pa.array(range(num_rows, num_rows + table.num_rows), type=pa.int64())
+                num_rows += table.num_rows
+                yield from table.append_column(UPSERT_SEQ_COLUMN, seq).to_batches()
+
+        reader = pa.RecordBatchReader.from_batches(stream_schema, record_batches())
+        temp_table_name = f"temp_upsert_{table_name}"
+        self.conn.register(temp_table_name, reader)
+        try:
+            upsert_sql = self._get_upsert_sql(table_name, temp_table_name, tuple(schema.names), tuple(primary_keys), UPSERT_SEQ_COLUMN)
+            self.conn.execute(upsert_sql)
+            logger.info(f"Successfully upserted {num_rows} streamed records into '{table_name}'.")
+        finally:
+            self.conn.unregister(temp_table_name)
+
+    @staticmethod
+    def _model_columns(model: Type[BaseModel], data: List[BaseModel]) -> Dict[str, list]:
+        """
+        按列直接读取实例属性（列式构建），避免每行调用 model_dump 生成字典；
+        额外字段（extra="allow"）不在 __dict__ 中，和以前一样不写入。
+        """
+        return {f: [m.__dict__.get(f) for m in data] for f in model.model_fields}
+
+    def _models_to_arrow(self, model: Type[BaseModel], data: List[BaseModel], schema, is_price: bool):
+        """把一批模型转换为 Arrow 表，缺失的字段按 schema 填充为 NULL。"""
+        import pyarrow as pa
+
+        table = pa.Table.from_pydict(self._model_columns(model, data), schema=schema)
+        # Special handling for price data to convert floats to integers
+        if is_price:
+            table = _scale_price_columns_arrow(table)
+        return table
+
+    def _get_arrow_schema(self, model: Type[BaseModel]):
+        """返回模型字段对应的 Arrow schema（按模型缓存），pyarrow 不可用或类型无法映射时返回 None。"""
+        if not PYARROW_AVAILABLE:
+            return None
+        if model in self._arrow_schema_cache:
+            return self._arrow_schema_cache[model]
+        import pyarrow as pa
         
-        df = df[model_fields]
+        arrow_fields = []
+        for name, field_info in model.model_fields.items():
+            arrow_type = _get_pydantic_arrow_type(field_info.annotation)
+            if arrow_type is None:
+                arrow_fields = None
+                break
+            arrow_fields.append(pa.field(name, arrow_type))
         
-        self._upsert_dataframe(table_name, df, primary_keys)
+        schema = pa.schema(arrow_fields) if arrow_fields is not None else None
+        self._arrow_schema_cache[model] = schema
+        return schema
 
     def upsert_data_from_dicts(
         self,
@@ -148,37 +333,60 @@ class DuckDBAPI(DatabaseAPI):
             logger.info("No data provided to upsert.")
             return
         
+        import pandas as pd
+
         df = pd.DataFrame(data)
         self._upsert_dataframe(table_name, df, primary_keys)
 
-    def _upsert_dataframe(self, table_name: str, df: pd.DataFrame, primary_keys: List[str]):
+    def _upsert_dataframe(self, table_name: str, df: "pd.DataFrame", primary_keys: List[str]):
         """Helper to upsert a DataFrame."""
+        self._upsert_frame(table_name, df, tuple(df.columns), primary_keys, len(df))
+    
+    def _upsert_frame(self, table_name: str, frame: Any, columns: tuple, primary_keys: List[str], num_rows: int):
+        """把 DataFrame 或 Arrow 表注册为临时视图后执行 upsert。"""
         self._ensure_connection()
-        temp_table_name = f"temp_upsert_{table_name}_{int(time.time())}"
-        self.conn.register(temp_table_name, df)
+        # 临时视图名对每个表固定，生成的 SQL 可以整体缓存复用
+        temp_table_name = f"temp_upsert_{table_name}"
+        self.conn.register(temp_table_name, frame)
         
         try:
-            columns = list(df.columns)
-            quoted_cols = [f'"{col}"' for col in columns]
-            quoted_pk = [f'"{pk}"' for pk in primary_keys]
-            
-            update_set_sql = ", ".join([f'{col} = excluded.{col}' for col in quoted_cols if col not in quoted_pk])
-            on_conflict_sql = f"DO UPDATE SET {update_set_sql}" if update_set_sql else "DO NOTHING"
-
-            upsert_sql = f"""
-            INSERT INTO "{table_name}" ({', '.join(quoted_cols)})
-            SELECT {', '.join(quoted_cols)} FROM {temp_table_name}
-            ON CONFLICT ({', '.join(quoted_pk)}) {on_conflict_sql};
-            """
-            self.conn.execute(upsert_sql)
-            logger.info(f"Successfully upserted {len(df)} records into '{table_name}'.")
+            self.conn.execute(self._get_upsert_sql(table_name, temp_table_name, columns, tuple(primary_keys)))
+            logger.info(f"Successfully upserted {num_rows} records into '{table_name}'.")
         finally:
             self.conn.unregister(temp_table_name)
     
+    def _get_upsert_sql(self, table_name: str, temp_table_name: str, columns: tuple, primary_keys: tuple,
+                        seq_column: Optional[str] = None) -> str:
+        """
+        返回 INSERT ... ON CONFLICT 语句，同一 (表名, 列, 主键) 组合只生成一次。
+        给出 seq_column 时，源数据中同一主键只取该列最大的一行。
+        """
+        key = (table_name, columns, primary_keys, seq_column)
+        if (upsert_sql := self._upsert_sql_cache.get(key)) is not None:
+            return upsert_sql
+        
+        quoted_cols = [f'"{col}"' for col in columns]
+        quoted_pk = [f'"{pk}"' for pk in primary_keys]
+        
+        update_set_sql = ", ".join([f'{col} = excluded.{col}' for col in quoted_cols if col not in quoted_pk])
+        on_conflict_sql = f"DO UPDATE SET {update_set_sql}" if update_set_sql else "DO NOTHING"
+
+        dedupe_sql = ""
+        if seq_column:
+            dedupe_sql = f'QUALIFY ROW_NUMBER() OVER (PARTITION BY {", ".join(quoted_pk)} ORDER BY "{seq_column}" DESC) = 1'
+
+        upsert_sql = f"""
+        INSERT INTO "{table_name}" ({', '.join(quoted_cols)})
+        SELECT {', '.join(quoted_cols)} FROM {temp_table_name} {dedupe_sql}
+        ON CONFLICT ({', '.join(quoted_pk)}) {on_conflict_sql};
+        """
+        self._upsert_sql_cache[key] = upsert_sql
+        return upsert_sql
+    
     def insert_dataframe(
         self,
         table_name: str,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         if_exists: str = "append"
     ) -> None:
         self._ensure_connection()
@@ -188,11 +396,27 @@ class DuckDBAPI(DatabaseAPI):
         
         if if_exists == "replace":
             self.conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            self._known_tables.discard(table_name)
+        
+        if (insert_sql := self._insert_sql_cache.get(table_name)) is None:
+            insert_sql = (
+                f'CREATE TABLE "{table_name}" AS SELECT * FROM df_to_insert_{table_name}',
+                f'INSERT INTO "{table_name}" SELECT * FROM df_to_insert_{table_name}',
+            )
+            self._insert_sql_cache[table_name] = insert_sql
+        create_sql, append_sql = insert_sql
         
+        # 新表（包括 replace 之后）用一条 CREATE TABLE AS 一次写入数据，
+        # 省去先建空表再 INSERT 的第二遍扫描；已有表才追加
         self.conn.register(f'df_to_insert_{table_name}', df)
-        self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" AS SELECT * FROM df_to_insert_{table_name} WHERE 1=0') # Create table if not exists
-        self.conn.execute(f'INSERT INTO "{table_name}" SELECT * FROM df_to_insert_{table_name}')
-        self.conn.unregister(f'df_to_insert_{table_name}')
+        try:
+            if self.table_exists(table_name):
+                self.conn.execute(append_sql)
+            else:
+                self.conn.execute(create_sql)
+                self._known_tables.add(table_name)
+        finally:
+            self.conn.unregister(f'df_to_insert_{table_name}')
         logger.info(f"Successfully inserted {len(df)} records into '{table_name}' with mode='{if_exists}'.")
 
     def query_to_models(
@@ -201,46 +425,101 @@ class DuckDBAPI(DatabaseAPI):
         model: Type[BaseModel],
         params: Optional[List[Any]] = None
     ) -> List[BaseModel]:
-        self._ensure_connection()
-        df = self.query_to_dataframe(query, params)
-        if df.empty:
+        # 直接取元组行构建模型，不经过 DataFrame 和 to_dict；NULL 保持为 None 而不是 NaN
+        cursor = self._run_query(self._execute, query, params)
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        if not rows:
             return []
         
         # Special handling for price data to convert integers back to floats
         if model.__name__ == 'Price':
-            for key in ['open', 'close', 'high', 'low']:
-                if key in df.columns:
-                    df[key] = df[key] / 100.0
+            price_idxs = [i for i, col in enumerate(columns) if col in PRICE_INT_COLUMNS]
+            records = []
+            for row in rows:
+                record = dict(zip(columns, row))
+                for i in price_idxs:
+                    if row[i] is not None:
+                        record[columns[i]] = row[i] / 100.0
+                records.append(record)
+            return [model(**record) for record in records]
 
-        records = df.to_dict('records')
-        return [model(**record) for record in records]
+        return [model(**dict(zip(columns, row))) for row in rows]
 
     def query_to_dataframe(
         self,
         query: str,
         params: Optional[List[Any]] = None
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
+        return self._run_query(self._execute, query, params).fetchdf()
+
+    def _run_query(self, execute, query: str, params: Optional[List[Any]] = None):
+        """
+        用 execute（连接或游标的 execute）执行原始 SQL。
+        DDL 语句会清空已知表缓存；执行失败时同样清空，因为表可能已被原始 SQL 或其他连接删除，
+        下次 table_exists 会重新查询 information_schema。
+        """
+        if _DDL_PATTERN.match(query):
+            self._known_tables.clear()
+        try:
+            return execute(query, params) if params else execute(query)
+        except Exception:
+            self._known_tables.clear()
+            raise
+
+    def query_many(
+        self,
+        items: List[Tuple[str, Optional[List[Any]]]],
+        max_workers: Optional[int] = None
+    ) -> List["pd.DataFrame"]:
+        """
+        在线程池中并行执行多条独立查询，结果按输入顺序返回。
+        每个工作线程使用自己的游标（同一数据库上的独立连接），查询在 DuckDB 中并行执行。
+        """
         self._ensure_connection()
-        if params:
-            df = self.conn.execute(query, params).fetchdf()
-        else:
-            df = self.conn.execute(query).fetchdf()
+        if not items:
+            return []
+        workers = min(len(items), max_workers or os.cpu_count() or 1)
+        if workers == 1:
+            return [self.query_to_dataframe(query, params) for query, params in items]
         
-        return df
+        def run_group(start: int) -> List["pd.DataFrame"]:
+            # 每个线程只创建一个游标，按步长处理属于自己的查询
+            cursor = self.conn.cursor()
+            try:
+                return [
+                    self._run_query(cursor.execute, query, params).fetchdf()
+                    for query, params in items[start::workers]
+                ]
+            finally:
+                cursor.close()
+        
+        results: List[Optional["pd.DataFrame"]] = [None] * len(items)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for start, group in enumerate(executor.map(run_group, range(workers))):
+                results[start::workers] = group
+        return results
 
     def table_exists(self, table_name: str) -> bool:
         self._ensure_connection()
+        if table_name in self._known_tables:
+            return True
         try:
-            result = self.conn.execute(f"SELECT 1 FROM information_schema.tables WHERE table_name = '{table_name}'").fetchone()
-            return result is not None
+            result = self.conn.execute("SELECT 1 FROM information_schema.tables WHERE table_name = ?", [table_name]).fetchone()
         except Exception:
             return False
+        if result is None:
+            return False
+        self._known_tables.add(table_name)
+        return True
 
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         self._ensure_connection()
         try:
-            columns_df = self.conn.execute(f"DESCRIBE {table_name}").fetchdf()
-            row_count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            # 标识符无法参数化绑定，按双引号转义后引用；schema.table 的各段分别引用
+            quoted_table = _quote_table_name(table_name)
+            columns_df = self.conn.execute(f"DESCRIBE {quoted_table}").fetchdf()
+            row_count = self.conn.execute(f"SELECT COUNT(*) FROM {quoted_table}").fetchone()[0]
             return {
                 "table_name": table_name,
                 "columns": columns_df.to_dict('records'),
@@ -1,5 +1,5 @@
 import futu as ft
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import logging
 from datetime import date, datetime, timedelta
 from pydantic import ValidationError
@@ -87,10 +87,16 @@ FUTU_FIELD_MAPPING = {
     'total_assets_growth_rate' : 'total_assets_growth',
     'total_share' : 'total_shares_outstanding',
 }
+# 转换时逐股票遍历，预先展开为元组
+_FUTU_FIELD_ITEMS = tuple(FUTU_FIELD_MAPPING.items())
 
 def futu_data_to_financial_profile(data: dict, report_date_str: str, quarter: str) -> List[FinancialProfile]:
     """Converts a dictionary of Futu data into a list of FinancialProfile Pydantic models."""
-    profiles = []
+    return list(iter_financial_profiles(data, report_date_str, quarter))
+
+
+def iter_financial_profiles(data: dict, report_date_str: str, quarter: str) -> Iterator[FinancialProfile]:
+    """Lazily converts Futu data into FinancialProfile models, one stock at a time."""
     for stock_code, values in data.items():
         # Ensure the ticker includes the market prefix (e.g., 'US.MSFT')
         values['ticker'] = stock_code
@@ -98,9 +104,9 @@ def futu_data_to_financial_profile(data: dict, report_date_str: str, quarter: st
         values['period'] = quarter
 
         # Rename keys based on mapping
-        for futu_key, model_key in FUTU_FIELD_MAPPING.items():
-            if futu_key in values and values[futu_key] is not None:
-                values[model_key] = values[futu_key]
+        for futu_key, model_key in _FUTU_FIELD_ITEMS:
+            if (value := values.get(futu_key)) is not None:
+                values[model_key] = value
 
         # Map the 'stock_name' from the raw data to the 'name' field in the model
         if 'stock_name' in values:
@@ -118,10 +124,11 @@ def futu_data_to_financial_profile(data: dict, report_date_str: str, quarter: st
             values['peg_ratio'] = values['price_to_earnings_ratio'] / values['earnings_per_share_growth']
 
         try:
-            profiles.append(FinancialProfile(**values))
+            profile = FinancialProfile(**values)
         except ValidationError as e:
             logger.error(f"Pydantic validation error for stock {stock_code}: {e}")
-    return profiles
+            continue
+        yield profile
 
 
 def get_report_period_date(current_date: date, quarter: str) -> date:
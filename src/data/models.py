@@ -29,6 +29,9 @@ class PriceResponse(BaseModel):
     ticker: str
     prices: list[Price]
 
+    # API响应包装，只读取列表字段，解析后不再修改
+    model_config = {"extra": "ignore", "frozen": True}
+
 
 class FinancialMetrics(BaseModel):
     # 基本信息
@@ -110,6 +113,8 @@ class FinancialMetrics(BaseModel):
 class FinancialMetricsResponse(BaseModel):
     financial_metrics: list[FinancialMetrics]
 
+    model_config = {"extra": "ignore", "frozen": True}
+
 
 class LineItem(BaseModel):
     """Represents a single line item from a financial statement."""
@@ -128,6 +133,8 @@ class LineItem(BaseModel):
 class LineItemResponse(BaseModel):
     search_results: list[LineItem]
 
+    model_config = {"extra": "ignore", "frozen": True}
+
 
 class InsiderTrade(BaseModel):
     ticker: str
@@ -156,6 +163,8 @@ class InsiderTrade(BaseModel):
 class InsiderTradeResponse(BaseModel):
     insider_trades: list[InsiderTrade]
 
+    model_config = {"extra": "ignore", "frozen": True}
+
 
 class CompanyNews(BaseModel):
     ticker: str
@@ -170,6 +179,8 @@ class CompanyNews(BaseModel):
 class CompanyNewsResponse(BaseModel):
     company_news: list[CompanyNews]
 
+    model_config = {"extra": "ignore", "frozen": True}
+
 
 class CompanyFacts(BaseModel):
     ticker: str
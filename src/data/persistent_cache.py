@@ -5,8 +5,9 @@ PersistentCache - 持久化文件缓存模块
 """
 import json
 import os
+import threading
 import time
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import hashlib
@@ -15,6 +16,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Date ranges that ended before today are immutable (past prices, filed trades, published news),
+# so they only need to be refetched on the quarterly reporting cadence
+HISTORICAL_TTL = 90 * 24 * 3600
+
 class PersistentCache:
     """File-based persistent cache with TTL support for API responses."""
 
@@ -32,6 +37,8 @@ class PersistentCache:
         
         # Cache metadata for TTL tracking
         self._cache_metadata: Dict[str, Dict[str, Any]] = {}
+        # Serializes metadata updates from concurrent agent workers
+        self._lock = threading.RLock()
         
         # Load metadata from disk
         self._load_metadata()
@@ -67,7 +74,7 @@ class PersistentCache:
             with open(metadata_file, 'w') as f:
                 json.dump(self._cache_metadata, f, indent=2)
         except IOError as e:
-            print(f"Warning: Could not save cache metadata: {e}")
+            logger.warning(f"Could not save cache metadata: {e}")
 
     def _is_expired(self, cache_key: str) -> bool:
         """Check if cache entry is expired."""
@@ -107,16 +114,17 @@ class PersistentCache:
             
             # Update metadata
             ttl = ttl or self.default_ttl
-            self._cache_metadata[cache_key] = {
-                'created_at': time.time(),
-                'expires_at': time.time() + ttl,
-                'ttl': ttl,
-                'size': len(data)
-            }
-            self._save_metadata()
+            with self._lock:
+                self._cache_metadata[cache_key] = {
+                    'created_at': time.time(),
+                    'expires_at': time.time() + ttl,
+                    'ttl': ttl,
+                    'size': len(data)
+                }
+                self._save_metadata()
             
         except IOError as e:
-            print(f"Warning: Could not save cache to disk: {e}")
+            logger.warning(f"Could not save cache to disk: {e}")
 
     def _merge_data(self, existing: List[Dict] | None, new_data: List[Dict], key_field: str) -> List[Dict]:
         """Merge existing and new data, avoiding duplicates based on a key field."""
@@ -169,6 +177,13 @@ class PersistentCache:
         # Save to disk cache
         self._save_to_disk(cache_key, data, ttl)
 
+    def _get_range_ttl(self, cache_type: str, end_date: str) -> int:
+        """TTL for date-range data: the configured TTL, extended to HISTORICAL_TTL once the range has closed."""
+        ttl = get_cache_ttl(cache_type)
+        if end_date and end_date[:10] < date.today().isoformat():
+            return max(ttl, HISTORICAL_TTL)
+        return ttl
+
     # Specific methods for different data types
     def get_prices(self, ticker: str, start_date: str, end_date: str) -> Optional[List[Dict[str, Any]]]:
         """Get cached price data if available."""
@@ -177,7 +192,7 @@ class PersistentCache:
     def set_prices(self, ticker: str, start_date: str, end_date: str, data: List[Dict[str, Any]]):
         """Set price data to cache."""
         # Use TTL from configuration
-        ttl = get_cache_ttl('prices')
+        ttl = self._get_range_ttl('prices', end_date)
         self.set('prices', data, ttl=ttl, merge_key='time', 
                 ticker=ticker, start_date=start_date, end_date=end_date)
 
@@ -219,7 +234,7 @@ class PersistentCache:
     def set_insider_trades(self, ticker: str, start_date: str, end_date: str, limit: int, data: List[Dict[str, Any]]):
         """Set insider trades to cache."""
         # Use TTL from configuration
-        ttl = get_cache_ttl('insider_trades')
+        ttl = self._get_range_ttl('insider_trades', end_date)
         self.set('insider_trades', data, ttl=ttl, merge_key='filing_date',
                 ticker=ticker, start_date=start_date, end_date=end_date, limit=limit)
 
@@ -231,7 +246,7 @@ class PersistentCache:
     def set_company_news(self, ticker: str, start_date: str, end_date: str, limit: int, data: List[Dict[str, Any]]):
         """Set company news to cache."""
         # Use TTL from configuration
-        ttl = get_cache_ttl('company_news')
+        ttl = self._get_range_ttl('company_news', end_date)
         self.set('company_news', data, ttl=ttl, merge_key='date',
                 ticker=ticker, start_date=start_date, end_date=end_date, limit=limit)
 
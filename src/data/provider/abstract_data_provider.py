@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from src.data.models import (
@@ -97,6 +97,35 @@ class AbstractDataProvider(ABC):
         """获取市值"""
         pass
     
+    def get_financial_metrics_batch(
+        self,
+        tickers: List[str],
+        end_date: str,
+        period: str = "ttm",
+        limit: int = 10,
+    ) -> Dict[str, List[FinancialMetrics]]:
+        """批量获取财务指标数据，默认逐个调用 get_financial_metrics，子类可覆盖为单次请求"""
+        return {ticker: self.get_financial_metrics(ticker, end_date, period, limit) for ticker in tickers}
+
+    def search_line_items_batch(
+        self,
+        tickers: List[str],
+        line_items: List[str],
+        end_date: str,
+        period: str = "ttm",
+        limit: int = 10,
+    ) -> Dict[str, List[LineItem]]:
+        """批量搜索财务报表项目，默认逐个调用 search_line_items，子类可覆盖为单次请求"""
+        return {ticker: self.search_line_items(ticker, line_items, end_date, period, limit) for ticker in tickers}
+
+    def get_market_cap_batch(
+        self,
+        tickers: List[str],
+        end_date: str,
+    ) -> Dict[str, Optional[float]]:
+        """批量获取市值，默认逐个调用 get_market_cap，子类可覆盖为单次请求"""
+        return {ticker: self.get_market_cap(ticker, end_date) for ticker in tickers}
+
     @abstractmethod
     def is_available(self) -> bool:
         """检查数据提供商是否可用"""
@@ -1,6 +1,12 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 import requests
-from typing import List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import TypeAdapter
+from typing import Callable, Dict, List, Optional
 import logging
 
 from src.data.provider.abstract_data_provider import AbstractDataProvider
@@ -18,81 +24,129 @@ from src.data.models import (
     CompanyNewsResponse,
     TransactionType,
 )
-from src.utils.timeout_retry import with_http_timeout_retry
+from src.data.data_config import get_timeout_seconds
+from src.utils.config_utils import json_loads
 
 logger = logging.getLogger(__name__)
 
+# cachecontrol按ETag/Last-Modified做条件请求，未变化的响应只返回304，不可用时使用普通的连接池适配器
+try:
+    from cachecontrol import CacheControlAdapter
+    from cachecontrol.caches.file_cache import FileCache
+    CACHECONTROL_AVAILABLE = True
+except ImportError:
+    CacheControlAdapter = None
+    FileCache = None
+    CACHECONTROL_AVAILABLE = False
+
+# 分页接口按日期窗口并行抓取的窗口数（每个窗口内部仍按日期翻页）
+PAGINATION_WINDOWS = 4
+# 批量接口按ticker并行请求的默认线程数
+BATCH_MAX_WORKERS = 8
+# 传输层重试策略（本提供商唯一的重试层）：限流和服务端错误按指数退避重试并遵守Retry-After，复用连接池；
+# 重试耗尽后返回最后一次响应，由 _make_request 统一生成错误信息。
+# POST（line-items搜索）无法确认幂等，不按状态码或读超时重试，只重试连接失败
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET", "HEAD"),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+# 可用性检查结果的缓存时间（秒）
+AVAILABILITY_TTL = 60
+# HTTP缓存目录（仅在cachecontrol可用时使用）
+HTTP_CACHE_DIR = ".cache/financial_datasets_http"
+# 直接返回列表的价格响应，复用同一个校验器
+_PRICE_LIST_ADAPTER = TypeAdapter(List[Price])
+
+
+class FDTransientError(Exception):
+    """暂时性的请求错误：超时、连接失败、限流（429）和服务端错误（5xx），已由 HTTP_RETRY 重试过，抛给调用方"""
+
+
+class FDPermanentError(Exception):
+    """永久性的请求错误：除429以外的4xx，由各方法记录后返回空结果"""
+
+
+def _split_date_range(start_date: str, end_date: str, parts: int) -> List[tuple]:
+    """将[start_date, end_date]切分为互不重叠的日期窗口，按时间倒序返回（与API返回顺序一致）"""
+    start, end = date.fromisoformat(start_date[:10]), date.fromisoformat(end_date[:10])
+    days = (end - start).days + 1
+    parts = max(1, min(parts, days))
+    step = days // parts
+    windows = []
+    window_start = start
+    for i in range(parts):
+        window_end = end if i == parts - 1 else window_start + timedelta(days=step - 1)
+        windows.append((window_start.isoformat(), window_end.isoformat()))
+        window_start = window_end + timedelta(days=1)
+    windows.reverse()
+    return windows
+
 class FinancialDatasetsProvider(AbstractDataProvider):
     """FinancialDatasets.ai数据提供商实现"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_workers: int = BATCH_MAX_WORKERS):
         super().__init__("FinancialDatasets", api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY"))
         self.base_url = "https://api.financialdatasets.ai"
+        self.max_workers = max_workers
+        # 最近一次可用性检查：(结果, 过期时间)
+        self._availability = (False, 0.0)
+        # api_key构造后不再变化，请求头只需计算一次
+        self._headers = {"X-API-KEY": self.api_key} if self.api_key else {}
+        # 复用TCP/TLS连接，避免每个请求都重新握手
+        self._session = requests.Session()
+        # requests默认发送 Accept-Encoding: gzip, deflate；安装brotli后urllib3会自动追加br，无需在此指定
+        self._session.headers.update(self._headers)
+        self._session.mount("https://", self._create_adapter())
     
-    def _get_headers(self) -> dict:
-        """获取请求头"""
-        headers = {}
-        if self.api_key:
-            headers["X-API-KEY"] = self.api_key
-        return headers
+    def _create_adapter(self) -> HTTPAdapter:
+        """创建连接池适配器，cachecontrol可用时叠加HTTP缓存（CacheControlAdapter是HTTPAdapter的子类）"""
+        pool_args = {"pool_connections": 10, "pool_maxsize": 20, "max_retries": HTTP_RETRY}
+        if CACHECONTROL_AVAILABLE:
+            return CacheControlAdapter(cache=FileCache(HTTP_CACHE_DIR), **pool_args)
+        return HTTPAdapter(**pool_args)
     
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """发送HTTP请求，添加统一的异常处理"""
+    def close(self):
+        """关闭连接池"""
+        self._session.close()
+    
+    def _make_request(self, method: str, url: str, interface_name: str, **kwargs) -> requests.Response:
+        """发送HTTP请求，添加统一的异常处理，超时时间取自interface_name对应接口的配置"""
         try:
-            # 获取当前接口的超时配置
-            from src.data.data_config import get_timeout_seconds
-            # 从调用栈中推断当前使用的接口
-            import inspect
-            frame = inspect.currentframe()
-            caller_name = None
-            try:
-                # 找到调用_make_request的方法名
-                caller_frame = frame.f_back.f_back  # 跳过装饰器的frame
-                if caller_frame:
-                    caller_name = caller_frame.f_code.co_name
-            finally:
-                del frame
-            
-            # 根据调用者确定接口名称
-            interface_mapping = {
-                'get_prices': 'get_prices',
-                'get_financial_metrics': 'get_financial_metrics',
-                'search_line_items': 'search_line_items',
-                'get_insider_trades': 'get_insider_trades',
-                'get_company_news': 'get_company_news'
-            }
-            interface_name = interface_mapping.get(caller_name, 'get_prices')  # 默认使用get_prices配置
             timeout_seconds = get_timeout_seconds(interface_name)
             
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=self._get_headers(),
                 timeout=timeout_seconds,
                 **kwargs
             )
-            
-            if response.status_code != 200:
-                error_msg = f"API请求失败: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if 'message' in error_data:
-                        error_msg += f" - {error_data['message']}"
-                except:
-                    error_msg += f" - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-            
-            return response
-            
         except requests.exceptions.Timeout:
             logger.error(f"请求超时: {url}")
-            raise Exception(f"请求超时: {url}")
+            raise FDTransientError(f"请求超时: {url}")
         except requests.exceptions.RequestException as e:
             logger.error(f"请求异常: {e}")
-            raise Exception(f"请求异常: {e}")
+            raise FDTransientError(f"请求异常: {e}")
+        
+        if response.ok:
+            return response
+        
+        status_code = response.status_code
+        error_msg = f"API请求失败: {status_code}"
+        try:
+            error_data = response.json()
+            if 'message' in error_data:
+                error_msg += f" - {error_data['message']}"
+        except (ValueError, TypeError):
+            error_msg += f" - {response.text}"
+        logger.error(error_msg)
+        if status_code == 429 or status_code >= 500:
+            raise FDTransientError(error_msg)
+        raise FDPermanentError(error_msg)
     
-    @with_http_timeout_retry("get_prices")
     def get_prices(
         self,
         tickers: List[str],
@@ -113,22 +167,24 @@ class FinancialDatasetsProvider(AbstractDataProvider):
             
             # Use requests' built-in parameter handling
             url = f"{self.base_url}/prices/"
-            response = self._make_request("GET", url, params=params)
+            response = self._make_request("GET", url, "get_prices", params=params)
             
             # The response should contain a list of Price objects for all requested tickers
-            data = response.json()
+            data = json_loads(response.content)
             # Assuming the response is a list of Price objects directly or under a 'prices' key
             if isinstance(data, list):
-                return [Price(**p) for p in data]
+                return _PRICE_LIST_ADAPTER.validate_python(data)
             
-            price_response = PriceResponse(**data)
+            price_response = PriceResponse.model_validate(data)
             return price_response.prices or []
             
+        except FDTransientError:
+            # 可重试的错误已由适配器重试过，直接抛给调用方；其余错误记录后返回空结果
+            raise
         except Exception as e:
             logger.error(f"获取股价数据失败 for tickers {tickers}: {e}")
             return []
     
-    @with_http_timeout_retry("get_financial_metrics")
     def get_financial_metrics(
         self,
         ticker: str,
@@ -138,18 +194,20 @@ class FinancialDatasetsProvider(AbstractDataProvider):
     ) -> List[FinancialMetrics]:
         """获取财务指标数据"""
         try:
-            url = f"{self.base_url}/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-            response = self._make_request("GET", url)
+            url = f"{self.base_url}/financial-metrics/"
+            params = {"ticker": ticker, "report_period_lte": end_date, "limit": limit, "period": period}
+            response = self._make_request("GET", url, "get_financial_metrics", params=params)
             
             # 解析响应
-            metrics_response = FinancialMetricsResponse(**response.json())
+            metrics_response = FinancialMetricsResponse.model_validate(json_loads(response.content))
             return metrics_response.financial_metrics or []
             
+        except FDTransientError:
+            raise
         except Exception as e:
             logger.error(f"获取财务指标失败 {ticker}: {e}")
             return []
     
-    @with_http_timeout_retry("search_line_items")
     def search_line_items(
         self,
         ticker: str,
@@ -159,32 +217,64 @@ class FinancialDatasetsProvider(AbstractDataProvider):
         limit: int = 10,
     ) -> List[LineItem]:
         """搜索财务报表项目"""
-        try:
-            url = f"{self.base_url}/financials/search/line-items"
-            body = {
-                "tickers": [ticker],
-                "line_items": line_items,
-                "end_date": end_date,
-                "period": period,
-                "limit": limit,
-            }
-            logger.debug(f"url={url}, body={body}")
-            response = self._make_request("POST", url, json=body)
-            data = response.json()
-            logger.debug(f"search_line_items result: search {url}, body {body}, result {data}")
+        return self.search_line_items_batch([ticker], line_items, end_date, period, limit)[ticker]
 
-            response_model = LineItemResponse(**data)
-            search_results = response_model.search_results
-            if not search_results:
-                return []
-            logger.debug(f"search_line_items: search results {search_results[:limit]}")
+    def search_line_items_batch(
+        self,
+        tickers: List[str],
+        line_items: List[str],
+        end_date: str,
+        period: str = "ttm",
+        limit: int = 10,
+    ) -> Dict[str, List[LineItem]]:
+        """一次POST搜索多个股票的财务报表项目（接口的tickers参数本身支持多个股票），按ticker分组返回"""
+        results = {ticker: [] for ticker in tickers}
+        if not results:
+            return results
+        try:
+            # 接口的limit作用于整个响应而不是每个ticker，按ticker数放大后再按ticker截取limit条
+            request_limit = limit * len(results)
+            search_results = self._search_line_items(list(results), line_items, end_date, period, request_limit)
+            for item in search_results:
+                items = results.get(item.ticker)
+                if items is not None and len(items) < limit:
+                    items.append(item)
 
-            # Cache the results
-            return search_results[:limit]
+            # 响应被截满时，部分ticker可能被其他ticker的记录挤掉，对不足limit条的ticker单独补查
+            if len(results) > 1 and len(search_results) >= request_limit:
+                for ticker, items in results.items():
+                    if len(items) < limit:
+                        results[ticker] = self._search_line_items([ticker], line_items, end_date, period, limit)[:limit]
+            return results
             
+        except FDTransientError:
+            raise
         except Exception as e:
-            logger.error(f"搜索财务报表项目失败 {ticker}: {e}")
-            return []
+            logger.error(f"搜索财务报表项目失败 {tickers}: {e}")
+            return {ticker: [] for ticker in tickers}
+
+    def _search_line_items(
+        self,
+        tickers: List[str],
+        line_items: List[str],
+        end_date: str,
+        period: str,
+        limit: int,
+    ) -> List[LineItem]:
+        """发送一次line-items搜索请求，返回接口原始顺序的结果"""
+        url = f"{self.base_url}/financials/search/line-items"
+        body = {
+            "tickers": tickers,
+            "line_items": line_items,
+            "end_date": end_date,
+            "period": period,
+            "limit": limit,
+        }
+        logger.debug(f"url={url}, body={body}")
+        response = self._make_request("POST", url, "search_line_items", json=body)
+        data = json_loads(response.content)
+        logger.debug(f"search_line_items result: search {url}, body {body}, result {data}")
+        return LineItemResponse.model_validate(data).search_results
 
     def get_financial_profile(
             self,
@@ -195,7 +285,6 @@ class FinancialDatasetsProvider(AbstractDataProvider):
     ) -> List[FinancialProfile]:
         return []
 
-    @with_http_timeout_retry("get_insider_trades")
     def get_insider_trades(
         self,
         ticker: str,
@@ -205,55 +294,65 @@ class FinancialDatasetsProvider(AbstractDataProvider):
     ) -> List[InsiderTrade]:
         """获取内部交易数据"""
         try:
-            all_trades = []
-            current_end_date = end_date
-
-            while True:
-                url = f"{self.base_url}/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
-                if start_date:
-                    url += f"&filing_date_gte={start_date}"
-                url += f"&limit={limit}"
-                logger.debug(f"get_insider_trades url={url}")
+            return self._fetch_windows(self._fetch_insider_trades_window, ticker, end_date, start_date, limit)
+        except FDTransientError:
+            raise
+        except Exception as e:
+            logger.error(f"获取内部交易数据失败 {ticker}: {e}")
+            return []
+    
+    def _fetch_insider_trades_window(
+        self,
+        ticker: str,
+        end_date: str,
+        start_date: Optional[str],
+        limit: int,
+    ) -> List[InsiderTrade]:
+        """在一个日期窗口内按filing_date翻页获取内部交易数据"""
+        all_trades = []
+        url = f"{self.base_url}/insider-trades/"
+        params = {"ticker": ticker, "filing_date_lte": end_date, "limit": limit}
+        if start_date:
+            params["filing_date_gte"] = start_date
 
-                response = self._make_request("GET", url)
-                data = response.json()
-                
-                # 解析响应
-                insider_response = InsiderTradeResponse(**data)
-                if not insider_response.insider_trades:
-                    break
+        while True:
+            logger.debug(f"get_insider_trades url={url}, params={params}")
 
-                # 转换transaction_type为枚举类型
-                converted_trades = []
-                for trade in insider_response.insider_trades:
-                    # 如果transaction_type是字符串，尝试转换为枚举
-                    if isinstance(trade.transaction_type, str):
-                        if trade.transaction_type.lower() in ["buy", "purchase"]:
-                            trade.transaction_type = TransactionType.BUY
-                        elif trade.transaction_type.lower() in ["sell", "sale"]:
-                            trade.transaction_type = TransactionType.SELL
-                    converted_trades.append(trade)
+            response = self._make_request("GET", url, "get_insider_trades", params=params)
+            data = json_loads(response.content)
+            
+            # 解析响应
+            insider_response = InsiderTradeResponse.model_validate(data)
+            if not insider_response.insider_trades:
+                break
 
-                all_trades.extend(converted_trades)
-                
-                # 检查是否有更多数据
-                if not start_date or len(insider_response.insider_trades) < limit:
-                    break
-                
-                # 更新日期范围以获取下一页
-                last_filing_date = insider_response.insider_trades[-1].filing_date
-                # Extract only the date part (YYYY-MM-DD) from the datetime string
-                current_end_date = last_filing_date.split("T")[0] if "T" in last_filing_date else last_filing_date
-                if current_end_date <= start_date:
-                    break
+            # 转换transaction_type为枚举类型
+            converted_trades = []
+            for trade in insider_response.insider_trades:
+                # 如果transaction_type是字符串，尝试转换为枚举
+                if isinstance(trade.transaction_type, str):
+                    if trade.transaction_type.lower() in ["buy", "purchase"]:
+                        trade.transaction_type = TransactionType.BUY
+                    elif trade.transaction_type.lower() in ["sell", "sale"]:
+                        trade.transaction_type = TransactionType.SELL
+                converted_trades.append(trade)
 
-            return all_trades
+            all_trades.extend(converted_trades)
             
-        except Exception as e:
-            logger.error(f"获取内部交易数据失败 {ticker}: {e}")
-            return []
+            # 检查是否有更多数据
+            if not start_date or len(insider_response.insider_trades) < limit:
+                break
+            
+            # 更新日期范围以获取下一页
+            last_filing_date = insider_response.insider_trades[-1].filing_date
+            # Extract only the date part (YYYY-MM-DD) from the datetime string
+            current_end_date = last_filing_date[:10]
+            if current_end_date <= start_date:
+                break
+            params["filing_date_lte"] = current_end_date
+
+        return all_trades
     
-    @with_http_timeout_retry("get_company_news")
     def get_company_news(
         self,
         ticker: str,
@@ -263,47 +362,130 @@ class FinancialDatasetsProvider(AbstractDataProvider):
     ) -> List[CompanyNews]:
         """获取公司新闻"""
         try:
-            all_news = []
-            current_end_date = end_date
+            return self._fetch_windows(self._fetch_company_news_window, ticker, end_date, start_date, limit)
+        except FDTransientError:
+            raise
+        except Exception as e:
+            logger.error(f"获取公司新闻失败 {ticker}: {e}")
+            return []
+    
+    def _fetch_company_news_window(
+        self,
+        ticker: str,
+        end_date: str,
+        start_date: Optional[str],
+        limit: int,
+    ) -> List[CompanyNews]:
+        """在一个日期窗口内按date翻页获取公司新闻"""
+        all_news = []
+        url = f"{self.base_url}/news/"
+        params = {"ticker": ticker, "end_date": end_date, "limit": limit}
+        if start_date:
+            params["start_date"] = start_date
 
-            while True:
-                url = f"{self.base_url}/news/?ticker={ticker}&end_date={current_end_date}"
-                if start_date:
-                    url += f"&start_date={start_date}"
-                url += f"&limit={limit}"
-                logger.debug(f"get_company_news url={url}")
+        while True:
+            logger.debug(f"get_company_news url={url}, params={params}")
 
-                response = self._make_request("GET", url)
-                data = response.json()
-                
-                # Transform the response to match the expected CompanyNewsResponse structure
-                # The API returns {'news': [...]} but CompanyNewsResponse expects {'company_news': [...]}
-                if 'news' in data and 'company_news' not in data:
-                    data = {'company_news': data['news']}
-                
-                # 解析响应
-                news_response = CompanyNewsResponse(**data)
-                if not news_response.company_news:
-                    break
+            response = self._make_request("GET", url, "get_company_news", params=params)
+            data = json_loads(response.content)
+            
+            # Transform the response to match the expected CompanyNewsResponse structure
+            # The API returns {'news': [...]} but CompanyNewsResponse expects {'company_news': [...]}
+            if 'news' in data and 'company_news' not in data:
+                data = {'company_news': data['news']}
+            
+            # 解析响应
+            news_response = CompanyNewsResponse.model_validate(data)
+            if not news_response.company_news:
+                break
 
-                all_news.extend(news_response.company_news)
-                
-                # 检查是否有更多数据
-                if not start_date or len(news_response.company_news) < limit:
-                    break
-                
-                # 更新日期范围以获取下一页
-                last_news_date = news_response.company_news[-1].date
-                # Extract only the date part (YYYY-MM-DD) from the datetime string
-                current_end_date = last_news_date.split("T")[0] if "T" in last_news_date else last_news_date
-                if current_end_date <= start_date:
-                    break
+            all_news.extend(news_response.company_news)
+            
+            # 检查是否有更多数据
+            if not start_date or len(news_response.company_news) < limit:
+                break
+            
+            # 更新日期范围以获取下一页
+            last_news_date = news_response.company_news[-1].date
+            # Extract only the date part (YYYY-MM-DD) from the datetime string
+            current_end_date = last_news_date[:10]
+            if current_end_date <= start_date:
+                break
+            params["end_date"] = current_end_date
 
-            return all_news
+        return all_news
+    
+    def _fetch_windows(self, fetch_window, ticker: str, end_date: str, start_date: Optional[str], limit: int) -> list:
+        """
+        将日期区间切分为多个窗口并行翻页，按时间倒序拼接结果
+        
+        翻页依赖上一页最后一条的日期，单个区间只能串行请求；切分为互不重叠的窗口后，
+        各窗口可以同时请求，总耗时由最长的窗口决定。没有start_date时只请求一页，无需切分。
+        """
+        if not start_date or start_date[:10] >= end_date[:10]:
+            return fetch_window(ticker, end_date, start_date, limit)
+        
+        windows = _split_date_range(start_date, end_date, PAGINATION_WINDOWS)
+        if len(windows) == 1:
+            return fetch_window(ticker, end_date, start_date, limit)
+        
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            pages = list(executor.map(lambda w: fetch_window(ticker, w[1], w[0], limit), windows))
+        return [item for page in pages for item in page]
+    
+    def _map_tickers(self, fetch: Callable, tickers: List[str], default=None) -> Dict:
+        """
+        按ticker并行调用fetch（请求为I/O密集型，线程共享同一个连接池）
+        
+        Args:
+            fetch: 接收ticker的单票请求函数
+            tickers: 股票代码列表
+            default: 单个ticker失败时的返回值，None 表示空列表
             
-        except Exception as e:
-            logger.error(f"获取公司新闻失败 {ticker}: {e}")
-            return []
+        Returns:
+            Dict: ticker -> fetch结果，保持tickers的顺序
+        """
+        def fetch_one(ticker):
+            try:
+                return fetch(ticker)
+            except Exception as e:
+                logger.warning(f"批量请求中 {ticker} 失败: {e}")
+                return [] if default is None else default
+        
+        if len(tickers) <= 1:
+            return {ticker: fetch_one(ticker) for ticker in tickers}
+        with ThreadPoolExecutor(max_workers=max(1, min(len(tickers), self.max_workers))) as executor:
+            return dict(zip(tickers, executor.map(fetch_one, tickers)))
+    
+    def get_prices_batch(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        freq: str = '1d'
+    ) -> Dict[str, List[Price]]:
+        """按ticker并行获取股价数据"""
+        return self._map_tickers(lambda ticker: self.get_prices([ticker], start_date, end_date, freq), tickers)
+    
+    def get_financial_metrics_batch(
+        self,
+        tickers: List[str],
+        end_date: str,
+        period: str = "ttm",
+        limit: int = 10,
+    ) -> Dict[str, List[FinancialMetrics]]:
+        """按ticker并行获取财务指标数据"""
+        return self._map_tickers(lambda ticker: self.get_financial_metrics(ticker, end_date, period, limit), tickers)
+    
+    def get_company_news_batch(
+        self,
+        tickers: List[str],
+        end_date: str,
+        start_date: Optional[str] = None,
+        limit: int = 1000,
+    ) -> Dict[str, List[CompanyNews]]:
+        """按ticker并行获取公司新闻"""
+        return self._map_tickers(lambda ticker: self.get_company_news(ticker, end_date, start_date, limit), tickers)
     
     def get_market_cap(
         self,
@@ -317,12 +499,7 @@ class FinancialDatasetsProvider(AbstractDataProvider):
             if metrics and hasattr(metrics[0], 'market_cap') and metrics[0].market_cap:
                 return float(metrics[0].market_cap)
             
-            # 如果没有市值数据，尝试通过股价和股份数计算
-            prices = self.get_prices(ticker, end_date, end_date)
-            if not prices:
-                return None
-            
-            # 这里可以进一步实现通过股价和股份数计算市值的逻辑
+            # 通过股价和股份数计算市值的逻辑尚未实现，在此之前不发起无用的股价请求
             return None
             
         except Exception as e:
@@ -330,20 +507,33 @@ class FinancialDatasetsProvider(AbstractDataProvider):
             return None
     
     def is_available(self) -> bool:
-        """检查数据提供商是否可用"""
+        """检查数据提供商是否可用，结果缓存 AVAILABILITY_TTL 秒"""
+        # 检查API密钥是否存在
+        if not self.api_key:
+            return False
+        
+        available, expires_at = self._availability
+        if time.monotonic() < expires_at:
+            return available
+        
         try:
-            # 检查API密钥是否存在
-            if not self.api_key:
-                return False
-            
-            # 尝试一个简单的API调用来验证可用性
-            # 使用一个常见的股票代码进行测试
-            test_url = f"{self.base_url}/prices/?ticker=AAPL&interval=day&interval_multiplier=1&start_date=2024-01-01&end_date=2024-01-02&limit=1"
-            response = requests.get(test_url, headers=self._get_headers(), timeout=10)
-            return response.status_code == 200
+            # 用一个只取一条记录的带鉴权查询验证可用性，只有2xx才算可用（密钥无效、路由不存在都视为不可用）
+            params = {
+                "ticker": "AAPL",
+                "interval": "day",
+                "interval_multiplier": 1,
+                "start_date": "2024-01-01",
+                "end_date": "2024-01-02",
+                "limit": 1,
+            }
+            response = self._session.get(f"{self.base_url}/prices/", params=params, timeout=10)
+            available = 200 <= response.status_code < 300
         except Exception as e:
             logger.error(f"FinancialDatasets可用性检查失败: {e}")
-            return False
+            available = False
+        
+        self._availability = (available, time.monotonic() + AVAILABILITY_TTL)
+        return available
 
     def convert_period(self, period: str) -> str:
         return period
\ No newline at end of file
@@ -1,9 +1,12 @@
 import futu as ft
 import os
-from typing import List, Optional, TYPE_CHECKING
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, TYPE_CHECKING
 import logging
 from datetime import datetime
-from futu import KLType
+from futu import KLType, KL_FIELD
 
 from src.utils.timeout_retry import with_timeout_retry
 from src.data.provider.abstract_data_provider import AbstractDataProvider
@@ -16,22 +19,65 @@ from src.data.models import (
 )
 from src.data.futu_utils import get_report_period_date
 from src.data.db.base import DatabaseAPI
-from src.data.db.duckdb_impl import DuckDBAPI
 
 if TYPE_CHECKING:
-    from src.data.db.base import DatabaseAPI
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# 多个股票并行请求K线的线程数（同时也是对OpenD的并发上限）
+FUTU_MAX_WORKERS = 4
+# get_market_snapshot 单次最多支持的股票数
+SNAPSHOT_MAX_CODES = 400
+# 可用性检查结果的缓存时间（秒）
+AVAILABILITY_TTL = 60
+# 组装Price只需要的K线字段，其余字段（换手率、市盈率等）不向OpenD请求
+PRICE_KL_FIELDS = [
+    KL_FIELD.DATE_TIME,
+    KL_FIELD.OPEN,
+    KL_FIELD.CLOSE,
+    KL_FIELD.HIGH,
+    KL_FIELD.LOW,
+    KL_FIELD.TRADE_VOL,
+]
+
 class FutuDataProvider(AbstractDataProvider):
 
-    def __init__(self, db_api: Optional[DatabaseAPI] = None):
+    def __init__(self, db_api: Optional[DatabaseAPI] = None, max_workers: int = FUTU_MAX_WORKERS):
         super().__init__("Futu", api_key=None)
+        self.max_workers = max_workers
         if db_api is None:
-            self.db_api: DatabaseAPI = DuckDBAPI(db_path="data/futu_financials.duckdb")
+            # 只有需要默认数据库时才导入 DuckDB 实现
+            from src.data.db import get_database_api
+            self.db_api: DatabaseAPI = get_database_api("duckdb", db_path="data/futu_financials.duckdb")
         else:
             self.db_api: DatabaseAPI = db_api
         self.quote_ctx = None
+        # 嵌套的 with 块数量，大于0时各方法调用后不断开连接
+        self._conn_refs = 0
+        # 最近一次可用性检查：(结果, 过期时间)
+        self._availability = (False, 0.0)
+
+    def __enter__(self):
+        """在with块内保持Futu和数据库连接，批量调用时只建立一次连接"""
+        self._conn_refs += 1
+        self._connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._conn_refs -= 1
+        if self._conn_refs == 0:
+            self._disconnect()
+
+    def _release(self):
+        """不在with块内时断开连接，保持单次调用用完即断开的行为"""
+        if self._conn_refs == 0:
+            self._disconnect()
+
+    def _release_db(self):
+        """不在with块内时关闭数据库连接"""
+        if self._conn_refs == 0:
+            self.db_api.close()
 
     def _connect(self):
         if self.quote_ctx is None:
@@ -55,54 +101,103 @@ class FutuDataProvider(AbstractDataProvider):
         end_date: str,
         freq: str = '1d'
     ) -> List[Price]:
+        # 结果按tickers顺序拼接
+        prices_by_ticker = self.get_prices_batch(tickers, start_date, end_date, freq)
+        return [price for prices in prices_by_ticker.values() for price in prices]
+
+    def get_prices_batch(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        freq: str = '1d'
+    ) -> Dict[str, List[Price]]:
+        """
+        并行获取多个股票的K线（OpenD支持同一连接上同时处理多个 request_history_kline），按ticker返回。
+        """
+        results: Dict[str, List[Price]] = {ticker: [] for ticker in tickers}
+        if not results:
+            return results
+
         self._connect()
-        all_prices = []
         try:
-            for ticker in tickers:
-                try:
-                    futu_ticker = self._convert_ticker_format(ticker)
-                    
-                    # Map freq to Futu's KLType
-                    ktype = self._map_freq_to_kltype(freq)
-                    if not ktype:
-                        logger.warning(f"Unsupported frequency '{freq}' for Futu provider. Skipping ticker {ticker}.")
-                        continue
-
-                    ret, data, _ = self.quote_ctx.request_history_kline(
-                        futu_ticker,
-                        start=start_date,
-                        end=end_date,
-                        ktype=ktype
-                    )
-
-                    if ret == ft.RET_OK:
-                        prices = [
-                            Price(
-                                open=float(row['open']),
-                                close=float(row['close']),
-                                high=float(row['high']),
-                                low=float(row['low']),
-                                volume=int(row['volume']),
-                                time=str(row['time_key']),
-                                ticker=ticker  # Use the original ticker
-                            )
-                            for _, row in data.iterrows()
-                        ]
-                        all_prices.extend(prices)
-                    else:
-                        logger.error(f"Futu API error for get_prices('{ticker}'): {data}")
-                except Exception as e:
-                    logger.error(f"An exception occurred in get_prices for ticker '{ticker}': {e}", exc_info=True)
-            
-            return all_prices
+            # Map freq to Futu's KLType
+            ktype = self._map_freq_to_kltype(freq)
+            if not ktype:
+                logger.warning(f"Unsupported frequency '{freq}' for Futu provider. Skipping tickers {tickers}.")
+                return results
+
+            unique_tickers = list(results)
+            if len(unique_tickers) == 1:
+                fetched = [self._get_ticker_prices(unique_tickers[0], start_date, end_date, ktype)]
+            else:
+                with ThreadPoolExecutor(max_workers=max(1, min(len(unique_tickers), self.max_workers))) as executor:
+                    fetched = list(executor.map(lambda t: self._get_ticker_prices(t, start_date, end_date, ktype), unique_tickers))
+            results.update(zip(unique_tickers, fetched))
+            return results
 
         except Exception as e:
             logger.error(f"An exception occurred in get_prices for tickers '{tickers}': {e}", exc_info=True)
-            return []
+            return {ticker: [] for ticker in tickers}
         finally:
             # self.close() # Usually, we don't close the connection here to allow reuse.
             pass
 
+    def _get_ticker_prices(self, ticker: str, start_date: str, end_date: str, ktype) -> List[Price]:
+        """获取单个股票的K线，失败时记录日志并返回空列表"""
+        try:
+            futu_ticker = self._convert_ticker_format(ticker)
+            ret, data, _ = self.quote_ctx.request_history_kline(
+                futu_ticker,
+                start=start_date,
+                end=end_date,
+                ktype=ktype,
+                fields=PRICE_KL_FIELDS
+            )
+
+            if ret != ft.RET_OK:
+                logger.error(f"Futu API error for get_prices('{ticker}'): {data}")
+                return []
+
+            # 按列取出原生Python值再逐行组装，避免 iterrows 为每一行构造 Series；
+            # 各列已转换为float/int/str，用 model_construct 跳过逐字段校验
+            construct = Price.model_construct
+            return [
+                construct(
+                    open=o,
+                    close=c,
+                    high=h,
+                    low=l,
+                    volume=v,
+                    time=t,
+                    ticker=ticker  # Use the original ticker
+                )
+                for o, c, h, l, v, t in zip(
+                    data['open'].astype(float).tolist(),
+                    data['close'].astype(float).tolist(),
+                    data['high'].astype(float).tolist(),
+                    data['low'].astype(float).tolist(),
+                    data['volume'].astype('int64').tolist(),
+                    self._time_key_strings(data['time_key']),
+                )
+            ]
+        except Exception as e:
+            logger.error(f"An exception occurred in get_prices for ticker '{ticker}': {e}", exc_info=True)
+            return []
+
+    @staticmethod
+    def _time_key_strings(time_key: "pd.Series") -> List[str]:
+        """time_key列转为字符串列表：OpenD返回的本身就是字符串时直接取出，datetime类型时整列格式化"""
+        import pandas as pd
+
+        if pd.api.types.is_datetime64_any_dtype(time_key):
+            return time_key.dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+        if pd.api.types.is_object_dtype(time_key) or pd.api.types.is_string_dtype(time_key):
+            values = time_key.tolist()
+            if all(type(v) is str for v in values):
+                return values
+        return time_key.astype(str).tolist()
+
     def _map_freq_to_kltype(self, freq: str):
         mapping = {
             '1m': KLType.K_1M,
@@ -116,13 +211,16 @@ class FutuDataProvider(AbstractDataProvider):
         }
         return mapping.get(freq)
 
-    def _convert_ticker_format(self, ticker: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _convert_ticker_format(ticker: str) -> str:
+        # 纯函数，批量流程中同一ticker会被反复转换，缓存结果
         if '.' in ticker:
             parts = ticker.split('.')
             return f"{parts[1].upper()}.{parts[0]}" # HK.00700
         
         # Simple heuristic, might need improvement
-        if all(c.isdigit() for c in ticker):
+        if ticker.isdigit():
             return f"HK.{ticker.zfill(5)}"
         return f"US.{ticker.upper()}"
 
@@ -155,7 +253,49 @@ class FutuDataProvider(AbstractDataProvider):
             logger.error(f"Failed to get financial metrics for {ticker} from {table_name}: {e}")
             return []
         finally:
-            self.db_api.close()
+            self._release_db()
+
+    @with_timeout_retry("get_financial_profile")
+    def get_financial_metrics_batch(
+        self,
+        tickers: List[str],
+        end_date: str,
+        period: str = "annual",
+        limit: int = 10,
+    ) -> Dict[str, List[FinancialProfile]]:
+        """
+        从数据库一次性获取多个股票的财务指标（单条 WHERE ticker IN (...) 查询）。
+        """
+        results: Dict[str, List[FinancialProfile]] = {ticker: [] for ticker in tickers}
+        if not tickers:
+            return results
+
+        report_date = get_report_period_date(datetime.strptime(end_date, "%Y-%m-%d").date(), period)
+        table_name = f"financial_profile_{report_date.strftime('%Y_%m_%d')}"
+
+        try:
+            self.db_api.connect()
+            if not self.db_api.table_exists(table_name):
+                logger.warning(f"Table '{table_name}' does not exist in the database.")
+                return results
+
+            placeholders = ", ".join("?" for _ in tickers)
+            query = (
+                f"SELECT * FROM {table_name} WHERE ticker IN ({placeholders}) "
+                f"QUALIFY ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY report_period DESC) <= ? "
+                f"ORDER BY ticker, report_period DESC"
+            )
+
+            profiles = self.db_api.query_to_models(query, FinancialProfile, params=[*tickers, limit])
+            for profile in profiles:
+                results.setdefault(profile.ticker, []).append(profile)
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to get financial metrics for {tickers} from {table_name}: {e}")
+            return results
+        finally:
+            self._release_db()
 
     def search_line_items(self, ticker: str, line_items: List[str], end_date: str, period: str = "ttm", limit: int = 10) -> List[LineItem]:
         return []
@@ -167,34 +307,57 @@ class FutuDataProvider(AbstractDataProvider):
         return []
 
     def get_market_cap(self, ticker: str, end_date: str) -> Optional[float]:
+        return self.get_market_cap_batch([ticker], end_date)[ticker]
+
+    def get_market_cap_batch(self, tickers: List[str], end_date: str) -> Dict[str, Optional[float]]:
+        """
+        批量获取市值：get_market_snapshot 本身接受股票列表，每 SNAPSHOT_MAX_CODES 个股票只需一次请求。
+        """
+        results: Dict[str, Optional[float]] = {ticker: None for ticker in tickers}
+        if not tickers:
+            return results
+
         self._connect()
         try:
-            futu_ticker = self._convert_ticker_format(ticker)
-            ret, data = self.quote_ctx.get_market_snapshot([futu_ticker])
-            
-            if ret == ft.RET_OK and not data.empty:
-                market_cap = data['market_cap'].iloc[0]
-                return float(market_cap) if market_cap else None
-            else:
-                logger.error(f"Futu API error for get_market_cap('{ticker}'): {data}")
-                return None
+            code_to_ticker = {self._convert_ticker_format(ticker): ticker for ticker in results}
+            codes = list(code_to_ticker)
+            for i in range(0, len(codes), SNAPSHOT_MAX_CODES):
+                chunk = codes[i:i + SNAPSHOT_MAX_CODES]
+                ret, data = self.quote_ctx.get_market_snapshot(chunk)
+                if ret != ft.RET_OK:
+                    logger.error(f"Futu API error for get_market_cap_batch({chunk}): {data}")
+                    continue
+                for code, market_cap in zip(data['code'].tolist(), data['market_cap'].tolist()):
+                    if code in code_to_ticker:
+                        results[code_to_ticker[code]] = float(market_cap) if market_cap else None
+            return results
         except Exception as e:
-            logger.error(f"An exception occurred in get_market_cap('{ticker}'): {e}")
-            return None
+            logger.error(f"An exception occurred in get_market_cap_batch({tickers}): {e}")
+            return results
         finally:
-            self._disconnect()
+            self._release()
 
     def get_financial_profile(self, ticker: str, end_date: str, period: str = "annual", limit: int = 1) -> List[FinancialProfile]:
         return []
 
     def is_available(self) -> bool:
-        """检查数据提供商是否可用（通过尝试连接数据库）。"""
+        """检查数据提供商是否可用（通过尝试连接数据库），结果缓存 AVAILABILITY_TTL 秒。"""
+        # 已经持有连接时无需再探测
+        if self._conn_refs > 0 or self.quote_ctx is not None:
+            return True
+
+        available, expires_at = self._availability
+        if time.monotonic() < expires_at:
+            return available
+
         try:
             self.db_api.connect()
-            self.db_api.close()
-            return True
+            self._release_db()
+            available = True
         except Exception:
-            return False
+            available = False
+        self._availability = (available, time.monotonic() + AVAILABILITY_TTL)
+        return available
 
     def convert_period(self, period: str) -> str:
         # Futu API uses different period designations
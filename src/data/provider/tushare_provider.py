@@ -738,7 +738,7 @@ class TushareProvider(AbstractDataProvider):
             
             # 港股暂不支持市值数据
             if self._is_hk_stock(ticker):
-                print(f"Tushare暂不支持港股市值数据: {ticker}")
+                logger.debug(f"Tushare暂不支持港股市值数据: {ticker}")
                 return None
             
             # A股使用daily_basic获取市值数据
@@ -759,7 +759,7 @@ class TushareProvider(AbstractDataProvider):
                                          fields='ts_code,trade_date,total_mv')
                 
                 if df.empty:
-                    print(f"市值数据为空 {ticker} 在日期 {end_date}")
+                    logger.warning(f"市值数据为空 {ticker} 在日期 {end_date}")
                     return None
                 
                 # 取最近的有数据的日期
@@ -768,14 +768,15 @@ class TushareProvider(AbstractDataProvider):
             # A股total_mv字段，单位是万元
             if pd.notna(df.iloc[0]['total_mv']):
                 market_cap = float(df.iloc[0]['total_mv']) * 10000
-                print(f"获取市值成功 {ticker}: {market_cap:,.0f} 人民币 (日期: {df.iloc[0]['trade_date']})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"获取市值成功 {ticker}: {market_cap:,.0f} 人民币 (日期: {df.iloc[0]['trade_date']})")
                 return market_cap
             else:
-                print(f"市值字段为空 {ticker}")
+                logger.warning(f"市值字段为空 {ticker}")
                 return None
             
         except Exception as e:
-            print(f"获取市值失败 {ticker}: {e}")
+            logger.error(f"获取市值失败 {ticker}: {e}")
             return None
     
     def is_available(self) -> bool:
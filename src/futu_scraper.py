@@ -2,7 +2,8 @@ import futu as ft
 import os
 import logging
 from datetime import datetime, date
-from typing import List, Optional
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 
@@ -10,7 +11,7 @@ import pandas as pd
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type, RetryCallState
 
 from src.data.models import FinancialProfile, StockPlateMapping, Market
-from src.data.futu_utils import futu_data_to_financial_profile, get_report_period_date
+from src.data.futu_utils import iter_financial_profiles, get_report_period_date
 from src.utils.log_util import logger_setup as _init_logging
 from src.data.db import get_database_api, DatabaseAPI
 from src.utils.api_executor import FutuAPIExecutor
@@ -42,8 +43,36 @@ FINANCIAL_FILTER_FIELDS = [
     ft.StockField.SUM_OF_BUSINESS_GROWTH, ft.StockField.TOTAL_ASSETS_GROWTH_RATE, ft.StockField.TOTAL_ASSET_TURNOVER
 ]
 
-# Combine all fields, ensuring no duplicates
-ALL_FIELDS_TO_SCRAPE = list(set(FINANCIAL_FILTER_FIELDS + list(SIMPLE_FILTER_FIELDS)))
+# Combine all fields, ensuring no duplicates (dict.fromkeys keeps a stable order)
+ALL_FIELDS_TO_SCRAPE = tuple(dict.fromkeys(FINANCIAL_FILTER_FIELDS + sorted(SIMPLE_FILTER_FIELDS)))
+
+MARKET_MAP = {'HK': ft.Market.HK, 'US': ft.Market.US}
+MARKET_CURRENCY = {ft.Market.HK: "HKD", ft.Market.US: "USD"}
+QUARTER_MAP = {
+    "annual": ft.FinancialQuarter.ANNUAL,
+    "q1": ft.FinancialQuarter.FIRST_QUARTER,
+    "interim": ft.FinancialQuarter.INTERIM,
+    "q3": ft.FinancialQuarter.THIRD_QUARTER,
+}
+
+# Number of fields requested together in one get_stock_filter filter_list. Filters are sent with
+# is_no_filter=True so combining them does not AND-filter stocks that lack one of the fields.
+FIELDS_PER_REQUEST = 5
+
+# Number of field groups paginated concurrently. FutuAPIExecutor serializes get_stock_filter calls
+# under its per-endpoint lock and rate limit, so extra workers only overlap one group's page
+# processing with the next group's request (or rate-limit wait); they never exceed the quota.
+FIELD_SCRAPE_WORKERS = 4
+
+# Number of FinancialProfile models converted and handed to the database writer at a time.
+STORE_BATCH_SIZE = 1000
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yields consecutive lists of at most `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 class FutuScraper:
     """Synchronously scrapes financial data using a multi-threaded executor."""
@@ -53,7 +82,7 @@ class FutuScraper:
         self.db_path = db_path
         self.quote_ctx: Optional[ft.OpenQuoteContext] = None
         self.db_api: Optional[DatabaseAPI] = None
-        self.api_executor = FutuAPIExecutor(max_workers=1)
+        self.api_executor = FutuAPIExecutor(max_workers=FIELD_SCRAPE_WORKERS)
 
     def __enter__(self):
         """Context manager entry point. Connects to resources."""
@@ -97,22 +126,42 @@ class FutuScraper:
         report_date = get_report_period_date(date.today(), quarter)
         report_date_str = report_date.strftime('%Y-%m-%d')
         
-        scraped_profiles = self.scrape_financial_profile(market, quarter, report_date_str)
-        if not scraped_profiles:
+        # Profiles are converted lazily and written in batches, so the full list of models is never held in memory
+        profiles = self.iter_financial_profiles(market, quarter, report_date_str)
+        first_profile = next(profiles, None)
+        if first_profile is None:
             logger.info("No financial data was scraped, nothing to store.")
             return
             
         table_name = f"financial_profile_{report_date.strftime('%Y_%m_%d')}"
-        logger.info(f"Scraped {len(scraped_profiles)} records for period {report_date_str}, storing to table '{table_name}'...")
+        logger.info(f"Storing scraped records for period {report_date_str} to table '{table_name}'...")
 
         primary_keys = ["ticker", "report_period", "period"]
         self.db_api.create_table_from_model(table_name, FinancialProfile, primary_keys)
-        self.db_api.upsert_data_from_models(table_name, scraped_profiles, primary_keys)
-        logger.info(f"Successfully stored/updated {len(scraped_profiles)} records in '{table_name}'.")
+        stored = 0
+
+        def batches():
+            nonlocal stored
+            for batch in _batched(chain((first_profile,), profiles), STORE_BATCH_SIZE):
+                stored += len(batch)
+                yield batch
+
+        self.db_api.upsert_data_streaming(table_name, FinancialProfile, batches(), primary_keys)
+        logger.info(f"Successfully stored/updated {stored} records in '{table_name}'.")
         self.close()
 
     def scrape_financial_profile(self, market: str, quarter: str, end_date: str) -> List[FinancialProfile]:
         """Concurrently scrapes financial profiles for all stocks in a given market."""
+        return list(self.iter_financial_profiles(market, quarter, end_date))
+
+    def iter_financial_profiles(self, market: str, quarter: str, end_date: str) -> Iterator[FinancialProfile]:
+        """Scrapes all stocks in a market, then yields their FinancialProfile models one at a time."""
+        all_stocks_data = self._scrape_all_stocks_data(market, quarter, end_date)
+        logger.info(f"Finished scraping. Total unique stocks found: {len(all_stocks_data)}")
+        yield from iter_financial_profiles(all_stocks_data, end_date, quarter)
+
+    def _scrape_all_stocks_data(self, market: str, quarter: str, end_date: str) -> dict:
+        """Concurrently scrapes the raw field values of all stocks, keyed by stock code."""
         try:
             ft_market = self._validate_market(market)
             logger.info(f"Using report period end date: {end_date} for quarter '{quarter}'")
@@ -121,94 +170,92 @@ class FutuScraper:
             data_lock = Lock()
             currency = self._get_currency(ft_market)
 
+            field_groups = [
+                ALL_FIELDS_TO_SCRAPE[i:i + FIELDS_PER_REQUEST]
+                for i in range(0, len(ALL_FIELDS_TO_SCRAPE), FIELDS_PER_REQUEST)
+            ]
             with ThreadPoolExecutor(max_workers=self.api_executor.max_workers) as executor:
                 futures = {
                     executor.submit(
-                        self._scrape_field_worker,
-                        field,
+                        self._scrape_fields_worker,
+                        fields,
                         ft_market,
                         quarter,
                         currency,
                         all_stocks_data,
                         data_lock
-                    ): field for field in ALL_FIELDS_TO_SCRAPE
+                    ): fields for fields in field_groups
                 }
                 for future in futures:
                     future.result()
 
-            return self._process_scraped_data(all_stocks_data, end_date, quarter)
+            return all_stocks_data
         except Exception as e:
             logger.error(f"Failed to scrape financial profiles for market {market}: {e}", exc_info=True)
-            return []
+            return {}
 
-    def _scrape_field_worker(self, field, ft_market, quarter, currency, all_stocks_data, lock):
-        """Worker function to scrape all pages for a single financial field."""
-        logger.info(f"Starting scrape for field: {field}")
+    def _scrape_fields_worker(self, fields, ft_market, quarter, currency, all_stocks_data, lock):
+        """Worker function to scrape all pages for a group of financial fields requested together."""
+        logger.info(f"Starting scrape for fields: {fields}")
         begin_index = 0
         num_per_req = 200
         quarter_enum = self._get_quarter_enum(quarter)
+        # FinancialFilter returns a tuple key, SimpleFilter returns a string key
+        columns = [(field.lower(), field.lower() if field in SIMPLE_FILTER_FIELDS else (field.lower(), quarter)) for field in fields]
+        filter_list = [self._create_filter(field, quarter_enum) for field in fields]
 
         while True:
-            filter_instance = self._create_filter(field, quarter_enum)
-
             ret, data = self.api_executor.execute(
                 "get_stock_filter",
                 self.quote_ctx.get_stock_filter,
-                market=ft_market, filter_list=[filter_instance], begin=begin_index, num=num_per_req
+                market=ft_market, filter_list=filter_list, begin=begin_index, num=num_per_req
             )
 
             if ret != ft.RET_OK:
-                logger.error(f"Futu API error for field {field.name}: {data}")
+                logger.error(f"Futu API error for fields {fields}: {data}")
                 break
             if data is None:
                 break
 
             is_last_page, stock_num, stock_list_chunk = data
-            logger.debug(f"scrape field: {field}, total stocks: {stock_num}, is_last_page: {is_last_page}")
-            with lock:
-                for stock_data in stock_list_chunk:
+            logger.debug(f"scrape fields: {fields}, total stocks: {stock_num}, is_last_page: {is_last_page}")
+            # Extract the page outside the lock so concurrent workers only contend on the merge.
+            # Stocks without any of the fields are skipped, as the per-field range filter used to do.
+            page = []
+            for stock_data in stock_list_chunk:
+                stock_vars = vars(stock_data)
+                values = {column: value for column, value_key in columns if (value := stock_vars.get(value_key)) is not None}
+                if values:
                     stock_code = stock_data.stock_code
                     stock_code = stock_code.split('.')[1] if '.' in stock_code else stock_code
-                    stock_vars = vars(stock_data)
-                    value = None
+                    page.append((stock_code, stock_data.stock_name, values))
 
-                    if stock_code not in all_stocks_data:
-                        all_stocks_data[stock_code] = {'ticker': stock_code}
-                        all_stocks_data[stock_code]['name'] = stock_data.stock_name
-                        all_stocks_data[stock_code]['currency'] = currency
-
-                    # FinancialFilter returns a tuple key, SimpleFilter returns a string key
-                    if field in SIMPLE_FILTER_FIELDS:
-                        value = stock_vars.get(field.lower())
-                    else:
-                        value = stock_vars.get((field.lower(), quarter))
-                    all_stocks_data[stock_code][field.lower()] = value
+            with lock:
+                for stock_code, stock_name, values in page:
+                    stock_values = all_stocks_data.get(stock_code)
+                    if stock_values is None:
+                        stock_values = all_stocks_data[stock_code] = {'ticker': stock_code, 'name': stock_name, 'currency': currency}
+                    stock_values.update(values)
 
             if is_last_page:
                 break
             begin_index += num_per_req
-        logger.info(f"Finished scrape for field: {field}")
+        logger.info(f"Finished scrape for fields: {fields}")
     
     def _validate_market(self, market: str) -> ft.Market:
         """Validates and returns the Futu API market enum."""
-        market_map = {'HK': ft.Market.HK, 'US': ft.Market.US}
-        ft_market = market_map.get(market.upper())
+        ft_market = MARKET_MAP.get(market.upper())
         if not ft_market:
             raise ValueError(f"Unsupported market: {market}. Please use 'HK' or 'US'.")
         return ft_market
 
     def _get_currency(self, market: ft.Market) -> str:
-        # Determine currency from market
-        if market == ft.Market.HK:
-            return "HKD"
-        elif market == ft.Market.US:
-            return "USD"
-        return "HKD" #default
+        # Determine currency from market, HKD by default
+        return MARKET_CURRENCY.get(market, "HKD")
 
     def _get_quarter_enum(self, quarter: str) -> ft.FinancialQuarter:
         """Gets the Futu API quarter enum."""
-        quarter_map = {"annual": ft.FinancialQuarter.ANNUAL, "q1": ft.FinancialQuarter.FIRST_QUARTER, "interim": ft.FinancialQuarter.INTERIM, "q3": ft.FinancialQuarter.THIRD_QUARTER}
-        return quarter_map.get(quarter.lower(), ft.FinancialQuarter.ANNUAL)
+        return QUARTER_MAP.get(quarter.lower(), ft.FinancialQuarter.ANNUAL)
 
     def _create_filter(self, field, quarter_enum):
         """Creates an API request filter instance."""
@@ -216,16 +263,10 @@ class FutuScraper:
         if isinstance(filter_instance, ft.FinancialFilter):
             filter_instance.quarter = quarter_enum
         filter_instance.stock_field = field
-        filter_instance.filter_min = -1e15
-        filter_instance.filter_max = 1e15
-        filter_instance.is_no_filter = False
+        # Return the field without filtering on it, so several fields can share one request
+        filter_instance.is_no_filter = True
         return filter_instance
 
-    def _process_scraped_data(self, all_stocks_data: dict, end_date: str, quarter: str) -> List[FinancialProfile]:
-        """Processes raw scraped data into a list of FinancialProfile objects."""
-        logger.info(f"Finished scraping. Total unique stocks found: {len(all_stocks_data)}")
-        return futu_data_to_financial_profile(all_stocks_data, end_date, quarter)
-
     def scrape_stock_plate_mappings(self, market: Market = Market.HK):
         """Scrapes and stores stock-to-plate mappings synchronously."""
         self._connect()
@@ -247,11 +288,11 @@ class FutuScraper:
                 plate_mappings = []
                 stocks_df = self._get_plate_stock(plate['code'])
                 if stocks_df is not None and not stocks_df.empty:
-                    for _, stock in stocks_df.iterrows():
+                    # Select the columns first so the plain tuples from itertuples unpack positionally
+                    for code, stock_name in stocks_df[['code', 'stock_name']].itertuples(index=False, name=None):
                         # The ticker in the plate data does not have a market prefix
-                        ticker = stock['code']
-                        ticker = ticker.split('.')[1] if '.' in ticker else ticker
-                        plate_mappings.append(StockPlateMapping(ticker=ticker, stock_name=stock['stock_name'], plate_code=plate['plate_id'], plate_name=plate['plate_name'], market=market.value))
+                        ticker = code.split('.')[1] if '.' in code else code
+                        plate_mappings.append(StockPlateMapping(ticker=ticker, stock_name=stock_name, plate_code=plate['plate_id'], plate_name=plate['plate_name'], market=market.value))
 
                 if plate_mappings:
                     self.db_api.upsert_data_from_models(table_name, plate_mappings, primary_keys)
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 import pandas as pd
 
 from src.data.cache import get_cache
@@ -31,7 +31,6 @@ def _convert_transaction_type(trade_data: dict) -> dict:
 # Global cache instances
 _cache = get_cache()
 _persistent_cache = get_persistent_cache()
-_config = get_data_config()
 
 # Global data provider instance
 _data_provider: Optional[AbstractDataProvider] = None
@@ -44,7 +43,7 @@ def _get_data_provider() -> AbstractDataProvider:
     if _data_provider is None:
         try:
             # 从配置获取默认数据提供商
-            default_provider = _config.get_default_data_provider()
+            default_provider = get_data_config().get_default_data_provider()
             _data_provider = DataProviderFactory.get_provider_by_name(default_provider)
             logger.info(f"初始化数据提供商: {default_provider}")
         except Exception as e:
@@ -64,7 +63,7 @@ def switch_data_provider(provider_name: str, api_key: Optional[str] = None) -> b
         new_provider = DataProviderFactory.get_provider_by_name(provider_name, api_key)
         if new_provider.is_available():
             _data_provider = new_provider
-            _config.set_default_data_provider(provider_name)
+            get_data_config().set_default_data_provider(provider_name)
             logger.info(f"数据提供商已切换为: {provider_name}")
             return True
         else:
@@ -122,6 +121,31 @@ def get_prices(ticker: str, start_date: str, end_date: str) -> List[Price]:
         return []
 
 
+def _get_cached_financial_metrics(ticker: str, period: str, end_date: str, limit: int) -> Optional[List[FinancialMetrics]]:
+    """从内存缓存或持久化缓存读取财务指标（未经过滤），未命中时返回None"""
+    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
+
+    # Check memory cache first - fastest
+    if cached_data := _cache.get_financial_metrics(cache_key):
+        return [FinancialMetrics(**metric) for metric in cached_data]
+
+    # Check persistent cache - second fastest
+    if persistent_data := _persistent_cache.get_financial_metrics(ticker, period, end_date, limit):
+        # Load into memory cache for faster future access
+        _cache.set_financial_metrics(cache_key, persistent_data)
+        return [FinancialMetrics(**metric) for metric in persistent_data]
+
+    return None
+
+
+def _cache_financial_metrics(ticker: str, period: str, end_date: str, limit: int, metrics: List[FinancialMetrics]):
+    """将财务指标写入内存缓存和持久化缓存"""
+    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
+    metrics_data = [m.model_dump() for m in metrics]
+    _cache.set_financial_metrics(cache_key, metrics_data)
+    _persistent_cache.set_financial_metrics(ticker, period, end_date, limit, metrics_data)
+
+
 def get_financial_metrics(
     ticker: str,
     end_date: str,
@@ -129,27 +153,12 @@ def get_financial_metrics(
     limit: int = 10,
 ) -> List[FinancialMetrics]:
     """获取财务指标数据（支持缓存）"""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
-    
     provider = _get_data_provider()
     filtering_period = provider.convert_period(period)
 
-    # Check memory cache first - fastest
-    if cached_data := _cache.get_financial_metrics(cache_key):
-        all_metrics = [FinancialMetrics(**metric) for metric in cached_data]
-        # Apply filter and limit to cached data
-        filtered_metrics = _filter_period_and_limit_number(all_metrics, filtering_period, limit)
-        return filtered_metrics
-    
-    # Check persistent cache - second fastest
-    if persistent_data := _persistent_cache.get_financial_metrics(ticker, period, end_date, limit):
-        all_metrics = [FinancialMetrics(**metric) for metric in persistent_data]
-        # Load into memory cache for faster future access
-        _cache.set_financial_metrics(cache_key, persistent_data)
+    if (all_metrics := _get_cached_financial_metrics(ticker, period, end_date, limit)) is not None:
         # Apply filter and limit to cached data
-        filtered_metrics = _filter_period_and_limit_number(all_metrics, filtering_period, limit)
-        return filtered_metrics
+        return _filter_period_and_limit_number(all_metrics, filtering_period, limit)
 
     # If not in cache, fetch from data provider
     try:
@@ -159,9 +168,7 @@ def get_financial_metrics(
             return []
 
         # Cache the results in both memory and persistent cache
-        metrics_data = [m.model_dump() for m in metrics]
-        _cache.set_financial_metrics(cache_key, metrics_data)
-        _persistent_cache.set_financial_metrics(ticker, period, end_date, limit, metrics_data)
+        _cache_financial_metrics(ticker, period, end_date, limit, metrics)
 
         # Filter by period and apply limit
         filtered_metrics = _filter_period_and_limit_number(metrics, filtering_period, limit)
@@ -170,6 +177,40 @@ def get_financial_metrics(
         logger.error(f"获取财务指标失败 {ticker}: {e}")
         return []
 
+
+def get_financial_metrics_batch(
+    tickers: List[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> Dict[str, List[FinancialMetrics]]:
+    """批量获取财务指标数据（支持缓存），未命中缓存的股票通过一次数据提供商调用获取"""
+    provider = _get_data_provider()
+    filtering_period = provider.convert_period(period)
+
+    results: Dict[str, List[FinancialMetrics]] = {}
+    missing: List[str] = []
+    for ticker in tickers:
+        if (all_metrics := _get_cached_financial_metrics(ticker, period, end_date, limit)) is not None:
+            results[ticker] = _filter_period_and_limit_number(all_metrics, filtering_period, limit)
+        else:
+            missing.append(ticker)
+
+    if missing:
+        try:
+            fetched = provider.get_financial_metrics_batch(missing, end_date, period, limit)
+        except Exception as e:
+            logger.error(f"批量获取财务指标失败 {missing}: {e}")
+            fetched = {}
+
+        for ticker in missing:
+            metrics = fetched.get(ticker) or []
+            if metrics:
+                _cache_financial_metrics(ticker, period, end_date, limit, metrics)
+            results[ticker] = _filter_period_and_limit_number(metrics, filtering_period, limit)
+
+    return {ticker: results[ticker] for ticker in tickers}
+
 def _filter_period_and_limit_number(items: List[LineItem], period: str, limit: int) -> List[LineItem]:
     """Filter line items by period and return the latest N items.
     
@@ -194,33 +235,21 @@ def _filter_period_and_limit_number(items: List[LineItem], period: str, limit: i
     return filtered_items[:limit]
 
 
-def search_line_items(
-    ticker: str,
-    line_items: List[str],
-    end_date: str,
-    period: str = "ttm",
-    limit: int = 10,
-) -> List[LineItem]:
-    provider = _get_data_provider()
-    filtering_period = provider.convert_period(period)
-
-    """搜索财务报表项目（支持缓存）"""
+def _get_cached_line_items(ticker: str, line_items: List[str], period: str, end_date: str) -> Optional[List[LineItem]]:
+    """从内存缓存或持久化缓存读取财务报表项目（未经过滤），未命中或数据无效时返回None"""
     # Create a cache key without limit - cache complete data
     line_items_str = "_".join(sorted(line_items))  # Sort for consistent cache key
     cache_key = f"{ticker}_{period}_{end_date}_{line_items_str}"
-    
+
     # Check memory cache first - fastest
     if cached_data := _cache.get_line_items(cache_key):
         try:
-            all_items = [LineItem(**item) for item in cached_data]
-            # Filter by period and apply limit
-            filtered_items = _filter_period_and_limit_number(all_items, filtering_period, limit)
-            return filtered_items
+            return [LineItem(**item) for item in cached_data]
         except Exception as e:
             # If cached data format is invalid, clear it and fetch fresh
             logger.warning(f"Invalid cached data format for line_items {ticker}, clearing cache: {e}")
             _cache._line_items_cache.pop(cache_key, None)
-    
+
     # Check persistent cache - second fastest
     # Use a large limit (1000) to get complete data from persistent cache
     if persistent_data := _persistent_cache.get_line_items(ticker, line_items, period, end_date, 1000):
@@ -229,13 +258,38 @@ def search_line_items(
             logger.debug(f"persistent_data: {len(all_items)} items loaded")
             # Load into memory cache for faster future access
             _cache.set_line_items(cache_key, persistent_data)
-            # Filter by period and apply limit
-            filtered_items = _filter_period_and_limit_number(all_items, filtering_period, limit)
-            return filtered_items
+            return all_items
         except Exception as e:
             # If persistent data format is invalid, ignore and fetch fresh
             logger.warning(f"Invalid persistent data format for line_items {ticker}: {e}")
 
+    return None
+
+
+def _cache_line_items(ticker: str, line_items: List[str], period: str, end_date: str, search_results: List[LineItem]):
+    """将财务报表项目写入内存缓存和持久化缓存"""
+    line_items_str = "_".join(sorted(line_items))
+    cache_key = f"{ticker}_{period}_{end_date}_{line_items_str}"
+    line_items_data = [item.model_dump() for item in search_results]
+    _cache.set_line_items(cache_key, line_items_data)
+    _persistent_cache.set_line_items(ticker, line_items, period, end_date, 1000, line_items_data)
+
+
+def search_line_items(
+    ticker: str,
+    line_items: List[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> List[LineItem]:
+    """搜索财务报表项目（支持缓存）"""
+    provider = _get_data_provider()
+    filtering_period = provider.convert_period(period)
+
+    if (all_items := _get_cached_line_items(ticker, line_items, period, end_date)) is not None:
+        # Filter by period and apply limit
+        return _filter_period_and_limit_number(all_items, filtering_period, limit)
+
     # If not in cache, fetch from data provider with large limit to get complete data
     try:
         # Fetch complete data (use 1000 as a large limit to get all available data)
@@ -246,9 +300,7 @@ def search_line_items(
             return []
 
         # Cache the complete results in both memory and persistent cache
-        line_items_data = [item.model_dump() for item in search_results]
-        _cache.set_line_items(cache_key, line_items_data)
-        _persistent_cache.set_line_items(ticker, line_items, period, end_date, 1000, line_items_data)
+        _cache_line_items(ticker, line_items, period, end_date, search_results)
         
         # Filter by period and apply limit
         filtered_items = _filter_period_and_limit_number(search_results, filtering_period, limit)
@@ -258,6 +310,41 @@ def search_line_items(
         return []
 
 
+def search_line_items_batch(
+    tickers: List[str],
+    line_items: List[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> Dict[str, List[LineItem]]:
+    """批量搜索财务报表项目（支持缓存），未命中缓存的股票通过一次数据提供商调用获取"""
+    provider = _get_data_provider()
+    filtering_period = provider.convert_period(period)
+
+    results: Dict[str, List[LineItem]] = {}
+    missing: List[str] = []
+    for ticker in tickers:
+        if (all_items := _get_cached_line_items(ticker, line_items, period, end_date)) is not None:
+            results[ticker] = _filter_period_and_limit_number(all_items, filtering_period, limit)
+        else:
+            missing.append(ticker)
+
+    if missing:
+        try:
+            fetched = provider.search_line_items_batch(missing, line_items, end_date, period, limit)
+        except Exception as e:
+            logger.error(f"批量搜索财务报表项目失败 {missing}: {e}")
+            fetched = {}
+
+        for ticker in missing:
+            search_results = fetched.get(ticker) or []
+            if search_results:
+                _cache_line_items(ticker, line_items, period, end_date, search_results)
+            results[ticker] = _filter_period_and_limit_number(search_results, filtering_period, limit)
+
+    return {ticker: results[ticker] for ticker in tickers}
+
+
 def get_insider_trades(
     ticker: str,
     end_date: str,
@@ -344,6 +431,17 @@ def get_market_cap(ticker: str, end_date: str) -> Optional[float]:
         return None
 
 
+def get_market_cap_batch(tickers: List[str], end_date: str) -> Dict[str, Optional[float]]:
+    """批量获取市值"""
+    try:
+        provider = _get_data_provider()
+        market_caps = provider.get_market_cap_batch(tickers, end_date)
+    except Exception as e:
+        logger.error(f"批量获取市值失败 {tickers}: {e}")
+        market_caps = {}
+    return {ticker: market_caps.get(ticker) for ticker in tickers}
+
+
 def prices_to_df(prices: List[Price]) -> pd.DataFrame:
     """将价格数据转换为DataFrame"""
     if not prices:
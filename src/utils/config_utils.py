@@ -3,9 +3,11 @@
 import os
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, Optional, Union
 import logging
 
+logger = logging.getLogger(__name__)
+
 try:
     import yaml
     YAML_AVAILABLE = True
@@ -13,7 +15,21 @@ except ImportError:
     yaml = None
     YAML_AVAILABLE = False
 
-logger = logging.getLogger(__name__)
+# orjson（C实现）解析和序列化JSON比标准库快数倍，不可用时回退到json模块
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# 优先使用libyaml的C实现，速度比纯Python实现快数倍
+if YAML_AVAILABLE:
+    try:
+        from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+        logger.info("libyaml不可用，使用纯Python的YAML解析器")
 
 
 class ConfigLoader:
@@ -29,9 +45,6 @@ class ConfigLoader:
         """
         self.config_file = Path(config_file)
         self.default_config = default_config or {}
-        
-        # 确保配置文件目录存在
-        self.config_file.parent.mkdir(parents=True, exist_ok=True)
     
     def load_config(self) -> Dict[str, Any]:
         """
@@ -40,24 +53,23 @@ class ConfigLoader:
         Returns:
             Dict[str, Any]: 配置字典
         """
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    if YAML_AVAILABLE and self.config_file.suffix == '.yaml':
-                        loaded_config = yaml.safe_load(f)
-                    else:
-                        loaded_config = json.load(f)
-                
-                if loaded_config is None:
-                    loaded_config = {}
-                
-                # 与默认配置合并（新类型可能会被添加）
-                config = self.default_config.copy()
-                config.update(loaded_config)
-                return config
-                
-            except (yaml.YAMLError if YAML_AVAILABLE else Exception, json.JSONDecodeError, IOError) as e:
-                logger.warning(f"无法从 {self.config_file} 加载配置: {e}，使用默认配置")
+        # 直接打开文件，不存在时由 FileNotFoundError 处理，省去一次 exists() 的 stat
+        try:
+            loaded_config = self.parse(self.config_file.read_bytes())
+            
+            # 没有默认配置时直接返回解析结果，无需复制
+            if not self.default_config:
+                return loaded_config
+            
+            # 与默认配置合并（新类型可能会被添加）
+            config = self.default_config.copy()
+            config.update(loaded_config)
+            return config
+            
+        except FileNotFoundError:
+            pass
+        except (yaml.YAMLError if YAML_AVAILABLE else Exception, json.JSONDecodeError, IOError) as e:
+            logger.warning(f"无法从 {self.config_file} 加载配置: {e}，使用默认配置")
         
         # 如果文件不存在或加载失败，保存默认配置到文件
         if self.default_config:
@@ -75,20 +87,63 @@ class ConfigLoader:
         Returns:
             bool: 保存是否成功
         """
+        tmp_file = self.config_file.with_name(f"{self.config_file.name}.{os.getpid()}.tmp")
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                if YAML_AVAILABLE and self.config_file.suffix == '.yaml':
-                    yaml.dump(config, f, default_flow_style=False, indent=2, allow_unicode=True)
-                else:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
+            # 先写入同目录的临时文件再原子替换，避免读者看到写了一半的配置
+            data = self.serialize(config).encode('utf-8')
+            with self._open_for_write(tmp_file) as f:
+                f.write(data)
+            os.replace(tmp_file, self.config_file)
             
             logger.debug(f"配置已保存到: {self.config_file}")
             return True
             
         except IOError as e:
             logger.error(f"无法保存配置到 {self.config_file}: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
             return False
     
+    def parse(self, raw: bytes) -> Dict[str, Any]:
+        """
+        按配置文件格式解析UTF-8字节内容（YAML和JSON解析器都直接接受bytes，无需先解码）
+        
+        Args:
+            raw: 配置文件的原始字节
+            
+        Returns:
+            Dict[str, Any]: 配置字典，空文件返回空字典
+        """
+        if YAML_AVAILABLE and self.config_file.suffix == '.yaml':
+            loaded_config = yaml.load(raw, Loader=YamlLoader)
+        else:
+            loaded_config = json_loads(raw)
+        return loaded_config if loaded_config is not None else {}
+    
+    def serialize(self, config: Dict[str, Any]) -> str:
+        """
+        按配置文件格式序列化配置，与 save_config 写入的内容完全一致
+        
+        Args:
+            config: 要序列化的配置字典
+            
+        Returns:
+            str: YAML或JSON文本
+        """
+        if YAML_AVAILABLE and self.config_file.suffix == '.yaml':
+            return yaml.dump(config, Dumper=YamlDumper, default_flow_style=False, indent=2, allow_unicode=True)
+        return json_dumps(config, indent=True).decode('utf-8')
+    
+    def _open_for_write(self, path: Path):
+        """打开文件用于写入，目录不存在时才创建（只在保存路径上付出mkdir的开销）"""
+        try:
+            return open(path, 'wb')
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return open(path, 'wb')
+    
     def reload_config(self) -> Dict[str, Any]:
         """
         重新加载配置文件
@@ -108,6 +163,45 @@ class ConfigLoader:
         return self.config_file.exists()
 
 
+def json_loads(raw: Union[bytes, str]) -> Any:
+    """
+    解析JSON文本，orjson可用时使用orjson
+    
+    Args:
+        raw: UTF-8字节或字符串
+        
+    Returns:
+        Any: 解析结果
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False, default: Optional[Callable] = None) -> bytes:
+    """
+    序列化为UTF-8编码的JSON（非ASCII字符原样输出，非字符串键转为字符串），orjson可用时使用orjson
+    
+    Args:
+        obj: 要序列化的对象
+        indent: 是否以2个空格缩进
+        sort_keys: 是否按键排序
+        default: 无法序列化的对象的转换函数
+        
+    Returns:
+        bytes: JSON字节
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys, default=default,
+                      ensure_ascii=False).encode('utf-8')
+
+
 def load_yaml_config(config_file: Union[str, Path], default_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     快速加载YAML配置文件的便捷函数
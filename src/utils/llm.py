@@ -17,10 +17,12 @@ def call_llm(
     state: AgentState | None = None,
     max_retries: int = None,
     default_factory=None,
+    cache_key: str | None = None,
 ) -> BaseModel:
     """
     Makes an LLM call with retry logic, handling both JSON supported and non-JSON supported models.
-    For DeepSeek models, responses are cached to improve performance.
+    Responses are cached when the provider's interface config enables the persistent cache
+    with a positive TTL (DeepSeek by default) to improve performance.
 
     Args:
         prompt: The prompt to send to the LLM
@@ -29,6 +31,8 @@ def call_llm(
         state: Optional state object to extract agent-specific model configuration
         max_retries: Maximum number of retries (default: 3)
         default_factory: Optional factory function to create default response on failure
+        cache_key: Optional content key identifying the request; when caching is enabled it is hashed
+            (together with the model) instead of the prompt. It does not enable caching by itself
 
     Returns:
         An instance of the specified Pydantic model
@@ -50,7 +54,7 @@ def call_llm(
     is_deepseek = model_provider == "DeepSeek" or (model_name and model_name.startswith("deepseek"))
     
     # Get timeout and retry configuration from data config
-    from src.data.data_config import get_max_retries, get_retry_delay
+    from src.data.data_config import get_data_config, get_max_retries, get_retry_delay
     interface_name = "call_llm_deepseek" if is_deepseek else "call_llm_other"
     
     # Use configured max_retries if not provided
@@ -59,12 +63,22 @@ def call_llm(
     
     retry_delay = get_retry_delay(interface_name)
     
-    if is_deepseek:
-        # Generate cache key based on prompt, model, and pydantic model
-        cache_key = _generate_llm_cache_key(prompt, model_name, pydantic_model.__name__, agent_name)
+    # Caching follows the interface config: providers configured without the persistent layer or with ttl 0 are never cached.
+    # An agent-specific interface (call_llm_<agent_name>) overrides the provider's cache settings.
+    data_config = get_data_config()
+    cache_interface = interface_name
+    if agent_name and f"call_llm_{agent_name}" in data_config.get_interfaces():
+        cache_interface = f"call_llm_{agent_name}"
+    cache_ttl = data_config.get_interface_ttl(cache_interface).get("default", 0)
+    use_cache = "persistent" in data_config.get_cache_layers(cache_interface) and cache_ttl > 0
+    if use_cache:
+        # Generate cache key based on the caller's key (or the prompt), model, and pydantic model
+        llm_cache_key = _generate_llm_cache_key(
+            cache_key if cache_key is not None else prompt, model_name, pydantic_model.__name__, agent_name
+        )
         
         # Try to get cached response
-        cached_response = _get_cached_llm_response(cache_key)
+        cached_response = _get_cached_llm_response(llm_cache_key)
         if cached_response:
             try:
                 return pydantic_model(**cached_response)
@@ -93,9 +107,9 @@ def call_llm(
                 parsed_result = extract_json_from_response(result.content)
                 if parsed_result:
                     final_result = pydantic_model(**parsed_result)
-                    # Only cache successful responses for DeepSeek models
-                    if is_deepseek and hasattr(final_result, 'model_dump'):
-                        _cache_llm_response(cache_key, final_result.model_dump())
+                    # Only cache successful responses
+                    if use_cache and hasattr(final_result, 'model_dump'):
+                        _cache_llm_response(llm_cache_key, final_result.model_dump(), cache_ttl)
                     return final_result
                 else:
                     # Debug: print the actual response content for troubleshooting
@@ -103,9 +117,9 @@ def call_llm(
                     raise ValueError("Failed to extract JSON from response")
             else:
                 final_result = result
-                # Cache the response for DeepSeek models (JSON mode supported models)
-                if is_deepseek and hasattr(final_result, 'model_dump'):
-                    _cache_llm_response(cache_key, final_result.model_dump())
+                # Cache the response (JSON mode supported models)
+                if use_cache and hasattr(final_result, 'model_dump'):
+                    _cache_llm_response(llm_cache_key, final_result.model_dump(), cache_ttl)
                 return final_result
 
         except Exception as e:
@@ -189,7 +203,7 @@ def _get_cached_llm_response(cache_key: str) -> dict | None:
     return None
 
 
-def _cache_llm_response(cache_key: str, response_data: dict):
+def _cache_llm_response(cache_key: str, response_data: dict, ttl: int | None = None):
     """Cache LLM response for future use."""
     try:
         from src.data.data_config import get_cache_ttl
@@ -199,8 +213,9 @@ def _cache_llm_response(cache_key: str, response_data: dict):
             'response': response_data,
             'timestamp': str(hashlib.md5(cache_key.encode()).hexdigest())  # Use hash as timestamp placeholder
         }]
-        # Use TTL from configuration
-        ttl = get_cache_ttl('llm_responses')
+        # Use the calling interface's TTL, falling back to the llm_responses cache type
+        if ttl is None:
+            ttl = get_cache_ttl('llm_responses')
         cache.set('llm_responses', cache_data, ttl=ttl, cache_key=cache_key)
     except Exception as e:
         print(f"Error caching LLM response: {e}")
@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime, timezone
 from rich.console import Console
 from rich.live import Live
@@ -18,6 +19,7 @@ class AgentProgress:
         self.live = Live(self.table, console=console, refresh_per_second=4)
         self.started = False
         self.update_handlers: List[Callable[[str, Optional[str], str], None]] = []
+        self._lock = threading.RLock()  # agents may report from worker threads
 
     def register_handler(self, handler: Callable[[str, Optional[str], str], None]):
         """Register a handler to be called when agent status updates."""
@@ -43,25 +45,26 @@ class AgentProgress:
 
     def update_status(self, agent_name: str, ticker: Optional[str] = None, status: str = "", analysis: Optional[str] = None):
         """Update the status of an agent."""
-        if agent_name not in self.agent_status:
-            self.agent_status[agent_name] = {"status": "", "ticker": None}
-
-        if ticker:
-            self.agent_status[agent_name]["ticker"] = ticker
-        if status:
-            self.agent_status[agent_name]["status"] = status
-        if analysis:
-            self.agent_status[agent_name]["analysis"] = analysis
-        
-        # Set the timestamp as UTC datetime
-        timestamp = datetime.now(timezone.utc).isoformat()
-        self.agent_status[agent_name]["timestamp"] = timestamp
-
-        # Notify all registered handlers
-        for handler in self.update_handlers:
-            handler(agent_name, ticker, status, analysis, timestamp)
-
-        self._refresh_display()
+        with self._lock:
+            if agent_name not in self.agent_status:
+                self.agent_status[agent_name] = {"status": "", "ticker": None}
+
+            if ticker:
+                self.agent_status[agent_name]["ticker"] = ticker
+            if status:
+                self.agent_status[agent_name]["status"] = status
+            if analysis:
+                self.agent_status[agent_name]["analysis"] = analysis
+            
+            # Set the timestamp as UTC datetime
+            timestamp = datetime.now(timezone.utc).isoformat()
+            self.agent_status[agent_name]["timestamp"] = timestamp
+
+            # Notify all registered handlers
+            for handler in self.update_handlers:
+                handler(agent_name, ticker, status, analysis, timestamp)
+
+            self._refresh_display()
 
     def get_all_status(self):
         """Get the current status of all agents as a dictionary."""
@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.agents import aswath_damodaran
+from src.data.cache import Cache
+from src.data.models import FinancialMetrics, LineItem
+from src.data.persistent_cache import PersistentCache
+from src.tools import api
+
+END_DATE = "2024-12-31"
+
+
+def _metrics(ticker):
+    return [FinancialMetrics(ticker=ticker, name=ticker, report_period="2024-09-30", period="ttm")]
+
+
+def _line_items(ticker):
+    return [LineItem(ticker=ticker, report_period="2024-09-30", period="ttm", name="revenue", value=1.0)]
+
+
+@pytest.fixture
+def provider(monkeypatch, tmp_path):
+    """使用隔离的内存/持久化缓存和模拟的数据提供商"""
+    monkeypatch.setattr(api, "_cache", Cache())
+    monkeypatch.setattr(api, "_persistent_cache", PersistentCache(cache_dir=str(tmp_path)))
+    p = MagicMock()
+    p.convert_period.side_effect = lambda period: period
+    monkeypatch.setattr(api, "_get_data_provider", lambda: p)
+    return p
+
+
+def test_financial_metrics_batch_fetches_only_misses(provider):
+    api._cache_financial_metrics("AAPL", "ttm", END_DATE, 10, _metrics("AAPL"))
+    provider.get_financial_metrics_batch.return_value = {"MSFT": _metrics("MSFT")}
+
+    result = api.get_financial_metrics_batch(["MSFT", "AAPL", "NVDA"], END_DATE)
+
+    provider.get_financial_metrics_batch.assert_called_once_with(["MSFT", "NVDA"], END_DATE, "ttm", 10)
+    assert list(result) == ["MSFT", "AAPL", "NVDA"]
+    assert result["AAPL"] == _metrics("AAPL")
+    assert result["MSFT"] == _metrics("MSFT")
+    assert result["NVDA"] == []
+
+    # 拉取到的结果已写入缓存，空结果不缓存
+    provider.get_financial_metrics_batch.reset_mock()
+    api.get_financial_metrics_batch(["MSFT", "AAPL", "NVDA"], END_DATE)
+    provider.get_financial_metrics_batch.assert_called_once_with(["NVDA"], END_DATE, "ttm", 10)
+
+
+def test_financial_metrics_batch_all_cached(provider):
+    api._cache_financial_metrics("AAPL", "ttm", END_DATE, 10, _metrics("AAPL"))
+
+    assert api.get_financial_metrics_batch(["AAPL"], END_DATE) == {"AAPL": _metrics("AAPL")}
+    provider.get_financial_metrics_batch.assert_not_called()
+
+
+def test_search_line_items_batch_fetches_only_misses(provider):
+    line_items = ["revenue"]
+    api._cache_line_items("AAPL", line_items, "ttm", END_DATE, _line_items("AAPL"))
+    provider.search_line_items_batch.return_value = {"MSFT": _line_items("MSFT")}
+
+    result = api.search_line_items_batch(["AAPL", "MSFT"], line_items, END_DATE)
+
+    provider.search_line_items_batch.assert_called_once_with(["MSFT"], line_items, END_DATE, "ttm", 10)
+    assert result == {"AAPL": _line_items("AAPL"), "MSFT": _line_items("MSFT")}
+
+    provider.search_line_items_batch.reset_mock()
+    api.search_line_items_batch(["AAPL", "MSFT"], line_items, END_DATE)
+    provider.search_line_items_batch.assert_not_called()
+
+
+def test_batch_provider_error_returns_empty(provider):
+    provider.search_line_items_batch.side_effect = RuntimeError("boom")
+
+    assert api.search_line_items_batch(["AAPL"], ["revenue"], END_DATE) == {"AAPL": []}
+
+
+def test_market_cap_batch_fills_missing_tickers(provider):
+    provider.get_market_cap_batch.return_value = {"AAPL": 3.0e12}
+
+    assert api.get_market_cap_batch(["AAPL", "MSFT"], END_DATE) == {"AAPL": 3.0e12, "MSFT": None}
+    provider.get_market_cap_batch.assert_called_once_with(["AAPL", "MSFT"], END_DATE)
+
+
+def test_damodaran_agent_fetches_each_dataset_once(monkeypatch):
+    tickers = ["AAPL", "MSFT"]
+    metrics_batch = MagicMock(return_value={t: [] for t in tickers})
+    line_items_batch = MagicMock(return_value={t: [] for t in tickers})
+    market_cap_batch = MagicMock(return_value={t: None for t in tickers})
+    monkeypatch.setattr(aswath_damodaran, "get_financial_metrics_batch", metrics_batch)
+    monkeypatch.setattr(aswath_damodaran, "search_line_items_batch", line_items_batch)
+    monkeypatch.setattr(aswath_damodaran, "get_market_cap_batch", market_cap_batch)
+    call_llm = MagicMock()
+    monkeypatch.setattr(aswath_damodaran, "call_llm", call_llm)
+    state = {
+        "data": {"end_date": END_DATE, "tickers": tickers, "analyst_signals": {}},
+        "metadata": {"show_reasoning": False},
+    }
+
+    aswath_damodaran.aswath_damodaran_agent(state)
+
+    metrics_batch.assert_called_once_with(tickers, END_DATE, period="ttm", limit=5)
+    line_items_batch.assert_called_once_with(tickers, aswath_damodaran.LINE_ITEMS, END_DATE)
+    market_cap_batch.assert_called_once_with(tickers, END_DATE)
+    # 数据不足时不调用LLM
+    call_llm.assert_not_called()
+    signals = state["data"]["analyst_signals"]["aswath_damodaran_agent"]
+    assert list(signals) == tickers
+    assert all(s["signal"] == "neutral" for s in signals.values())
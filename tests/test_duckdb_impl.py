@@ -113,6 +113,50 @@ class TestDuckDBAPI:
         no_results = db_api.query_to_models(f"SELECT * FROM {table_name} WHERE id = 99", _TestModel)
         assert len(no_results) == 0
 
+        # NULL columns come back as None rather than NaN
+        db_api.upsert_data_from_models(table_name, [_TestModel(id=3, name="query_test3")], primary_keys=["id"])
+        null_models = db_api.query_to_models(f"SELECT * FROM {table_name} WHERE id = 3", _TestModel)
+        assert null_models[0].value is None
+
+    def test_table_exists_is_parameterized_and_cached(self, db_api: DuckDBAPI):
+        """table_exists binds the name as a parameter and remembers confirmed tables."""
+        assert not db_api.table_exists("x' OR '1'='1")
+
+        table_name = "exists_cache_table"
+        db_api.conn.execute(f'CREATE TABLE "{table_name}" (id BIGINT)')
+        assert db_api.table_exists(table_name)
+        assert table_name in db_api._known_tables
+
+    def test_table_exists_cache_invalidated_by_raw_ddl(self, db_api: DuckDBAPI):
+        """DDL run through the query methods clears the cache of confirmed tables."""
+        table_name = "raw_ddl_table"
+        db_api.conn.execute(f'CREATE TABLE "{table_name}" (id BIGINT)')
+        assert db_api.table_exists(table_name)
+
+        db_api.query_to_dataframe(f'DROP TABLE "{table_name}"')
+        assert not db_api.table_exists(table_name)
+
+    def test_table_exists_cache_invalidated_by_failed_query(self, db_api: DuckDBAPI):
+        """A query failing because the table was dropped elsewhere clears the cache."""
+        table_name = "dropped_elsewhere_table"
+        db_api.conn.execute(f'CREATE TABLE "{table_name}" (id BIGINT)')
+        assert db_api.table_exists(table_name)
+
+        cursor = db_api.conn.cursor()
+        cursor.execute(f'DROP TABLE "{table_name}"')
+        cursor.close()
+        with pytest.raises(Exception):
+            db_api.query_to_dataframe(f'SELECT * FROM "{table_name}"')
+        assert not db_api.table_exists(table_name)
+
+    def test_get_table_info_schema_qualified(self, db_api: DuckDBAPI):
+        """get_table_info quotes each part of a schema-qualified name."""
+        db_api.conn.execute('CREATE TABLE qualified_info_table (id BIGINT)')
+        db_api.conn.execute('INSERT INTO qualified_info_table VALUES (1), (2)')
+
+        info = db_api.get_table_info("main.qualified_info_table")
+        assert info["row_count"] == 2
+
     def test_connection_error(self):
         """Test that a ConnectionError is raised if connect() is not called."""
         api = DuckDBAPI("test_connection_error.db")
@@ -186,6 +230,30 @@ class TestDuckDBAPI:
         result4 = db_api.query_to_dataframe(f"SELECT * FROM {table_name}")
         assert len(result4) == 1 # Should not have changed
 
+    def test_insert_dataframe_creates_missing_table(self, db_api: DuckDBAPI):
+        """Inserting into a missing table creates it from the DataFrame."""
+        table_name = "insert_df_new_table"
+        df = pd.DataFrame([{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}])
+        db_api.insert_dataframe(table_name, df)
+
+        assert db_api.table_exists(table_name)
+        assert len(db_api.query_to_dataframe(f"SELECT * FROM {table_name}")) == 2
+
+    def test_query_many_preserves_order(self, db_api: DuckDBAPI):
+        """query_many runs independent queries in parallel and keeps input order."""
+        table_name = "query_many_table"
+        db_api.create_table_from_model(table_name, _TestModel, primary_keys=["id"])
+        data = [_TestModel(id=i, name=f"name{i}", value=float(i)) for i in range(10)]
+        db_api.upsert_data_from_models(table_name, data, primary_keys=["id"])
+
+        items = [(f"SELECT name FROM {table_name} WHERE id = ?", [i]) for i in range(10)]
+        items.append((f"SELECT COUNT(*) AS n FROM {table_name}", None))
+        results = db_api.query_many(items, max_workers=4)
+
+        assert [df['name'][0] for df in results[:10]] == [f"name{i}" for i in range(10)]
+        assert results[10]['n'][0] == 10
+        assert db_api.query_many([]) == []
+
     def test_get_table_info_error(self, db_api: DuckDBAPI):
         """Test getting info for a non-existent table."""
         info = db_api.get_table_info("non_existent_table_for_info")
@@ -224,6 +292,73 @@ class TestDuckDBAPI:
         result = db_api.query_to_dataframe(f"SELECT * FROM {table_name}")
         assert len(result) == 1
 
+    def test_upsert_sql_is_cached(self, db_api: DuckDBAPI):
+        """Repeated upserts with the same columns reuse the generated SQL."""
+        table_name = "upsert_cache_table"
+        db_api.create_table_from_model(table_name, _TestModel, primary_keys=["id"])
+
+        db_api.upsert_data_from_models(table_name, [_TestModel(id=1, name="a", value=1.0)], primary_keys=["id"])
+        assert len(db_api._upsert_sql_cache) == 1
+        cached_sql = next(iter(db_api._upsert_sql_cache.values()))
+
+        db_api.upsert_data_from_models(table_name, [_TestModel(id=1, name="b", value=2.0)], primary_keys=["id"])
+        assert len(db_api._upsert_sql_cache) == 1
+        assert next(iter(db_api._upsert_sql_cache.values())) is cached_sql
+
+        result = db_api.query_to_dataframe(f"SELECT * FROM {table_name}")
+        assert len(result) == 1
+        assert result['name'][0] == 'b'
+
+    def test_upsert_from_models_without_pyarrow(self, db_api: DuckDBAPI, monkeypatch):
+        """Without pyarrow the upsert falls back to the pandas path with the same result."""
+        monkeypatch.setattr("src.data.db.duckdb_impl.PYARROW_AVAILABLE", False)
+        table_name = "upsert_fallback_table"
+        db_api.create_table_from_model(table_name, _TestModel, primary_keys=["id"])
+
+        data = [_TestModel(id=1, name="test1", value=1.1), _TestModel(id=2, name="test2")]
+        db_api.upsert_data_from_models(table_name, data, primary_keys=["id"])
+
+        result_df = db_api.query_to_dataframe(f"SELECT * FROM {table_name} ORDER BY id")
+        assert len(result_df) == 2
+        assert result_df['value'][0] == 1.1
+        assert pd.isna(result_df['value'][1])
+        assert db_api._arrow_schema_cache == {}
+
+    @pytest.mark.parametrize("pyarrow_available", [True, False])
+    def test_upsert_data_streaming(self, db_api: DuckDBAPI, monkeypatch, pyarrow_available):
+        """Batches are written in one transaction and later batches win on duplicate keys."""
+        monkeypatch.setattr("src.data.db.duckdb_impl.PYARROW_AVAILABLE", pyarrow_available)
+        table_name = "upsert_streaming_table"
+        db_api.create_table_from_model(table_name, Price, primary_keys=["ticker", "time"])
+
+        def batches():
+            yield [Price(ticker="A", time="2024-01-01", open=1.0, close=1.5, high=2.0, low=0.5, volume=10)]
+            yield []
+            yield [
+                Price(ticker="A", time="2024-01-01", open=1.1, close=1.6, high=2.1, low=0.6, volume=11),
+                Price(ticker="A", time="2024-01-02", open=2.0, close=2.5, high=3.0, low=1.5, volume=20),
+            ]
+
+        db_api.upsert_data_streaming(table_name, Price, batches(), ["ticker", "time"])
+
+        results = db_api.query_to_models(f"SELECT * FROM {table_name} ORDER BY time", Price)
+        assert [(p.time, p.open, p.volume) for p in results] == [("2024-01-01", 1.1, 11), ("2024-01-02", 2.0, 20)]
+
+    def test_upsert_data_streaming_rolls_back_on_error(self, db_api: DuckDBAPI):
+        """A failing batch leaves none of the stream's rows behind."""
+        table_name = "upsert_streaming_rollback"
+        db_api.create_table_from_model(table_name, _TestModel, primary_keys=["id"])
+
+        def batches():
+            yield [_TestModel(id=1, name="a")]
+            raise RuntimeError("source failed")
+
+        # DuckDB surfaces errors raised inside the Arrow stream as its own exception type
+        with pytest.raises((RuntimeError, duckdb.Error)):
+            db_api.upsert_data_streaming(table_name, _TestModel, batches(), ["id"])
+
+        assert len(db_api.query_to_dataframe(f"SELECT * FROM {table_name}")) == 0
+
     def test_price_storage_and_retrieval(self, in_memory_db_api: DuckDBAPI):
         """
         Tests that price data is correctly converted to integers for storage
@@ -0,0 +1,63 @@
+from collections import Counter
+
+import duckdb
+import pytest
+
+from analyze.execute_sql import UTF8_BOM, build_sql, execute_analysis, write_results_csv
+
+EXPECTED_CSV = b"ticker,val,name,plate_cluster\nAAPL,1.0,\xe7\x94\xb2,a\nMSFT,2.5,\"x,y\",\nNVDA,3.0,z,a\n"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "analysis.duckdb")
+    with duckdb.connect(path) as con:
+        con.execute(
+            "CREATE TABLE fp AS SELECT * FROM (VALUES "
+            "('NVDA', 3.0, 'z', 'a'), ('AAPL', 1.0, '甲', 'a'), ('MSFT', 2.5, 'x,y', NULL)"
+            ") v(ticker, val, name, plate_cluster)"
+        )
+    return path
+
+
+@pytest.fixture
+def sql_file(tmp_path):
+    path = tmp_path / "analysis.sql"
+    path.write_text("SELECT * FROM {{table_name}}\nORDER BY ticker;   -- 按代码排序\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("bom", [True, False])
+def test_execute_analysis_csv_bytes(db_path, sql_file, tmp_path, capsys, bom):
+    output_csv = tmp_path / "out.csv"
+
+    execute_analysis(db_path, "fp", sql_file, str(output_csv), common_logic_file=str(tmp_path / "missing.sql"), bom=bom)
+
+    assert output_csv.read_bytes() == (UTF8_BOM if bom else b"") + EXPECTED_CSV
+    assert not (tmp_path / "out.csv.tmp").exists()
+    # NULL clusters are not counted
+    assert "Cluster Distribution:\na\t2\n" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("bom", [True, False])
+def test_write_results_csv_counts_clusters(db_path, sql_file, tmp_path, bom):
+    output_csv = tmp_path / "out.csv"
+    query = build_sql(sql_file, str(tmp_path / "missing.sql")).replace("__analysis_src", "fp")
+
+    with duckdb.connect(db_path) as con:
+        counts = write_results_csv(con, query, str(output_csv), bom)
+
+    assert counts == Counter({"a": 2})
+    assert output_csv.read_bytes() == (UTF8_BOM if bom else b"") + EXPECTED_CSV
+
+
+@pytest.mark.parametrize("bom", [True, False])
+def test_write_results_csv_without_clusters(db_path, tmp_path, bom):
+    output_csv = tmp_path / "out.csv"
+
+    with duckdb.connect(db_path) as con:
+        # 首列名需要加引号时，BOM 无法并入表头，改为复制导出结果
+        counts = write_results_csv(con, 'SELECT ticker AS "a,b", val FROM fp ORDER BY ticker', str(output_csv), bom)
+
+    assert counts is None
+    assert output_csv.read_bytes() == (UTF8_BOM if bom else b"") + b'"a,b",val\nAAPL,1.0\nMSFT,2.5\nNVDA,3.0\n'
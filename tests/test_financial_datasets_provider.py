@@ -0,0 +1,167 @@
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.data.provider.financial_datasets_provider import (
+    FDPermanentError,
+    FDTransientError,
+    FinancialDatasetsProvider,
+    _split_date_range,
+)
+
+
+@pytest.fixture
+def provider():
+    p = FinancialDatasetsProvider(api_key="test")
+    yield p
+    p.close()
+
+
+def _news_response(ticker, news_date):
+    response = MagicMock()
+    response.content = json.dumps({"news": [{
+        "ticker": ticker, "title": "t", "author": "a", "source": "s", "date": news_date, "url": "u",
+    }]}).encode()
+    return response
+
+
+def test_split_date_range():
+    windows = _split_date_range("2024-01-01", "2024-12-31", 4)
+    assert windows[0][1] == "2024-12-31"
+    assert windows[-1][0] == "2024-01-01"
+    # 窗口按时间倒序、首尾相接且互不重叠
+    for (newer_start, _), (_, older_end) in zip(windows, windows[1:]):
+        assert older_end < newer_start
+    assert len(_split_date_range("2024-01-01", "2024-01-02", 4)) == 2
+
+
+def test_get_company_news_fetches_windows(provider, monkeypatch):
+    urls = []
+
+    def fake_request(method, url, interface_name, **kwargs):
+        urls.append(url)
+        assert interface_name == "get_company_news"
+        return _news_response("AAPL", kwargs["params"]["end_date"])
+
+    monkeypatch.setattr(provider, "_make_request", fake_request)
+    news = provider.get_company_news("AAPL", "2024-12-31", "2024-01-01")
+
+    assert len(urls) == 4
+    assert [n.date for n in news] == sorted((n.date for n in news), reverse=True)
+
+
+def test_batch_methods_key_by_ticker(provider, monkeypatch):
+    def fake_metrics(ticker, end_date, period, limit):
+        if ticker == "BAD":
+            raise RuntimeError("boom")
+        return [ticker]
+
+    monkeypatch.setattr(provider, "get_financial_metrics", fake_metrics)
+    result = provider.get_financial_metrics_batch(["AAPL", "BAD", "MSFT"], "2024-12-31")
+
+    assert list(result) == ["AAPL", "BAD", "MSFT"]
+    assert result["AAPL"] == ["AAPL"]
+    assert result["BAD"] == []
+
+
+def test_is_available_is_cached(provider, monkeypatch):
+    get = MagicMock(return_value=MagicMock(status_code=200))
+    monkeypatch.setattr(provider._session, "get", get)
+
+    assert provider.is_available()
+    assert provider.is_available()
+    assert get.call_count == 1
+
+    monkeypatch.delenv("FINANCIAL_DATASETS_API_KEY", raising=False)
+    assert not FinancialDatasetsProvider().is_available()
+
+
+@pytest.mark.parametrize("status_code", [401, 403, 404, 503])
+def test_is_available_requires_2xx(provider, monkeypatch, status_code):
+    get = MagicMock(return_value=MagicMock(status_code=status_code))
+    monkeypatch.setattr(provider._session, "get", get)
+
+    assert not provider.is_available()
+
+
+def test_search_line_items_batch_single_post(provider, monkeypatch):
+    bodies = []
+
+    def fake_request(method, url, interface_name, **kwargs):
+        bodies.append(kwargs["json"])
+        response = MagicMock()
+        response.content = json.dumps({"search_results": [
+            {"ticker": ticker, "report_period": f"2024-0{i}-30", "period": "ttm", "name": "revenue", "value": 1.0}
+            for ticker in ("MSFT", "AAPL") for i in (3, 6)
+        ]}).encode()
+        return response
+
+    monkeypatch.setattr(provider, "_make_request", fake_request)
+    result = provider.search_line_items_batch(["AAPL", "MSFT", "NVDA"], ["revenue"], "2024-12-31", limit=2)
+
+    assert len(bodies) == 1
+    assert bodies[0]["tickers"] == ["AAPL", "MSFT", "NVDA"]
+    assert bodies[0]["limit"] == 6
+    assert [item.ticker for item in result["AAPL"]] == ["AAPL", "AAPL"]
+    assert len(result["MSFT"]) == 2
+    assert result["NVDA"] == []
+    assert len(provider.search_line_items("AAPL", ["revenue"], "2024-12-31", limit=5)) == 2
+
+
+@pytest.mark.parametrize("status_code, error_type", [(404, FDPermanentError), (429, FDTransientError), (503, FDTransientError)])
+def test_make_request_raises_typed_errors(provider, monkeypatch, status_code, error_type):
+    response = MagicMock(ok=False, status_code=status_code)
+    response.json.return_value = {"message": "error"}
+    monkeypatch.setattr(provider._session, "request", MagicMock(return_value=response))
+
+    with pytest.raises(error_type):
+        provider._make_request("GET", f"{provider.base_url}/prices/", "get_prices")
+
+
+def test_search_line_items_batch_limit_covers_all_tickers(provider, monkeypatch):
+    bodies = []
+
+    def fake_request(method, url, interface_name, **kwargs):
+        bodies.append(kwargs["json"])
+        # 模拟接口对整个响应应用limit：按ticker依次返回，最多limit条
+        rows = [
+            {"ticker": ticker, "report_period": f"2024-0{i}-30", "period": "ttm", "name": "revenue", "value": 1.0}
+            for ticker in kwargs["json"]["tickers"] for i in (3, 6, 9)
+        ][:kwargs["json"]["limit"]]
+        response = MagicMock()
+        response.content = json.dumps({"search_results": rows}).encode()
+        return response
+
+    monkeypatch.setattr(provider, "_make_request", fake_request)
+    result = provider.search_line_items_batch(["AAPL", "MSFT"], ["revenue"], "2024-12-31", limit=2)
+
+    assert [item.report_period for item in result["AAPL"]] == ["2024-03-30", "2024-06-30"]
+    assert [item.ticker for item in result["MSFT"]] == ["MSFT", "MSFT"]
+    # 第一次请求按ticker数放大limit；MSFT被截断后单独补查
+    assert [(b["tickers"], b["limit"]) for b in bodies] == [(["AAPL", "MSFT"], 4), (["MSFT"], 2)]
+
+
+def test_transient_errors_propagate_without_method_retry(provider, monkeypatch):
+    request = MagicMock(side_effect=FDTransientError("API请求失败: 503"))
+    monkeypatch.setattr(provider, "_make_request", request)
+
+    # 重试只在会话适配器中进行，方法层不再重复重试
+    with pytest.raises(FDTransientError):
+        provider.get_financial_metrics("AAPL", "2024-12-31")
+    assert request.call_count == 1
+
+
+def test_http_retry_skips_post(provider):
+    retry = provider._session.get_adapter(provider.base_url).max_retries
+
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+
+
+def test_permanent_errors_return_empty(provider, monkeypatch):
+    request = MagicMock(side_effect=FDPermanentError("API请求失败: 404"))
+    monkeypatch.setattr(provider, "_make_request", request)
+
+    assert provider.get_financial_metrics("AAPL", "2024-12-31") == []
+    assert request.call_count == 1
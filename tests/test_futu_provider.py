@@ -76,3 +76,118 @@ def test_is_available_failure(futu_provider, mock_db_api):
 
     # Assert
     assert available is False
+
+def test_get_financial_metrics_batch_groups_by_ticker(futu_provider, mock_db_api):
+    """Test get_financial_metrics_batch issues one query and groups rows by ticker."""
+    # Arrange
+    mock_db_api.query_to_models.return_value = [
+        FinancialProfile(ticker="US.AAPL", name="Apple Inc.", report_period="2023-12-31", period="annual"),
+        FinancialProfile(ticker="US.AAPL", name="Apple Inc.", report_period="2022-12-31", period="annual"),
+        FinancialProfile(ticker="US.MSFT", name="Microsoft", report_period="2023-12-31", period="annual"),
+    ]
+
+    # Act
+    result = futu_provider.get_financial_metrics_batch(["US.AAPL", "US.MSFT", "US.GOOG"], "2023-12-31", limit=2)
+
+    # Assert
+    assert [p.report_period for p in result["US.AAPL"]] == ["2023-12-31", "2022-12-31"]
+    assert len(result["US.MSFT"]) == 1
+    assert result["US.GOOG"] == []
+    mock_db_api.query_to_models.assert_called_once()
+    assert mock_db_api.query_to_models.call_args.kwargs["params"] == ["US.AAPL", "US.MSFT", "US.GOOG", 2]
+    mock_db_api.close.assert_called_once()
+
+
+def test_get_prices_builds_price_models(futu_provider):
+    import futu as ft
+    import pandas as pd
+
+    data = pd.DataFrame({
+        "time_key": ["2024-01-02 00:00:00", "2024-01-03 00:00:00"],
+        "open": [10.0, 11.0],
+        "close": [10.5, 11.5],
+        "high": [11.0, 12.0],
+        "low": [9.5, 10.5],
+        "volume": [1000, 2000],
+    })
+    futu_provider.quote_ctx = MagicMock()
+    futu_provider.quote_ctx.request_history_kline.return_value = (ft.RET_OK, data, None)
+
+    prices = futu_provider.get_prices(["00700.HK"], "2024-01-01", "2024-01-31")
+
+    assert [p.time for p in prices] == ["2024-01-02 00:00:00", "2024-01-03 00:00:00"]
+    assert prices[1].close == 11.5 and prices[1].volume == 2000
+    assert all(p.ticker == "00700.HK" for p in prices)
+    fields = futu_provider.quote_ctx.request_history_kline.call_args.kwargs["fields"]
+    assert ft.KL_FIELD.TRADE_VOL in fields and ft.KL_FIELD.PE_RATIO not in fields
+
+
+def test_get_market_cap_batch_uses_one_snapshot(futu_provider):
+    import futu as ft
+    import pandas as pd
+
+    quote_ctx = MagicMock()
+    quote_ctx.get_market_snapshot.return_value = (
+        ft.RET_OK, pd.DataFrame({"code": ["US.AAPL", "HK.00700"], "market_cap": [3.0e12, 0.0]})
+    )
+    futu_provider.quote_ctx = quote_ctx
+
+    result = futu_provider.get_market_cap_batch(["00700.HK", "AAPL", "MSFT"], "2024-12-31")
+
+    quote_ctx.get_market_snapshot.assert_called_once_with(["HK.00700", "US.AAPL", "US.MSFT"])
+    assert result == {"00700.HK": None, "AAPL": 3.0e12, "MSFT": None}
+
+
+def test_context_manager_keeps_connection_open(futu_provider, mock_db_api):
+    quote_ctx = MagicMock()
+    quote_ctx.get_market_snapshot.return_value = (1, "error")
+    futu_provider.quote_ctx = quote_ctx
+
+    with futu_provider as provider:
+        provider.get_market_cap("AAPL", "2024-12-31")
+        provider.get_financial_metrics("AAPL", "2024-12-31")
+        assert provider.quote_ctx is quote_ctx
+        mock_db_api.close.assert_not_called()
+
+    quote_ctx.close.assert_called_once()
+    assert futu_provider.quote_ctx is None
+    mock_db_api.close.assert_called_once()
+
+
+def test_get_market_cap_delegates_to_batch(futu_provider):
+    import futu as ft
+    import pandas as pd
+
+    quote_ctx = MagicMock()
+    quote_ctx.get_market_snapshot.return_value = (ft.RET_OK, pd.DataFrame({"code": ["HK.00700"], "market_cap": [4.0e12]}))
+    futu_provider.quote_ctx = quote_ctx
+
+    assert futu_provider.get_market_cap("00700.HK", "2024-12-31") == 4.0e12
+    quote_ctx.get_market_snapshot.assert_called_once_with(["HK.00700"])
+
+
+def test_is_available_is_cached(futu_provider, mock_db_api):
+    assert futu_provider.is_available() is True
+    assert futu_provider.is_available() is True
+    mock_db_api.connect.assert_called_once()
+
+
+def test_get_prices_batch_keys_by_ticker(futu_provider):
+    import futu as ft
+    import pandas as pd
+
+    def kline(code, start, end, ktype, fields):
+        data = pd.DataFrame({
+            "time_key": ["2024-01-02 00:00:00"], "open": [1.0], "close": [2.0],
+            "high": [2.0], "low": [1.0], "volume": [100],
+        })
+        return (ft.RET_OK, data, None) if code == "US.AAPL" else (ft.RET_ERROR, "no data", None)
+
+    futu_provider.quote_ctx = MagicMock()
+    futu_provider.quote_ctx.request_history_kline.side_effect = kline
+
+    result = futu_provider.get_prices_batch(["AAPL", "MSFT"], "2024-01-01", "2024-01-31")
+
+    assert list(result) == ["AAPL", "MSFT"]
+    assert [p.close for p in result["AAPL"]] == [2.0]
+    assert result["MSFT"] == []
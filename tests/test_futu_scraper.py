@@ -39,9 +39,9 @@ def scraper_instance():
         yield scraper
 
 class TestFutuScraper:
-    @patch('src.futu_scraper.FutuScraper.scrape_financial_profile')
-    def test_scrape_and_store_financial_profile(self, mock_scrape_financial_profile, scraper_instance):
-        """Test the orchestration of financial profile scraping, mocking the scrape_financial_profile method."""
+    @patch('src.futu_scraper.FutuScraper.iter_financial_profiles')
+    def test_scrape_and_store_financial_profile(self, mock_iter_financial_profiles, scraper_instance):
+        """Test the orchestration of financial profile scraping, mocking the iter_financial_profiles method."""
         report_date = get_report_period_date(date.today(), "annual")
         report_date_str = report_date.strftime('%Y-%m-%d')
 
@@ -50,22 +50,29 @@ class TestFutuScraper:
             FinancialProfile(ticker='US.MSFT', name='Microsoft', pe_ttm=30.5, currency='USD', report_period=report_date_str, period='annual'),
             FinancialProfile(ticker='US.GOOG', name='Google', pe_ttm=25.1, currency='USD', report_period=report_date_str, period='annual')
         ]
-        mock_scrape_financial_profile.return_value = mock_profiles
+        mock_iter_financial_profiles.return_value = iter(mock_profiles)
+        streamed_batches = []
+        scraper_instance.db_api.upsert_data_streaming.side_effect = (
+            lambda table_name, model, batches, primary_keys: streamed_batches.extend(batches)
+        )
 
-        scraper_instance.scrape_and_store_financials("US", "annual")
+        with patch('src.futu_scraper.STORE_BATCH_SIZE', 1):
+            scraper_instance.scrape_and_store_financials("US", "annual")
 
-        # Check that scrape_financial_profile was called correctly
-        mock_scrape_financial_profile.assert_called_once_with("US", "annual", report_date_str)
+        # Check that iter_financial_profiles was called correctly
+        mock_iter_financial_profiles.assert_called_once_with("US", "annual", report_date_str)
 
         # Now, this assertion should pass
         scraper_instance.db_api.create_table_from_model.assert_called_once()
         
-        # Check that upsert is called with the correct data
-        scraper_instance.db_api.upsert_data_from_models.assert_called_once()
-        upsert_args, _ = scraper_instance.db_api.upsert_data_from_models.call_args
-        _, models_list, primary_keys = upsert_args
-        
-        assert len(models_list) == 2
+        # Check that the profiles are streamed to the database in batches
+        scraper_instance.db_api.upsert_data_streaming.assert_called_once()
+        upsert_args, _ = scraper_instance.db_api.upsert_data_streaming.call_args
+        _, model, _, primary_keys = upsert_args
+        models_list = [m for batch in streamed_batches for m in batch]
+
+        assert model is FinancialProfile
+        assert len(streamed_batches) == 2
         assert {m.ticker for m in models_list} == {'US.MSFT', 'US.GOOG'}
         assert models_list == mock_profiles
         assert primary_keys == ["ticker", "report_period", "period"]
@@ -84,3 +91,16 @@ class TestFutuScraper:
         scraper = FutuScraper()
         with pytest.raises(Exception, match="Connection Failed"):
             scraper._connect()
+
+
+def test_iter_financial_profiles_is_lazy():
+    from src.data.futu_utils import iter_financial_profiles
+
+    data = {
+        'US.MSFT': {'stock_name': 'Microsoft', 'pe_ttm': 30.5},
+        'US.GOOG': {'stock_name': 'Google', 'pe_ttm': 25.1},
+    }
+    profiles = iter_financial_profiles(data, '2024-12-31', 'annual')
+
+    assert next(profiles).ticker == 'US.MSFT'
+    assert [p.ticker for p in profiles] == ['US.GOOG']
@@ -9,17 +9,19 @@
 - 不同数据类型的专用方法
 """
 
+import copy
 import json
 import os
 import tempfile
 import time
+from datetime import date
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from src.data.persistent_cache import PersistentCache
-from src.data.data_config import DataConfig, get_cache_ttl
+from src.data.persistent_cache import PersistentCache, HISTORICAL_TTL
+from src.data.data_config import DataConfig, get_cache_config, get_cache_ttl
 
 
 class TestPersistentCache:
@@ -178,35 +180,55 @@ class TestPersistentCache:
         result = cache.get_prices("AAPL", "2023-01-01", "2023-01-02")
         assert result == test_data
 
-    @patch('src.data.data_config.datetime')
-    def test_prices_ttl_market_hours(self, mock_datetime, cache):
+    @patch('src.data.data_config.time')
+    def test_prices_ttl_market_hours(self, mock_time, cache, monkeypatch):
         """测试价格数据在市场时间的TTL"""
         # 模拟市场时间（上午10点）
-        mock_datetime.now.return_value.hour = 10
-        
-        test_data = [{"ticker": "AAPL", "time": "2023-01-01", "price": 150.0}]
-        cache.set_prices("AAPL", "2023-01-01", "2023-01-01", test_data)
-        
-        # 检查TTL是否为市场时间的配置值
-        expected_ttl = get_cache_ttl('prices')  # 从配置获取期望的TTL
-        cache_key = cache._get_cache_key("prices", ticker="AAPL", start_date="2023-01-01", end_date="2023-01-01")
+        # 清空全局配置缓存的小时，确保使用模拟的时间
+        monkeypatch.setattr(get_cache_config(), "_hour_cache", (0, 0.0))
+        mock_time.localtime.return_value.tm_hour = 10
+        mock_time.localtime.return_value.tm_min = 0
+        mock_time.localtime.return_value.tm_sec = 0
+        mock_time.time.return_value = 1_700_000_000.0
+        
+        today = date.today().isoformat()
+        test_data = [{"ticker": "AAPL", "time": today, "price": 150.0}]
+        cache.set_prices("AAPL", today, today, test_data)
+        
+        # 检查TTL是否为市场时间的配置值（market_hours）
+        expected_ttl = 3600
+        cache_key = cache._get_cache_key("prices", ticker="AAPL", start_date=today, end_date=today)
         metadata = cache._cache_metadata[cache_key]
         assert metadata["ttl"] == expected_ttl
 
-    @patch('src.data.data_config.datetime')
-    def test_prices_ttl_after_market(self, mock_datetime, cache):
+    @patch('src.data.data_config.time')
+    def test_prices_ttl_after_market(self, mock_time, cache, monkeypatch):
         """测试价格数据在非市场时间的TTL"""
         # 模拟非市场时间（晚上8点）
-        mock_datetime.now.return_value.hour = 20
-        
+        # 清空全局配置缓存的小时，确保使用模拟的时间
+        monkeypatch.setattr(get_cache_config(), "_hour_cache", (0, 0.0))
+        mock_time.localtime.return_value.tm_hour = 20
+        mock_time.localtime.return_value.tm_min = 0
+        mock_time.localtime.return_value.tm_sec = 0
+        mock_time.time.return_value = 1_700_036_000.0
+        
+        today = date.today().isoformat()
+        test_data = [{"ticker": "AAPL", "time": today, "price": 150.0}]
+        cache.set_prices("AAPL", today, today, test_data)
+        
+        # 检查TTL是否为非市场时间的配置值（after_hours）
+        expected_ttl = 86400
+        cache_key = cache._get_cache_key("prices", ticker="AAPL", start_date=today, end_date=today)
+        metadata = cache._cache_metadata[cache_key]
+        assert metadata["ttl"] == expected_ttl
+
+    def test_historical_range_ttl(self, cache):
+        """测试已结束的日期区间使用较长的TTL"""
         test_data = [{"ticker": "AAPL", "time": "2023-01-01", "price": 150.0}]
         cache.set_prices("AAPL", "2023-01-01", "2023-01-01", test_data)
         
-        # 检查TTL是否为非市场时间的配置值
-        expected_ttl = get_cache_ttl('prices')  # 从配置获取期望的TTL
         cache_key = cache._get_cache_key("prices", ticker="AAPL", start_date="2023-01-01", end_date="2023-01-01")
-        metadata = cache._cache_metadata[cache_key]
-        assert metadata["ttl"] == expected_ttl
+        assert cache._cache_metadata[cache_key]["ttl"] == HISTORICAL_TTL
 
     def test_financial_metrics_methods(self, cache):
         """测试财务指标专用方法"""
@@ -469,6 +491,71 @@ class TestDataConfig:
         assert 'ttl' in interfaces['get_prices']
         assert 'ttl' in interfaces['call_llm_deepseek']
     
+    def test_stale_sidecar_reloaded(self, temp_config_dir):
+        """测试YAML修改后不再使用过期的JSON快照"""
+        config_file = Path(temp_config_dir) / "data_config.yaml"
+        config = DataConfig(config_file=str(config_file))
+        assert config.sidecar_file.exists()
+        assert config.get_interface_ttl('get_financial_metrics') == {'default': 86400}
+        
+        # 同样大小的修改，只有mtime变化
+        text = config_file.read_text(encoding='utf-8')
+        config_file.write_text(text.replace('default: 86400', 'default: 12345'), encoding='utf-8')
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        
+        reloaded = DataConfig(config_file=str(config_file))
+        assert reloaded.get_interface_ttl('get_financial_metrics') == {'default': 12345}
+        # 快照已按新内容刷新
+        sidecar = json.loads(reloaded.sidecar_file.read_bytes())
+        assert sidecar['mtime_ns'] == config_file.stat().st_mtime_ns
+        assert sidecar['config']['interfaces']['get_financial_metrics']['ttl'] == {'default': 12345}
+        
+        # 已有实例通过 reload_config 读到新内容
+        config.reload_config()
+        assert config.get_interface_ttl('get_financial_metrics') == {'default': 12345}
+    
+    def test_patch_replay_matches_full_save(self, temp_config_dir):
+        """测试重放补丁日志得到的配置与完整保存后加载的配置一致"""
+        patched_file = Path(temp_config_dir) / "patched" / "data_config.yaml"
+        config = DataConfig(config_file=str(patched_file))
+        yaml_before = patched_file.read_bytes()
+        
+        config.set_interface_ttl('get_prices', {'market_hours': 60, 'after_hours': 600})
+        config.set_ttl('financial_metrics', {'default': 7200})
+        config.set_default_data_provider('futu')
+        
+        # 修改只追加到补丁日志，YAML保持不变
+        assert patched_file.read_bytes() == yaml_before
+        assert len(config.patch_file.read_bytes().splitlines()) == 3
+        
+        saved_file = Path(temp_config_dir) / "saved" / "data_config.yaml"
+        saved = DataConfig(config_file=str(saved_file))
+        saved._save_config(copy.deepcopy(config.config))
+        
+        replayed = DataConfig(config_file=str(patched_file))
+        assert replayed.config == DataConfig(config_file=str(saved_file)).config == config.config
+        # 重放后补丁已合并回YAML
+        assert not replayed.patch_file.exists()
+        assert DataConfig(config_file=str(patched_file)).config == config.config
+    
+    def test_unchanged_setter_writes_no_patch(self, temp_config_dir):
+        """测试配置未变化时不写补丁"""
+        config = DataConfig(config_file=str(Path(temp_config_dir) / "data_config.yaml"))
+        config.set_interface_ttl('get_financial_metrics', {'default': 86400})
+        config.set_default_data_provider(config.config['data_providers']['default'])
+        assert not config.patch_file.exists()
+    
+    def test_patch_log_compaction(self, temp_config_dir, monkeypatch):
+        """测试补丁日志超过阈值时合并回YAML"""
+        monkeypatch.setattr("src.data.data_config.PATCH_COMPACT_BYTES", 0)
+        config_file = Path(temp_config_dir) / "data_config.yaml"
+        config = DataConfig(config_file=str(config_file))
+        config.set_interface_ttl('get_financial_metrics', {'default': 60})
+        
+        assert not config.patch_file.exists()
+        assert 'default: 60' in config_file.read_text(encoding='utf-8')
+    
     def test_ttl_retrieval(self):
         """测试TTL值获取"""
         # 测试各种缓存类型的TTL